@@ -0,0 +1,170 @@
+"""
+Mémo LRU borné (en octets) pour les analyses de puzzles et les résultats
+de transformations, partagé entre l'apprentissage, la résolution et la
+génération de la soumission.
+
+Les valeurs partagées ne peuvent pas être modifiées à travers le mémo : les
+tableaux (y compris ceux d'une MatchMatrix ou d'un conteneur) sont gardés en
+lecture seule, copiés s'ils étaient modifiables ou s'ils sont des vues (une
+vue garderait en vie tout son tableau de base, que la taille comptée
+n'inclut pas) ; les dictionnaires, listes et ensembles sont copiés à
+l'entrée et à chaque lecture. La valeur passée à put n'est jamais modifiée.
+"""
+import hashlib
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from arc_grid import ArcGrid, as_grid
+from batch_evaluator import MatchMatrix
+
+
+def puzzle_content_hash(puzzle):
+    """Empreinte du contenu d'un puzzle (toutes les grilles train et test)."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    def _update(example):
+        for key in ('input', 'output'):
+            if key not in example:
+                continue
+            try:
+                digest.update(as_grid(example[key]).content_hash.encode())
+            except (ValueError, TypeError):
+                # Listes de grilles (solutions multi-tests)
+                for grid in example[key]:
+                    digest.update(as_grid(grid).content_hash.encode())
+            digest.update(key.encode())
+
+    for example in puzzle.get('train', []):
+        digest.update(b'train')
+        _update(example)
+
+    test = puzzle.get('test')
+    for example in (test if isinstance(test, list) else [test] if test else []):
+        digest.update(b'test')
+        _update(example)
+
+    return digest.hexdigest()
+
+
+def estimate_nbytes(value):
+    """Estimation de la taille mémoire d'une valeur mise en cache."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, ArcGrid):
+        return value.nbytes + 200
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + estimate_nbytes(vars(value))
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Copie privée d'une valeur mise en cache (tableaux en lecture seule, sans base partagée)."""
+    if isinstance(value, np.ndarray):
+        if value.flags.writeable or value.base is not None:
+            value = value.copy()
+            value.flags.writeable = False
+        return value
+    if isinstance(value, MatchMatrix):
+        return MatchMatrix(value.names, _freeze(value.matches), value.n_examples)
+    if isinstance(value, dict):
+        return {key: _freeze(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_freeze(item) for item in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def _thaw(value):
+    """Copie des conteneurs modifiables (dict, list, set), à tous les niveaux d'imbrication."""
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+class AnalysisMemo:
+    """Cache LRU avec comptabilité en octets, éviction et compteurs hit/miss."""
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # clé -> (valeur, taille)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Retourne la valeur en cache (et la marque comme récente)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _thaw(entry[0])
+
+    def put(self, key, value):
+        """Ajoute une copie figée de la valeur puis évince les plus anciennes si nécessaire.
+
+        Retourne value, inchangée.
+        """
+        size = estimate_nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (_freeze(value), size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Retourne la valeur en cache ou la calcule une seule fois."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _thaw(entry[0])
+        self.misses += 1
+        return self.put(key, compute())
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """Statistiques d'utilisation du cache."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,223 @@
+"""
+Chargement paresseux des fichiers consolidés arc-agi_*_challenges.json.
+
+Le fichier est projeté en mémoire (mmap) et parcouru une seule fois, de
+façon vectorisée, pour construire un index identifiant -> plage d'octets de
+chaque puzzle. Un puzzle n'est décodé (json + ArcGrid) qu'au moment où il
+est lu, et seuls les derniers puzzles décodés sont gardés dans un petit
+cache LRU : les grilles n'existent plus en double (listes JSON + dict
+fusionné) pendant le chargement.
+"""
+import json
+import mmap
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+from arc_grid import as_arc_puzzle
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Nombre de puzzles décodés gardés en cache par défaut
+DEFAULT_CACHE_SIZE = 32
+
+# Table des octets structurels : 1 = ouvrant, -1 = fermant
+_BRACKETS = np.zeros(256, dtype=np.int8)
+_BRACKETS[[ord('{'), ord('[')]] = 1
+_BRACKETS[[ord('}'), ord(']')]] = -1
+
+
+def peak_rss():
+    """Pic de mémoire résidente (RSS) du processus en octets, ou None si indisponible."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilo-octets sous Linux, octets sous macOS
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def _index_top_level(buffer):
+    """Index {clé: (début, fin)} des valeurs (objets ou tableaux) de l'objet JSON de premier niveau.
+
+    Seuls les crochets, accolades et guillemets sont examinés : les crochets
+    situés entre deux guillemets (dans une chaîne) sont ignorés, la profondeur
+    est un cumul des ouvertures et fermetures, et la clé d'une valeur est la
+    dernière chaîne qui la précède.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    quotes = np.flatnonzero(data == ord('"'))
+    brackets = np.flatnonzero(_BRACKETS[data])
+    # Un nombre impair de guillemets avant un crochet : il est dans une chaîne
+    brackets = brackets[np.searchsorted(quotes, brackets) % 2 == 0]
+
+    steps = _BRACKETS[data[brackets]]
+    opening = steps > 0
+    depth = np.cumsum(steps, dtype=np.int64)
+    starts = brackets[opening & (depth == 2)]
+    ends = brackets[~opening & (depth == 1)] + 1
+    if len(starts) != len(ends):
+        raise ValueError("JSON mal formé : valeurs de premier niveau non appariées")
+
+    key_ends = np.searchsorted(quotes, starts)
+    index = {}
+    for start, end, q in zip(starts.tolist(), ends.tolist(), key_ends.tolist()):
+        key = json.loads(bytes(buffer[quotes[q - 2]:quotes[q - 1] + 1]))
+        index[key] = (start, end)
+    return index
+
+
+class _MappedJson:
+    """Fichier JSON projeté en mémoire avec l'index de ses valeurs de premier niveau."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._buffer = b''
+            self.index = {}
+            return
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if b'\\' in self._buffer:
+            # Échappements dans les chaînes : l'index par guillemets n'est pas sûr
+            values = json.loads(self._buffer[:])
+            encoded = [json.dumps(value).encode() for value in values.values()]
+            offsets = np.cumsum([0] + [len(chunk) for chunk in encoded]).tolist()
+            self._buffer.close()
+            self._buffer = b''.join(encoded)
+            self.index = {key: (offsets[i], offsets[i + 1]) for i, key in enumerate(values)}
+        else:
+            self.index = _index_top_level(self._buffer)
+
+    def raw(self, key):
+        start, end = self.index[key]
+        return self._buffer[start:end]
+
+    def decode(self, key):
+        return json.loads(self.raw(key))
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
+        self._file.close()
+
+
+def _build_puzzle(puzzle_id, challenge, solution):
+    """Puzzle par défaut : le défi converti en ArcGrid (les solutions sont ignorées)."""
+    return as_arc_puzzle(challenge)
+
+
+class ArcDataset(Mapping):
+    """Mapping paresseux identifiant -> puzzle sur un fichier de défis ARC.
+
+    Args:
+        path: fichier arc-agi_*_challenges.json
+        solutions_path: fichier arc-agi_*_solutions.json optionnel ; seuls les
+            puzzles présents dans les deux fichiers sont alors exposés
+        cache_size: nombre de puzzles décodés gardés en cache (0 = aucun)
+        build: fonction (puzzle_id, défi, solution) -> puzzle
+    """
+
+    def __init__(self, path, solutions_path=None, cache_size=DEFAULT_CACHE_SIZE, build=None):
+        self.path = path
+        self.solutions_path = solutions_path
+        self.cache_size = cache_size
+        self.build = build or _build_puzzle
+        self._open()
+
+    def _open(self):
+        self._challenges = _MappedJson(self.path)
+        self._solutions = _MappedJson(self.solutions_path) if self.solutions_path else None
+        self._ids = list(self._challenges.index)
+        if self._solutions is not None:
+            self._ids = [puzzle_id for puzzle_id in self._ids if puzzle_id in self._solutions.index]
+        self._id_set = set(self._ids)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, puzzle_id):
+        puzzle = self._cache.get(puzzle_id)
+        if puzzle is not None:
+            self.hits += 1
+            self._cache.move_to_end(puzzle_id)
+            return puzzle
+        if puzzle_id not in self._id_set:
+            raise KeyError(puzzle_id)
+
+        self.misses += 1
+        solution = self._solutions.decode(puzzle_id) if self._solutions is not None else None
+        puzzle = self.build(puzzle_id, self._challenges.decode(puzzle_id), solution)
+        if self.cache_size > 0:
+            self._cache[puzzle_id] = puzzle
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return puzzle
+
+    def __contains__(self, puzzle_id):
+        return puzzle_id in self._id_set
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def raw(self, puzzle_id):
+        """Octets JSON bruts du défi (sans décodage)."""
+        return self._challenges.raw(puzzle_id)
+
+    def stats(self):
+        """Statistiques du cache de puzzles décodés."""
+        total = self.hits + self.misses
+        return {
+            'puzzles': len(self._ids),
+            'cached': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        """Libère les projections mémoire."""
+        self._cache.clear()
+        self._challenges.close()
+        if self._solutions is not None:
+            self._solutions.close()
+
+    def __getstate__(self):
+        # Les projections ne se sérialisent pas : rouvertes dans le processus cible
+        return {'path': self.path, 'solutions_path': self.solutions_path,
+                'cache_size': self.cache_size, 'build': self.build}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+
+class ChainedDataset(Mapping):
+    """Union ordonnée de plusieurs mappings de puzzles (le dernier l'emporte en cas de doublon)."""
+
+    def __init__(self, datasets):
+        self.datasets = list(datasets)
+        self._owners = {}
+        for dataset in self.datasets:
+            for puzzle_id in dataset:
+                self._owners[puzzle_id] = dataset
+
+    def __getitem__(self, puzzle_id):
+        return self._owners[puzzle_id][puzzle_id]
+
+    def __contains__(self, puzzle_id):
+        return puzzle_id in self._owners
+
+    def __iter__(self):
+        return iter(self._owners)
+
+    def __len__(self):
+        return len(self._owners)
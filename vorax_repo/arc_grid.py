@@ -0,0 +1,203 @@
+"""
+Type valeur ArcGrid : grille ARC compacte (uint8, lecture seule) avec
+propriétés dérivées calculées paresseusement puis mises en cache.
+"""
+import hashlib
+
+import numpy as np
+
+# Nombre de couleurs ARC (valeurs 0 à 9)
+N_COLORS = 10
+
+# Couleur de fond utilisée pour la boîte englobante
+BACKGROUND = 0
+
+
+class ArcGrid:
+    """Grille ARC immuable stockée en uint8.
+
+    Les propriétés dérivées (histogramme, boîte englobante, empreinte,
+    entropie, symétries) ne sont calculées qu'au premier accès.
+    """
+
+    __slots__ = ('_data', '_histogram', '_bbox', '_content_hash', '_entropy', '_symmetry')
+
+    def __init__(self, grid):
+        if isinstance(grid, ArcGrid):
+            data = grid._data
+        elif isinstance(grid, np.ndarray) and grid.dtype == np.uint8 and not grid.flags.writeable:
+            # Vue uint8 déjà en lecture seule : aucune copie
+            data = grid
+        else:
+            data = np.array(grid, dtype=np.uint8)
+            if data.ndim != 2:
+                if data.size:
+                    raise ValueError(f"Grille ARC 2D attendue, reçu {data.ndim} dimension(s)")
+                data = data.reshape(0, 0)
+            data.flags.writeable = False
+
+        self._data = data
+        self._histogram = None
+        self._bbox = None
+        self._content_hash = None
+        self._entropy = None
+        self._symmetry = None
+
+    # Interopérabilité NumPy / listes
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and np.dtype(dtype) != self._data.dtype:
+            return self._data.astype(dtype)
+        if copy:
+            return self._data.copy()
+        return self._data
+
+    def tolist(self):
+        """Conversion en liste de listes (format JSON ARC)."""
+        return self._data.tolist()
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, ArcGrid):
+            return self.shape == other.shape and self.content_hash == other.content_hash
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.content_hash)
+
+    def __repr__(self):
+        return f"ArcGrid({self.height}x{self.width}, hash={self.content_hash[:8]})"
+
+    # Propriétés de base
+    @property
+    def array(self):
+        """Tableau uint8 sous-jacent (lecture seule)."""
+        return self._data
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    @property
+    def height(self):
+        return self._data.shape[0]
+
+    @property
+    def width(self):
+        return self._data.shape[1]
+
+    @property
+    def size(self):
+        return self._data.size
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    # Propriétés dérivées (mises en cache au premier accès)
+    @property
+    def histogram(self):
+        """Nombre de cellules par couleur (bincount sur les 10 couleurs)."""
+        if self._histogram is None:
+            hist = np.bincount(self._data.ravel(), minlength=N_COLORS)
+            hist.flags.writeable = False
+            self._histogram = hist
+        return self._histogram
+
+    @property
+    def colors(self):
+        """Couleurs présentes dans la grille, triées."""
+        return [int(c) for c in np.flatnonzero(self.histogram)]
+
+    @property
+    def bbox(self):
+        """Boîte englobante du contenu non-fond (rmin, rmax, cmin, cmax) ou None."""
+        if self._bbox is None:
+            mask = self._data != BACKGROUND
+            if not mask.any():
+                self._bbox = ()
+            else:
+                rows = np.flatnonzero(mask.any(axis=1))
+                cols = np.flatnonzero(mask.any(axis=0))
+                self._bbox = (int(rows[0]), int(rows[-1]), int(cols[0]), int(cols[-1]))
+        return self._bbox or None
+
+    @property
+    def content_hash(self):
+        """Empreinte du contenu (dimensions + cellules)."""
+        if self._content_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.asarray(self._data.shape, dtype=np.int32).tobytes())
+            digest.update(np.ascontiguousarray(self._data).tobytes())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @property
+    def entropy(self):
+        """Entropie de Shannon des couleurs (bits)."""
+        if self._entropy is None:
+            counts = self.histogram[self.histogram > 0]
+            if self.size == 0:
+                self._entropy = 0.0
+            else:
+                probabilities = counts / self.size
+                self._entropy = float(-np.sum(probabilities * np.log2(probabilities)))
+        return self._entropy
+
+    @property
+    def symmetry(self):
+        """Symétries de la grille (horizontale, verticale, rotation 180, transposition)."""
+        if self._symmetry is None:
+            data = self._data
+            self._symmetry = {
+                'horizontal': bool(np.array_equal(data, data[:, ::-1])),
+                'vertical': bool(np.array_equal(data, data[::-1, :])),
+                'rot180': bool(np.array_equal(data, data[::-1, ::-1])),
+                'transpose': data.shape[0] == data.shape[1] and bool(np.array_equal(data, data.T)),
+            }
+        return self._symmetry
+
+
+def as_grid(grid):
+    """Retourne une ArcGrid (sans copie si c'en est déjà une)."""
+    return grid if isinstance(grid, ArcGrid) else ArcGrid(grid)
+
+
+def _convert_example(example):
+    """Convertit les grilles 'input'/'output' d'un exemple quand elles sont 2D."""
+    converted = {}
+    for key, value in example.items():
+        if key in ('input', 'output'):
+            try:
+                value = as_grid(value)
+            except (ValueError, TypeError):
+                # Listes de grilles (solutions multi-tests) : laissées telles quelles
+                pass
+        converted[key] = value
+    return converted
+
+
+def as_arc_puzzle(puzzle):
+    """Convertit toutes les grilles d'un puzzle (train et test) en ArcGrid."""
+    converted = dict(puzzle)
+    converted['train'] = [_convert_example(example) for example in puzzle.get('train', [])]
+    test = puzzle.get('test')
+    if isinstance(test, dict):
+        converted['test'] = _convert_example(test)
+    elif isinstance(test, list):
+        converted['test'] = [_convert_example(example) for example in test]
+    return converted
+
+
+def test_inputs(puzzle):
+    """Entrées de test d'un puzzle, qu'il ait un seul test (dict) ou plusieurs (liste)."""
+    test = puzzle.get('test')
+    examples = test if isinstance(test, list) else [test] if isinstance(test, dict) else []
+    return [example['input'] for example in examples if isinstance(example, dict) and 'input' in example]
@@ -0,0 +1,221 @@
+"""
+Évaluation groupée des transformations sur les exemples d'entraînement ARC.
+
+Toutes les transformations d'un registre sont testées sur toutes les paires
+d'entraînement d'un puzzle en une seule passe : les paires sont regroupées par
+dimensions (entrée, sortie) et empilées, chaque groupe possède un tampon de
+sortie partagé entre les transformations, et la comparaison se fait en bloc.
+"""
+import numpy as np
+
+from arc_grid import as_grid
+
+
+class MatchMatrix:
+    """Matrice booléenne (transformations x exemples d'entraînement)."""
+
+    def __init__(self, names, matches, n_examples):
+        self.names = tuple(names)
+        self.matches = matches
+        self.n_examples = n_examples
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self.names)
+
+    def match_counts(self):
+        """Nombre d'exemples reproduits par chaque transformation."""
+        return self.matches.sum(axis=1)
+
+    def rate_array(self):
+        """Taux de correspondance de chaque transformation (ordre du registre)."""
+        if self.n_examples == 0:
+            return np.zeros(len(self.names))
+        return self.match_counts() / self.n_examples
+
+    def rates(self):
+        """Taux de correspondance par nom de transformation.
+
+        Vide pour un puzzle sans exemple d'entraînement : ses transformations ne
+        sont pas comptées comme tentées.
+        """
+        if self.n_examples == 0:
+            return {}
+        return {name: float(rate) for name, rate in zip(self.names, self.rate_array())}
+
+    def rate(self, name):
+        """Taux de correspondance d'une transformation donnée."""
+        if name not in self._index or self.n_examples == 0:
+            return 0.0
+        return float(self.matches[self._index[name]].sum() / self.n_examples)
+
+    def best(self):
+        """Meilleure transformation (la première en cas d'égalité) et son taux."""
+        if not self.names:
+            return None, 0.0
+        rates = self.rate_array()
+        idx = int(np.argmax(rates))
+        if rates[idx] <= 0:
+            return None, 0.0
+        return self.names[idx], float(rates[idx])
+
+    def consistent(self):
+        """Transformations qui reproduisent tous les exemples d'entraînement."""
+        if self.n_examples == 0:
+            return []
+        full = self.matches.all(axis=1)
+        return [name for name, ok in zip(self.names, full) if ok]
+
+
+def _registry_items(transformations):
+    """Accepte un registre dict (V3) ou une liste de paires (V2)."""
+    if isinstance(transformations, dict):
+        return list(transformations.items())
+    return list(transformations)
+
+
+def group_train_pairs(train_examples, with_hashes=False):
+    """Regroupe les paires d'entraînement par dimensions (entrée, sortie).
+
+    Retourne une liste de tuples (indices, entrées empilées, sorties empilées,
+    empreintes des entrées ou None). Les exemples incomplets sont ignorés
+    (ils ne comptent jamais comme réussis).
+    """
+    groups = {}
+    for idx, example in enumerate(train_examples):
+        if 'input' not in example or 'output' not in example:
+            continue
+        input_grid = np.asarray(example['input'])
+        output_grid = np.asarray(example['output'])
+        if input_grid.ndim != 2 or output_grid.ndim != 2:
+            continue
+        key = (input_grid.shape, output_grid.shape)
+        groups.setdefault(key, ([], [], [], []))
+        groups[key][0].append(idx)
+        groups[key][1].append(input_grid)
+        groups[key][2].append(output_grid)
+        if with_hashes:
+            groups[key][3].append(as_grid(example['input']).content_hash)
+
+    stacked = []
+    for indices, inputs, outputs, hashes in groups.values():
+        inputs = np.stack(inputs)
+        inputs.flags.writeable = False  # Les transformations ne doivent pas modifier les entrées
+        stacked.append((np.array(indices), inputs, np.stack(outputs), hashes if with_hashes else None))
+    return stacked
+
+
+def apply_transform(transform_func, grid, name=None, memo=None, grid_hash=None):
+    """Applique une transformation, via le mémo (empreinte de grille, nom) si fourni."""
+    if memo is None or name is None:
+        return np.asarray(transform_func(grid))
+    if grid_hash is None:
+        grid_hash = as_grid(grid).content_hash
+    return memo.get_or_compute(
+        ('transform', grid_hash, name),
+        lambda: np.asarray(transform_func(grid))
+    )
+
+
+def _apply_to_group(transform_func, inputs, outputs, buffer, name=None, memo=None, hashes=None):
+    """Applique une transformation grille par grille dans le tampon partagé.
+
+    Retourne un masque des exemples du groupe dont la sortie a pu être écrite,
+    et vrai si la transformation a été exécutée au moins une fois (hors mémo).
+    """
+    written = np.zeros(len(inputs), dtype=bool)
+    executed = False
+
+    def _run(grid):
+        nonlocal executed
+        executed = True
+        return transform_func(grid)
+
+    for k in range(len(inputs)):
+        try:
+            transformed = apply_transform(
+                _run, inputs[k], name, memo, hashes[k] if hashes else None
+            )
+        except Exception:
+            continue
+        if transformed.shape != outputs.shape[1:]:
+            continue
+        if transformed.dtype != buffer.dtype:
+            # Type différent (float, int64...) : comparaison directe sans conversion
+            if np.array_equal(transformed, outputs[k]):
+                buffer[k] = outputs[k]
+                written[k] = True
+            continue
+        buffer[k] = transformed
+        written[k] = True
+    return written, executed
+
+
+def evaluate_transformations(transformations, train_examples, stack_transforms=None, memo=None,
+                             shape_index=None, parametric=(), stats=None):
+    """Construit la matrice de correspondance de toutes les transformations.
+
+    Args:
+        transformations: registre {nom: fonction} ou liste [(nom, fonction)]
+        train_examples: liste des paires {'input', 'output'} du puzzle
+        stack_transforms: versions vectorisées optionnelles {nom: fonction}
+            opérant sur une pile (k, h, w) de grilles de même dimension
+        memo: AnalysisMemo optionnel pour les résultats (grille, transformation)
+        shape_index: ShapeSignatureIndex optionnel construit sur le même registre ;
+            seules les transformations pouvant produire la forme attendue sont exécutées
+        parametric: noms des transformations paramétrées par le puzzle (paramètres
+            inférés des paires d'entraînement), dont les résultats ne sont jamais mémorisés
+        stats: dict optionnel complété avec 'executed', le nombre de
+            transformations réellement exécutées (ni élaguées par l'index de
+            formes, ni lues dans le mémo) sur au moins une paire
+
+    Returns:
+        MatchMatrix dont les lignes suivent l'ordre du registre
+    """
+    items = _registry_items(transformations)
+    stack_transforms = stack_transforms or {}
+    names = [name for name, _ in items]
+    matches = np.zeros((len(items), len(train_examples)), dtype=bool)
+    executed = set()
+    if shape_index is not None and shape_index.names != names:
+        raise ValueError("L'index de formes ne correspond pas au registre de transformations")
+
+    for indices, inputs, outputs, hashes in group_train_pairs(train_examples, with_hashes=memo is not None):
+        buffer = np.empty_like(outputs)
+        flat_outputs = outputs.reshape(len(outputs), -1)
+
+        if shape_index is not None:
+            rows = shape_index.candidates(inputs.shape[1:], outputs.shape[1:])
+        else:
+            rows = range(len(items))
+
+        for row in rows:
+            name, transform_func = items[row]
+            stack_func = stack_transforms.get(name)
+            stacked = None
+            if stack_func is not None:
+                executed.add(row)
+                try:
+                    stacked = stack_func(inputs)
+                except Exception:
+                    stacked = None  # Repli sur l'application grille par grille
+            if stacked is not None:
+                if stacked.shape != outputs.shape:
+                    continue
+                equal = (stacked.reshape(len(outputs), -1) == flat_outputs).all(axis=1)
+            else:
+                memo_name = None if name in parametric else name
+                written, ran = _apply_to_group(transform_func, inputs, outputs, buffer, memo_name, memo, hashes)
+                if ran:
+                    executed.add(row)
+                if not written.any():
+                    continue
+                equal = written & (buffer.reshape(len(outputs), -1) == flat_outputs).all(axis=1)
+            matches[row, indices] = equal
+
+    if stats is not None:
+        stats['executed'] = len(executed)
+    return MatchMatrix(names, matches, len(train_examples))
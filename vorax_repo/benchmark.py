@@ -0,0 +1,313 @@
+"""
+Banc d'essai des chemins critiques du solveur ARC (HybridVoraxModelV3).
+
+Mesure, sur des corpus de puzzles fixes (synthetic_arc avec une graine, ou
+fichiers ARC) :
+- chaque transformation du registre sur des grilles de 3x3 à 30x30 ;
+- _test_transformations, learn_from_dataset, solve et generate_submission.
+
+Chaque mesure rapporte la latence médiane et au 95e centile, le débit en
+puzzles par seconde et le pic de mémoire allouée (tracemalloc, mesuré lors
+d'une exécution séparée pour ne pas fausser les temps). Les résultats sont
+enregistrés en JSON avec le commit courant, pour comparer deux commits :
+
+    python benchmark.py --output results/bench_a.json
+    python benchmark.py --output results/bench_b.json
+    python benchmark.py --compare results/bench_a.json results/bench_b.json
+
+Le modèle est importé du paquet vorax, d'où est aussi généré le notebook
+Kaggle (bundle_notebook.py).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from analysis_memo import AnalysisMemo
+from arc_grid import as_arc_puzzle
+from puzzle_store import iter_arc_puzzles
+from synthetic_arc import generate_corpus, model_registry
+from vorax import Config, HybridVoraxModelV3, analysis_memo, generate_submission
+
+# Tailles des grilles pour les transformations (3x3 à 30x30)
+GRID_SIZES = (3, 5, 10, 20, 30)
+
+
+def arc_corpora(data_path, n_train, n_eval):
+    """Corpus fixes lus depuis les fichiers ARC : les premiers identifiants triés de chaque source."""
+    by_source = {}
+    for source, puzzle_id, puzzle in iter_arc_puzzles(data_path):
+        by_source.setdefault(source, {})[puzzle_id] = puzzle
+    corpora = []
+    for source, n in (('training', n_train), ('evaluation', n_eval)):
+        puzzles = by_source.get(source, {})
+        corpora.append({puzzle_id: as_arc_puzzle(puzzles[puzzle_id]) for puzzle_id in sorted(puzzles)[:n]})
+    return corpora
+
+
+def summarize(samples, n_puzzles=None, peak_bytes=None):
+    """Statistiques d'une série de durées (s) : médiane, p95, moyenne (ms), débit et pic mémoire."""
+    samples = np.asarray(samples, dtype=float)
+    result = {
+        'runs': int(len(samples)),
+        'median_ms': float(np.median(samples) * 1000),
+        'p95_ms': float(np.percentile(samples, 95) * 1000),
+        'mean_ms': float(samples.mean() * 1000),
+    }
+    if n_puzzles:
+        total = float(samples.sum())
+        result['puzzles_per_s'] = n_puzzles / total if total > 0 else None
+    if peak_bytes is not None:
+        result['peak_mb'] = peak_bytes / 1024 ** 2
+    return result
+
+
+def peak_memory(fn):
+    """Pic de mémoire allouée (octets) pendant un appel de fn."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_transforms(repeats, seed):
+    """Latence de chaque transformation du registre, par taille de grille."""
+    model = HybridVoraxModelV3(memo=AnalysisMemo())
+    rng = np.random.default_rng(seed)
+    results = {}
+    for size in GRID_SIZES:
+        grid = rng.integers(0, 10, size=(size, size))
+        # Transformations paramétrées liées sur un puzzle trivial de la même taille
+        registry = model._bound_registry({'train': [{'input': grid, 'output': grid}]})
+        for name, transform in registry.items():
+            if transform == model._unbound_transform:
+                continue
+            samples = []
+            for _ in range(repeats):
+                t_start = time.perf_counter()
+                transform(grid)
+                samples.append(time.perf_counter() - t_start)
+            peak = peak_memory(lambda: transform(grid))
+            results[f'transform/{name}/{size}x{size}'] = summarize(samples, peak_bytes=peak)
+    return results
+
+
+def _fresh_model():
+    """Modèle neuf avec des mémos vides (mesures à froid)."""
+    analysis_memo.clear()
+    return HybridVoraxModelV3(memo=AnalysisMemo(max_bytes=Config.MEMO_MAX_BYTES))
+
+
+def bench_test_transformations(puzzles, repeats):
+    """Évaluation groupée du registre sur chaque puzzle, mémo vide à chaque répétition."""
+    samples = []
+
+    def _run(model, record):
+        for puzzle in puzzles.values():
+            t_start = time.perf_counter()
+            model._test_transformations(puzzle)
+            if record:
+                samples.append(time.perf_counter() - t_start)
+
+    for _ in range(repeats):
+        _run(_fresh_model(), True)
+    model = _fresh_model()
+    return summarize(samples, len(puzzles) * repeats, peak_memory(lambda: _run(model, False)))
+
+
+def bench_learn(puzzles, repeats):
+    """Apprentissage séquentiel complet sur le corpus (modèle neuf à chaque répétition)."""
+    samples = []
+
+    def _learn(model):
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.learn_from_dataset(puzzles, n_workers=1)
+
+    for _ in range(repeats):
+        model = _fresh_model()
+        t_start = time.perf_counter()
+        _learn(model)
+        samples.append(time.perf_counter() - t_start)
+    model = _fresh_model()
+    result = summarize(samples, peak_bytes=peak_memory(lambda: _learn(model)))
+    result['puzzles_per_s'] = len(puzzles) / (result['median_ms'] / 1000) if result['median_ms'] else None
+    return result, model
+
+
+def bench_solve(model, puzzles, repeats):
+    """Résolution de chaque puzzle du corpus par un modèle entraîné, mémo vide à chaque répétition."""
+    samples = []
+
+    def _run(record):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for puzzle_id, puzzle in puzzles.items():
+                t_start = time.perf_counter()
+                model.solve(puzzle_id, puzzle)
+                if record:
+                    samples.append(time.perf_counter() - t_start)
+
+    for _ in range(repeats):
+        analysis_memo.clear()
+        model.memo.clear()
+        _run(True)
+    analysis_memo.clear()
+    model.memo.clear()
+    return summarize(samples, len(puzzles) * repeats, peak_memory(lambda: _run(False)))
+
+
+def bench_submission(model, puzzles, repeats, n_workers, time_limit, output_dir):
+    """Génération complète de la soumission (pic mémoire du processus principal seulement)."""
+    samples = []
+
+    def _run():
+        analysis_memo.clear()
+        model.memo.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_submission(puzzles, model, time_limit=time_limit, n_workers=n_workers, output_dir=output_dir)
+
+    for _ in range(repeats):
+        t_start = time.perf_counter()
+        _run()
+        samples.append(time.perf_counter() - t_start)
+    result = summarize(samples, peak_bytes=peak_memory(_run))
+    result['puzzles_per_s'] = len(puzzles) / (result['median_ms'] / 1000) if result['median_ms'] else None
+    return result
+
+
+def git_commit():
+    """Commit courant du dépôt, ou None hors d'un dépôt git."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(data_path=None, n_train=200, n_eval=50, seed=0, repeats=5, transform_repeats=50,
+                   n_workers=1, time_limit=600, only=None):
+    """Exécute le banc d'essai ; retourne {'meta': ..., 'benchmarks': {nom: statistiques}}."""
+    output_dir = tempfile.mkdtemp(prefix='vorax_bench_')
+    if data_path:
+        train_puzzles, eval_puzzles = arc_corpora(data_path, n_train, n_eval)
+    else:
+        # Corpus synthétiques fixes (synthetic_arc), grilles limitées à 15x15
+        registry = model_registry(HybridVoraxModelV3(memo=AnalysisMemo()))
+        corpus = {pid: as_arc_puzzle(puzzle)
+                  for pid, puzzle in generate_corpus(registry, n_train + n_eval, seed, max_size=15).items()}
+        ids = list(corpus)
+        train_puzzles = {pid: corpus[pid] for pid in ids[:n_train]}
+        eval_puzzles = {pid: corpus[pid] for pid in ids[n_train:]}
+
+    def _selected(name):
+        return only is None or name in only
+
+    benchmarks = {}
+    if _selected('transforms'):
+        benchmarks.update(bench_transforms(transform_repeats, seed))
+    if _selected('test_transformations'):
+        benchmarks['test_transformations'] = bench_test_transformations(train_puzzles, repeats)
+    model = None
+    if _selected('learn') or _selected('solve') or _selected('submission'):
+        learn, model = bench_learn(train_puzzles, repeats if _selected('learn') else 1)
+        if _selected('learn'):
+            benchmarks['learn_from_dataset'] = learn
+    if _selected('solve'):
+        benchmarks['solve'] = bench_solve(model, eval_puzzles, repeats)
+    if _selected('submission'):
+        benchmarks['generate_submission'] = bench_submission(model, eval_puzzles, max(1, repeats // 2),
+                                                             n_workers, time_limit, output_dir)
+
+    meta = {
+        'commit': git_commit(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'corpus': data_path or 'synthetic',
+        'seed': seed,
+        'train_puzzles': len(train_puzzles),
+        'eval_puzzles': len(eval_puzzles),
+        'repeats': repeats,
+        'n_workers': n_workers,
+    }
+    return {'meta': meta, 'benchmarks': benchmarks}
+
+
+def compare_results(before, after):
+    """Lignes de comparaison (médiane et p95) entre deux résultats, par mesure commune."""
+    lines = [f"{'mesure':<45} {'médiane avant':>14} {'après':>10} {'ratio':>7} {'p95 ratio':>10}"]
+    for name, old in before['benchmarks'].items():
+        new = after['benchmarks'].get(name)
+        if new is None:
+            continue
+        ratio = new['median_ms'] / old['median_ms'] if old['median_ms'] else float('nan')
+        p95_ratio = new['p95_ms'] / old['p95_ms'] if old['p95_ms'] else float('nan')
+        lines.append(f"{name:<45} {old['median_ms']:>12.3f}ms {new['median_ms']:>8.3f}ms "
+                     f"{ratio:>6.2f}x {p95_ratio:>9.2f}x")
+    return lines
+
+
+def format_results(results):
+    """Tableau lisible des résultats."""
+    lines = [f"{'mesure':<45} {'médiane':>10} {'p95':>10} {'puzzles/s':>10} {'pic Mo':>8}"]
+    for name, stats in results['benchmarks'].items():
+        rate = stats.get('puzzles_per_s')
+        rate = f"{rate:.1f}" if rate is not None else '-'
+        lines.append(f"{name:<45} {stats['median_ms']:>8.3f}ms {stats['p95_ms']:>8.3f}ms "
+                     f"{rate:>10} {stats.get('peak_mb', float('nan')):>8.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai du solveur ARC")
+    parser.add_argument('--data', default=None, help='données ARC (sinon corpus synthétique fixe)')
+    parser.add_argument('--train', type=int, default=200, help="puzzles du corpus d'apprentissage")
+    parser.add_argument('--eval', type=int, default=50, help="puzzles du corpus d'évaluation")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--transform-repeats', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=1, help='processus pour generate_submission')
+    parser.add_argument('--time-limit', type=float, default=600, help='échéance de generate_submission (s)')
+    parser.add_argument('--only', nargs='+', choices=('transforms', 'test_transformations', 'learn', 'solve', 'submission'))
+    parser.add_argument('--output', default=None, help='fichier JSON des résultats')
+    parser.add_argument('--compare', nargs=2, metavar=('AVANT', 'APRES'), help='compare deux fichiers de résultats')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        print(f"Avant: {before['meta'].get('commit')} | Après: {after['meta'].get('commit')}")
+        print('\n'.join(compare_results(before, after)))
+        return
+
+    results = run_benchmarks(args.data, args.train, args.eval, args.seed, args.repeats,
+                             args.transform_repeats, args.workers, args.time_limit, args.only)
+    print('\n'.join(format_results(results)))
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
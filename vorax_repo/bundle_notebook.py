@@ -0,0 +1,273 @@
+"""
+Générateur des notebooks Kaggle à partir des modules du dépôt.
+
+Chaque pilote (arc_model/hybridvoraxmodelv3.py, arc_model/hybridvoraxmodelv4.py)
+est un script au format
+« percent » de jupytext : chaque marque « # %% » ouvre une cellule de code,
+« # %% [markdown] » une cellule de texte, et « # %% tags=["visualization"] »
+une cellule d'affichage. Le notebook produit contient :
+- les cellules de texte et de code du pilote, sans les cellules d'affichage ;
+- avant elles, une cellule par module du dépôt importé par le pilote,
+  directement ou non, dans l'ordre des dépendances. Chaque cellule installe
+  le source du module dans sys.modules (_install_module) : les imports du
+  pilote et des modules restent inchangés et le kernel n'a besoin d'aucun
+  dataset attaché.
+
+Seules les importations de premier niveau des modules sont suivies. Les
+modules d'affichage (vorax.visualization, matplotlib) ne sont intégrés
+qu'avec --keep-visualization, ce qui évite d'importer matplotlib au
+démarrage du kernel soumis.
+
+Sans pilote en argument, tous les notebooks de NOTEBOOKS sont régénérés.
+
+Usage :
+    python bundle_notebook.py
+    python bundle_notebook.py arc_model/hybridvoraxmodelv3.py --keep-visualization \
+        --output results/hybridvoraxmodelv3-local.ipynb
+"""
+import argparse
+import ast
+import json
+import os
+import re
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_DRIVER = os.path.join(REPO_DIR, 'arc_model', 'hybridvoraxmodelv3.py')
+DEFAULT_NOTEBOOK = os.path.join(REPO_DIR, 'arc_model', 'hybridvoraxmodelv3-arc-prize-2025-ultra-optimis.ipynb')
+
+# Notebooks Kaggle générés : pilote -> notebook
+NOTEBOOKS = {
+    DEFAULT_DRIVER: DEFAULT_NOTEBOOK,
+    os.path.join(REPO_DIR, 'arc_model', 'hybridvoraxmodelv4.py'):
+        os.path.join(REPO_DIR, 'arc_model', 'hybridvoraxmodelv4-arc-prize-2025-corrected.ipynb'),
+}
+
+# Modules et cellules d'affichage, écartés du notebook Kaggle
+VISUALIZATION_MODULES = ('vorax.visualization',)
+VISUALIZATION_TAG = 'visualization'
+
+NOTEBOOK_METADATA = {
+    'kernelspec': {'display_name': 'Python 3', 'language': 'python', 'name': 'python3'},
+    'language_info': {'name': 'python', 'version': '3.7', 'mimetype': 'text/x-python',
+                      'codemirror_mode': {'name': 'ipython', 'version': 3}, 'pygments_lexer': 'ipython3',
+                      'nbconvert_exporter': 'python', 'file_extension': '.py'},
+}
+
+# Cellule d'installation des modules intégrés
+BOOTSTRAP = '''# Modules du solveur intégrés au notebook par bundle_notebook.py (source : dépôt Vorax)
+import linecache
+import sys
+import types
+
+def _install_module(name, source, is_package=False):
+    """Exécute source comme module name et l'enregistre dans sys.modules."""
+    source = source[1:] if source.startswith('\\n') else source
+    filename = f"<vorax>/{name.replace('.', '/')}{'/__init__' if is_package else ''}.py"
+    # Source consultable dans les traces d'erreur
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    parent, _, child = name.rpartition('.')
+    if parent and parent not in sys.modules:
+        package = types.ModuleType(parent)
+        package.__path__ = []
+        package.__package__ = parent
+        sys.modules[parent] = package
+    module = sys.modules.get(name) or types.ModuleType(name)
+    module.__file__ = filename
+    module.__package__ = name if is_package else parent
+    if is_package:
+        module.__path__ = []
+    sys.modules[name] = module
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    exec(compile(source, filename, 'exec'), module.__dict__)
+    return module
+'''
+
+_CELL_MARK = re.compile(r'^# %%(?P<options>.*)$')
+
+
+def parse_driver(path):
+    """Cellules du pilote : liste de {'cell_type', 'source', 'tags'} (texte avant la première marque ignoré)."""
+    cells = []
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    current = None
+    for line in lines:
+        match = _CELL_MARK.match(line)
+        if match:
+            options = match.group('options').strip()
+            tags = re.search(r'tags=(\[.*?\])', options)
+            current = {'cell_type': 'markdown' if options.startswith('[markdown]') else 'code',
+                       'tags': json.loads(tags.group(1)) if tags else [], 'lines': []}
+            cells.append(current)
+        elif current is not None:
+            current['lines'].append(line)
+    for cell in cells:
+        lines = cell.pop('lines')
+        if cell['cell_type'] == 'markdown':
+            lines = [line[2:] if line.startswith('# ') else line.lstrip('#') for line in lines]
+        cell['source'] = '\n'.join(lines).strip('\n')
+    return cells
+
+
+def module_file(name):
+    """Fichier du module name dans le dépôt ((chemin, paquet ?)), ou None s'il n'en fait pas partie."""
+    base = os.path.join(REPO_DIR, *name.split('.'))
+    if os.path.isfile(base + '.py'):
+        return base + '.py', False
+    if os.path.isfile(os.path.join(base, '__init__.py')):
+        return os.path.join(base, '__init__.py'), True
+    return None
+
+
+def _top_level(body):
+    # Instructions exécutées au chargement : corps du module, des if et des try
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from _top_level(node.body + node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from _top_level(node.body + node.orelse + node.finalbody
+                                  + [n for handler in node.handlers for n in handler.body])
+
+
+def imported_modules(tree, package=''):
+    """Noms complets des modules importés au premier niveau (imports relatifs résolus dans package)."""
+    names = []
+    for node in _top_level(tree.body):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.split('.')[:len(package.split('.')) - node.level + 1]
+                module = '.'.join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module
+            names.append(module)
+            # from paquet import sous_module
+            names.extend(f'{module}.{alias.name}' for alias in node.names if module_file(f'{module}.{alias.name}'))
+    return names
+
+
+def dependency_order(roots, exclude=()):
+    """Modules du dépôt nécessaires aux racines, dépendances d'abord.
+
+    Returns:
+        liste de (nom, chemin, paquet ?)
+
+    Raises:
+        ValueError si un module nécessaire fait partie des modules exclus
+    """
+    order, visiting, done = [], set(), set()
+
+    def visit(name, importer):
+        if name in done or name in visiting:
+            return
+        found = module_file(name)
+        if found is None:
+            return
+        if name in exclude:
+            raise ValueError(f"{importer} importe {name}, exclu du notebook")
+        visiting.add(name)
+        path, is_package = found
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        package = name if is_package else name.rpartition('.')[0]
+        for dependency in imported_modules(tree, package):
+            visit(dependency, name)
+        visiting.discard(name)
+        done.add(name)
+        order.append((name, path, is_package))
+
+    for name, importer in roots:
+        visit(name, importer)
+    return order
+
+
+def _literal(source):
+    # Chaîne brute lisible si possible, sinon repr
+    if "'''" not in source and not source.endswith('\\'):
+        return "r'''\n" + source + "'''"
+    return repr(source)
+
+
+def module_cell(name, path, is_package):
+    """Source de la cellule qui installe le module name."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    relative = os.path.relpath(path, REPO_DIR)
+    flag = ', is_package=True' if is_package else ''
+    return f"# Module {name} ({relative})\n_install_module({name!r}, {_literal(source)}{flag})"
+
+
+def _code_cell(source, tags=()):
+    return {'cell_type': 'code', 'execution_count': None, 'metadata': {'tags': list(tags)} if tags else {},
+            'outputs': [], 'source': source}
+
+
+def build_notebook(driver=DEFAULT_DRIVER, keep_visualization=False):
+    """Notebook (dict nbformat 4) : modules intégrés puis cellules du pilote.
+
+    Returns:
+        (notebook, liste des modules intégrés)
+    """
+    cells = [cell for cell in parse_driver(driver)
+             if keep_visualization or VISUALIZATION_TAG not in cell['tags']]
+    roots = []
+    for index, cell in enumerate(cells):
+        if cell['cell_type'] == 'code':
+            roots.extend((name, f'cellule {index}') for name in imported_modules(ast.parse(cell['source'])))
+    modules = dependency_order(roots, exclude=() if keep_visualization else VISUALIZATION_MODULES)
+
+    notebook_cells = []
+    module_cells = [_code_cell(BOOTSTRAP.rstrip('\n'))] + [_code_cell(module_cell(*module)) for module in modules]
+    # Modules installés après la présentation (première cellule de texte)
+    if cells and cells[0]['cell_type'] == 'markdown':
+        notebook_cells.append({'cell_type': 'markdown', 'metadata': {}, 'source': cells.pop(0)['source']})
+    notebook_cells.extend(module_cells)
+    for cell in cells:
+        if cell['cell_type'] == 'markdown':
+            notebook_cells.append({'cell_type': 'markdown', 'metadata': {}, 'source': cell['source']})
+        else:
+            notebook_cells.append(_code_cell(cell['source'], cell['tags']))
+    notebook = {'metadata': NOTEBOOK_METADATA, 'nbformat': 4, 'nbformat_minor': 4, 'cells': notebook_cells}
+    return notebook, [name for name, _, _ in modules]
+
+
+def write_notebook(notebook, path):
+    """Écrit le notebook (JSON compact, comme les notebooks Kaggle du dépôt)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(notebook, f, separators=(',', ':'), ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Génère les notebooks Kaggle à partir des modules du dépôt')
+    parser.add_argument('driver', nargs='?', help='pilote au format percent (# %%) ; tous ceux de NOTEBOOKS sinon')
+    parser.add_argument('--output', '-o', help='notebook produit (par défaut celui du pilote dans NOTEBOOKS)')
+    parser.add_argument('--keep-visualization', action='store_true',
+                        help='garder les cellules et modules d\'affichage (matplotlib)')
+    args = parser.parse_args(argv)
+
+    if args.driver is None:
+        if args.output:
+            parser.error('--output demande un pilote')
+        builds = list(NOTEBOOKS.items())
+    else:
+        output = args.output or NOTEBOOKS.get(os.path.abspath(args.driver))
+        if output is None:
+            parser.error(f'aucun notebook par défaut pour {args.driver} : préciser --output')
+        builds = [(args.driver, output)]
+
+    for driver, output in builds:
+        notebook, modules = build_notebook(driver, args.keep_visualization)
+        write_notebook(notebook, output)
+        print(f"{len(notebook['cells'])} cellules, {len(modules)} modules intégrés ({', '.join(modules)})")
+        print(f"Notebook écrit dans {output} ({os.path.getsize(output) / 1024:.0f} Ko)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Vérification groupée de programmes candidats sur les exemples d'entraînement.
+
+Un seul appel indique quels programmes (transformations grille -> grille)
+reproduisent toutes les sorties d'entraînement d'un puzzle. Les sorties
+attendues sont regroupées par dimensions ; pour chaque groupe, les sorties des
+candidats encore en lice sont comparées d'abord par forme, puis par empreinte
+de leurs octets (uint8), et seules les empreintes égales sont confirmées
+élément par élément. Un candidat écarté n'est plus exécuté sur les exemples
+suivants.
+"""
+import hashlib
+
+import numpy as np
+
+from batch_evaluator import _registry_items
+
+
+def buffer_digest(grid):
+    """Empreinte des octets d'une grille convertie en uint8 (la forme n'y entre pas)."""
+    with np.errstate(invalid='ignore', over='ignore'):
+        data = np.ascontiguousarray(grid, dtype=np.uint8)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).digest()
+
+
+def group_train_outputs(train_examples):
+    """Exemples d'entraînement regroupés par dimensions de sortie.
+
+    Returns:
+        liste de (forme, [(entrée, sortie, empreinte de la sortie)]), les plus
+        petites sorties d'abord (rejets les moins coûteux), ou None si un
+        exemple est incomplet
+    """
+    groups = {}
+    for example in train_examples:
+        if 'input' not in example or 'output' not in example:
+            return None
+        input_grid = np.asarray(example['input'])
+        output_grid = np.asarray(example['output'])
+        groups.setdefault(output_grid.shape, []).append((input_grid, output_grid, buffer_digest(output_grid)))
+    return sorted(groups.items(), key=lambda item: int(np.prod(item[0])))
+
+
+def verify_programs(programs, puzzle):
+    """Programmes qui reproduisent toutes les sorties d'entraînement du puzzle.
+
+    Args:
+        programs: registre {nom: fonction} ou liste [(nom, fonction)]
+        puzzle: puzzle ARC ({'train': [...], ...})
+
+    Returns:
+        noms des programmes vérifiés, dans l'ordre du registre (aucun si le
+        puzzle n'a pas d'exemple d'entraînement complet)
+    """
+    items = _registry_items(programs)
+    groups = group_train_outputs(puzzle.get('train', []))
+    if not groups:
+        return []
+
+    alive = list(range(len(items)))
+    for shape, examples in groups:
+        for input_grid, expected, expected_digest in examples:
+            survivors = []
+            for row in alive:
+                try:
+                    output = np.asarray(items[row][1](input_grid))
+                except Exception:
+                    continue
+                # Forme, puis empreinte des octets, puis comparaison élément par élément
+                if output.shape != shape or buffer_digest(output) != expected_digest:
+                    continue
+                if np.array_equal(output, expected):
+                    survivors.append(row)
+            alive = survivors
+            if not alive:
+                return []
+    return [items[row][0] for row in alive]
@@ -0,0 +1,57 @@
+"""
+Inférence en forme close d'une correspondance de couleurs entrée -> sortie.
+
+Tous les pixels co-localisés des paires d'entraînement sont codés
+(entrée * 10 + sortie) et dédupliqués en une seule passe : une table de
+couleurs existe si et seulement si chaque couleur d'entrée n'est associée
+qu'à une seule couleur de sortie. Les permutations multi-couleurs sont
+donc trouvées directement, sans énumérer les échanges deux à deux.
+"""
+import numpy as np
+
+# Nombre de couleurs ARC
+N_COLORS = 10
+
+
+def infer_color_lut(train_examples):
+    """Table de couleurs (uint8[10]) cohérente avec toutes les paires, ou None.
+
+    Les couleurs absentes des entrées d'entraînement sont conservées telles
+    quelles. Retourne None si une paire change de forme, contient une valeur
+    hors [0, 9] ou si une couleur d'entrée a plusieurs couleurs de sortie.
+    """
+    inputs, outputs = [], []
+    for example in train_examples:
+        if 'input' not in example or 'output' not in example:
+            continue
+        input_grid = np.asarray(example['input'])
+        output_grid = np.asarray(example['output'])
+        if input_grid.shape != output_grid.shape or input_grid.ndim != 2:
+            return None
+        inputs.append(input_grid.ravel())
+        outputs.append(output_grid.ravel())
+
+    if not inputs:
+        return None
+    inputs = np.concatenate(inputs).astype(np.int64)
+    outputs = np.concatenate(outputs).astype(np.int64)
+    if inputs.size == 0:
+        return None
+    if inputs.min() < 0 or inputs.max() >= N_COLORS or outputs.min() < 0 or outputs.max() >= N_COLORS:
+        return None
+
+    # Paires (entrée, sortie) distinctes ; une couleur d'entrée répétée = contradiction
+    codes = np.unique(inputs * N_COLORS + outputs)
+    sources = codes // N_COLORS
+    if len(np.unique(sources)) != len(sources):
+        return None
+
+    lut = np.arange(N_COLORS, dtype=np.uint8)
+    lut[sources] = codes % N_COLORS
+    lut.flags.writeable = False
+    return lut
+
+
+def apply_color_lut(lut, grid):
+    """Applique une table de couleurs à une grille (ou à une pile de grilles)."""
+    return lut[np.asarray(grid)]
@@ -0,0 +1,311 @@
+"""
+Magasin de caractéristiques en colonnes pour tout un jeu de puzzles.
+
+Les caractéristiques de analyze_puzzle / estimate_puzzle_difficulty sont
+calculées en une seule passe vectorisée : toutes les grilles du jeu forment
+une table (une ligne par grille) dont les histogrammes sont obtenus par un
+seul bincount, puis entropies, complexités, moyennes par puzzle et
+difficultés sont calculées colonne par colonne. Le magasin est sauvegardé
+en .npz et rechargé tant que le contenu des puzzles n'a pas changé.
+"""
+import os
+
+import numpy as np
+
+from analysis_memo import puzzle_content_hash
+from arc_grid import N_COLORS
+
+# Rôle d'une grille dans son puzzle
+TRAIN_INPUT = 0
+TRAIN_OUTPUT = 1
+TEST_INPUT = 2
+
+
+def _sequential_sum(terms):
+    """Somme ligne par ligne, de gauche à droite (même arrondi qu'une boucle Python)."""
+    total = np.zeros(len(terms))
+    for column in range(terms.shape[1]):
+        total = total + terms[:, column]
+    return total
+
+
+def _row_entropy(histograms, sizes):
+    """Entropie de Shannon de chaque ligne (égale à ArcGrid.entropy aux arrondis près)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        probabilities = histograms / np.maximum(sizes, 1)[:, None]
+        terms = np.where(histograms > 0, probabilities * np.log2(probabilities), 0.0)
+    return np.where(sizes > 0, -terms.sum(axis=1), 0.0)
+
+
+def _color_mask(histograms):
+    """Masque de bits des couleurs présentes (bit c = couleur c)."""
+    return ((histograms > 0) * (1 << np.arange(histograms.shape[1], dtype=np.int64))).sum(axis=1)
+
+
+def _mask_to_colors(mask):
+    return [c for c in range(64) if mask >> c & 1]
+
+
+class FeatureStore:
+    """Caractéristiques de puzzles en colonnes NumPy, indexées par identifiant de puzzle.
+
+    grids: une ligne par grille (puzzle, exemple, rôle, dimensions, entropie, complexité...)
+    columns: une ligne par puzzle (nombre d'exemples, moyennes, masques de couleurs, difficulté...)
+    """
+
+    def __init__(self, puzzle_ids, content_hashes, columns, grids):
+        self.puzzle_ids = list(puzzle_ids)
+        self.content_hashes = list(content_hashes)
+        self.columns = columns
+        self.grids = grids
+        self._rows = {puzzle_id: row for row, puzzle_id in enumerate(self.puzzle_ids)}
+        self._hash_rows = {puzzle_hash: row for row, puzzle_hash in enumerate(self.content_hashes)}
+        # Début des lignes de chaque puzzle dans la table des grilles (triée par puzzle)
+        self._grid_bounds = np.searchsorted(grids['puzzle'], np.arange(len(self.puzzle_ids) + 1))
+
+    def __len__(self):
+        return len(self.puzzle_ids)
+
+    def __contains__(self, puzzle_id):
+        return puzzle_id in self._rows
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def row(self, puzzle_id):
+        return self._rows[puzzle_id]
+
+    def find(self, content_hash):
+        """Identifiant du puzzle ayant ce contenu, ou None."""
+        row = self._hash_rows.get(content_hash)
+        return None if row is None else self.puzzle_ids[row]
+
+    def difficulty(self, puzzle_id):
+        return float(self.columns['difficulty'][self._rows[puzzle_id]])
+
+    def features(self, puzzle_id, complexity_metrics=True):
+        """Dictionnaire de caractéristiques de analyze_puzzle (flottants égaux aux arrondis près)."""
+        row = self._rows[puzzle_id]
+        cols = self.columns
+        if not cols['has_train'][row]:
+            return {'train_count': 0, 'input_dims': [], 'output_dims': [], 'consistent_dims': False,
+                    'input_values': [], 'output_values': [], 'new_values': [], 'removed_values': []}
+
+        results = {'train_count': int(cols['train_count'][row])}
+        if results['train_count'] == 0:
+            return results
+
+        start, end = self._grid_bounds[row], self._grid_bounds[row + 1]
+        roles = self.grids['role'][start:end]
+        heights = self.grids['height'][start:end]
+        widths = self.grids['width'][start:end]
+        inputs = np.flatnonzero(roles == TRAIN_INPUT)
+        outputs = np.flatnonzero(roles == TRAIN_OUTPUT)
+
+        input_dims = [(int(heights[i]), int(widths[i])) for i in inputs]
+        output_dims = [(int(heights[o]), int(widths[o])) for o in outputs]
+        results['input_dims'] = input_dims
+        results['output_dims'] = output_dims
+        results['consistent_dims'] = bool(cols['consistent_dims'][row])
+        results['size_change'] = [o != i for i, o in zip(input_dims, output_dims)]
+        results['size_ratios'] = [
+            (o[0] * o[1]) / (i[0] * i[1]) if i[0] * i[1] > 0 else 0
+            for i, o in zip(input_dims, output_dims)
+        ]
+
+        input_mask = int(cols['input_values'][row])
+        output_mask = int(cols['output_values'][row])
+        results['input_values'] = _mask_to_colors(input_mask)
+        results['output_values'] = _mask_to_colors(output_mask)
+        results['new_values'] = _mask_to_colors(output_mask & ~input_mask)
+        results['removed_values'] = _mask_to_colors(input_mask & ~output_mask)
+
+        if complexity_metrics and len(inputs):
+            for key in ('input_entropy_avg', 'output_entropy_avg', 'input_complexity_avg',
+                        'output_complexity_avg', 'entropy_change', 'complexity_change'):
+                results[key] = float(cols[key][row])
+
+        if cols['has_test'][row]:
+            test = start + np.flatnonzero(roles == TEST_INPUT)[0]
+            results['test_dim'] = (int(self.grids['height'][test]), int(self.grids['width'][test]))
+            results['test_values'] = _mask_to_colors(int(self.grids['colors'][test]))
+            if complexity_metrics:
+                results['test_entropy'] = float(self.grids['entropy'][test])
+                results['test_complexity'] = float(self.grids['complexity'][test])
+
+        return results
+
+    def save(self, path):
+        """Sauvegarde le magasin dans un fichier .npz."""
+        arrays = {'puzzle_ids': np.array(self.puzzle_ids), 'content_hashes': np.array(self.content_hashes)}
+        arrays.update({f'col_{name}': values for name, values in self.columns.items()})
+        arrays.update({f'grid_{name}': values for name, values in self.grids.items()})
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Recharge un magasin sauvegardé par save()."""
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name[4:]: data[name] for name in data.files if name.startswith('col_')}
+            grids = {name[5:]: data[name] for name in data.files if name.startswith('grid_')}
+            return cls(data['puzzle_ids'].tolist(), data['content_hashes'].tolist(), columns, grids)
+
+
+def build_feature_store(puzzles, content_hashes=None):
+    """Calcule les caractéristiques de tous les puzzles en une passe vectorisée."""
+    puzzle_ids = list(puzzles)
+    if content_hashes is None:
+        content_hashes = [puzzle_content_hash(puzzles[puzzle_id]) for puzzle_id in puzzle_ids]
+    n_puzzles = len(puzzle_ids)
+
+    # Table des grilles : une ligne par grille, valeurs concaténées
+    grid_puzzle, grid_example, grid_role, grid_shape, values = [], [], [], [], []
+    train_count = np.zeros(n_puzzles, dtype=np.int32)
+    has_train = np.zeros(n_puzzles, dtype=bool)
+    has_test = np.zeros(n_puzzles, dtype=bool)
+
+    def _add(row, example, role, grid):
+        grid = np.asarray(grid)
+        grid_puzzle.append(row)
+        grid_example.append(example)
+        grid_role.append(role)
+        grid_shape.append(grid.shape)
+        values.append(grid.ravel())
+
+    for row, puzzle_id in enumerate(puzzle_ids):
+        puzzle = puzzles[puzzle_id]
+        if not puzzle or 'train' not in puzzle:
+            continue
+        has_train[row] = True
+        train_examples = puzzle.get('train', [])
+        train_count[row] = len(train_examples)
+        if not train_examples:
+            continue
+        for example_idx, example in enumerate(train_examples):
+            if 'input' not in example or 'output' not in example:
+                continue
+            _add(row, example_idx, TRAIN_INPUT, example['input'])
+            _add(row, example_idx, TRAIN_OUTPUT, example['output'])
+        test = puzzle.get('test')
+        if isinstance(test, dict) and 'input' in test:
+            has_test[row] = True
+            _add(row, -1, TEST_INPUT, test['input'])
+
+    n_grids = len(grid_puzzle)
+    shapes = np.array(grid_shape, dtype=np.int64).reshape(n_grids, 2)
+    sizes = shapes[:, 0] * shapes[:, 1]
+    flat = np.concatenate(values).astype(np.int64) if n_grids else np.zeros(0, dtype=np.int64)
+    n_bins = max(N_COLORS, int(flat.max()) + 1 if flat.size else 0)
+
+    # Histogrammes de toutes les grilles en un seul bincount
+    owners = np.repeat(np.arange(n_grids), sizes)
+    histograms = np.bincount(owners * n_bins + flat, minlength=n_grids * n_bins).reshape(n_grids, n_bins)
+
+    entropy = _row_entropy(histograms, sizes)
+    n_colors = (histograms > 0).sum(axis=1)
+    with np.errstate(divide='ignore'):
+        size_factor = np.where(sizes > 0, np.log2(np.maximum(sizes, 1)), 0)
+    complexity = entropy * n_colors * size_factor / 10
+
+    grids = {
+        'puzzle': np.array(grid_puzzle, dtype=np.int32),
+        'example': np.array(grid_example, dtype=np.int32),
+        'role': np.array(grid_role, dtype=np.int8),
+        'height': shapes[:, 0].astype(np.int32),
+        'width': shapes[:, 1].astype(np.int32),
+        'histogram': histograms.astype(np.int32),
+        'colors': _color_mask(histograms),
+        'entropy': entropy,
+        'complexity': complexity,
+    }
+
+    # Agrégats par puzzle sur les paires d'entraînement (ordre des exemples)
+    inputs = np.flatnonzero(grids['role'] == TRAIN_INPUT)
+    outputs = inputs + 1  # La sortie suit toujours son entrée
+    pair_puzzle = grids['puzzle'][inputs]
+    n_pairs = np.bincount(pair_puzzle, minlength=n_puzzles)
+    pair_rank = np.arange(len(inputs)) - np.searchsorted(pair_puzzle, pair_puzzle)
+    max_pairs = int(n_pairs.max()) if n_puzzles else 0
+
+    def _padded(per_pair, dtype=float):
+        table = np.zeros((n_puzzles, max_pairs), dtype=dtype)
+        table[pair_puzzle, pair_rank] = per_pair
+        return table
+
+    def _average(per_pair):
+        return np.where(n_pairs > 0, _sequential_sum(_padded(per_pair)) / np.maximum(n_pairs, 1), 0.0)
+
+    columns = {
+        'has_train': has_train,
+        'has_test': has_test,
+        'train_count': train_count,
+        'n_pairs': n_pairs,
+        'input_entropy_avg': _average(entropy[inputs]),
+        'output_entropy_avg': _average(entropy[outputs]),
+        'input_complexity_avg': _average(complexity[inputs]),
+        'output_complexity_avg': _average(complexity[outputs]),
+    }
+    columns['entropy_change'] = columns['output_entropy_avg'] - columns['input_entropy_avg']
+    columns['complexity_change'] = columns['output_complexity_avg'] - columns['input_complexity_avg']
+
+    # Couleurs utilisées (masques de bits) et dimensions
+    columns['input_values'] = np.bitwise_or.reduce(_padded(grids['colors'][inputs], np.int64), axis=1) \
+        if max_pairs else np.zeros(n_puzzles, dtype=np.int64)
+    columns['output_values'] = np.bitwise_or.reduce(_padded(grids['colors'][outputs], np.int64), axis=1) \
+        if max_pairs else np.zeros(n_puzzles, dtype=np.int64)
+
+    in_h, in_w = _padded(grids['height'][inputs], np.int64), _padded(grids['width'][inputs], np.int64)
+    out_h, out_w = _padded(grids['height'][outputs], np.int64), _padded(grids['width'][outputs], np.int64)
+    valid = np.arange(max_pairs) < n_pairs[:, None]
+
+    def _single_value(table):
+        return (~valid | (table == table[:, :1])).all(axis=1) & (n_pairs > 0)
+
+    columns['consistent_dims'] = _single_value(in_h) & _single_value(in_w) & _single_value(out_h) & _single_value(out_w)
+    columns['any_size_change'] = (valid & ((in_h != out_h) | (in_w != out_w))).any(axis=1)
+    columns['large_input'] = (valid & ((in_h > 10) | (in_w > 10))).any(axis=1)
+    columns['difficulty'] = estimate_difficulties(columns)
+
+    return FeatureStore(puzzle_ids, content_hashes, columns, grids)
+
+
+def _popcount(masks):
+    return np.array([bin(int(mask)).count('1') for mask in masks], dtype=np.int64)
+
+
+def estimate_difficulties(columns, complexity_metrics=True):
+    """Version vectorisée de estimate_puzzle_difficulty (mêmes règles, même ordre)."""
+    difficulty = np.full(len(columns['train_count']), 5.0)
+    has_pairs = columns['n_pairs'] > 0
+    new_values = columns['output_values'] & ~columns['input_values']
+
+    difficulty = difficulty + np.where(columns['train_count'] <= 1, 2.0, 0.0)
+    difficulty = difficulty + np.where(new_values != 0, 1.5, 0.0)
+    difficulty = difficulty + np.where(columns['any_size_change'], 1.0, 0.0)
+    if complexity_metrics:
+        complexity_factor = np.minimum(3.0, columns['output_complexity_avg'] / 5.0)
+        difficulty = difficulty + np.where(has_pairs, complexity_factor, 0.0)
+    difficulty = difficulty + np.where(columns['large_input'], 1.0, 0.0)
+    difficulty = difficulty - np.where(columns['consistent_dims'], 0.5, 0.0)
+    difficulty = difficulty - np.where(_popcount(columns['input_values']) <= 2, 1.0, 0.0)
+    return np.maximum(1.0, np.minimum(10.0, difficulty))
+
+
+def load_or_build_feature_store(puzzles, path=None):
+    """Recharge le magasin depuis path s'il correspond au contenu des puzzles, sinon le recalcule."""
+    puzzle_ids = list(puzzles)
+    content_hashes = [puzzle_content_hash(puzzles[puzzle_id]) for puzzle_id in puzzle_ids]
+    if path and os.path.exists(path):
+        try:
+            store = FeatureStore.load(path)
+            if store.puzzle_ids == puzzle_ids and store.content_hashes == content_hashes:
+                return store
+        except (OSError, ValueError, KeyError):
+            pass
+
+    store = build_feature_store(puzzles, content_hashes)
+    if path:
+        store.save(path)
+    return store
@@ -353,6 +353,40 @@ def fix_notebook(input_path, output_path):
             "        grid[grid == old_color] = new_color\n",
             "    return grid\n",
             "\n",
+            "def infer_color_lut(train_examples):\n",
+            "    \"\"\"Infère la table de couleurs entrée -> sortie commune à toutes les paires (ou None).\"\"\"\n",
+            "    inputs, outputs = [], []\n",
+            "    for example in train_examples:\n",
+            "        if 'input' not in example or 'output' not in example:\n",
+            "            continue\n",
+            "        input_grid = np.array(example['input'])\n",
+            "        output_grid = np.array(example['output'])\n",
+            "        if input_grid.shape != output_grid.shape or input_grid.ndim != 2:\n",
+            "            return None\n",
+            "        inputs.append(input_grid.ravel())\n",
+            "        outputs.append(output_grid.ravel())\n",
+            "    \n",
+            "    if not inputs:\n",
+            "        return None\n",
+            "    inputs = np.concatenate(inputs).astype(np.int64)\n",
+            "    outputs = np.concatenate(outputs).astype(np.int64)\n",
+            "    if inputs.size == 0 or inputs.min() < 0 or inputs.max() > 9 or outputs.min() < 0 or outputs.max() > 9:\n",
+            "        return None\n",
+            "    \n",
+            "    # Paires (entrée, sortie) distinctes ; une couleur d'entrée répétée = contradiction\n",
+            "    codes = np.unique(inputs * 10 + outputs)\n",
+            "    sources = codes // 10\n",
+            "    if len(np.unique(sources)) != len(sources):\n",
+            "        return None\n",
+            "    \n",
+            "    lut = np.arange(10)\n",
+            "    lut[sources] = codes % 10\n",
+            "    return lut\n",
+            "\n",
+            "def apply_color_lut(lut, grid):\n",
+            "    \"\"\"Applique une table de couleurs à une grille.\"\"\"\n",
+            "    return lut[np.array(grid)]\n",
+            "\n",
             "def expand(grid, factor=2):\n",
             "    \"\"\"Agrandit chaque cellule par un facteur donné.\"\"\"\n",
             "    grid = np.array(grid)\n",
@@ -458,54 +492,9 @@ def fix_notebook(input_path, output_path):
             "        match_rate = match_count / len(train_examples) if train_examples else 0\n",
             "        results[name] = match_rate\n",
             "    \n",
-            "    # Tester des transformations de couleur (pour chaque paire de couleurs)\n",
-            "    # Pour simplifier, on limite aux 5 premières couleurs pour éviter une explosion combinatoire\n",
-            "    for example in train_examples:\n",
-            "        if 'input' not in example or 'output' not in example:\n",
-            "            continue\n",
-            "            \n",
-            "        input_grid = np.array(example['input'])\n",
-            "        expected_output = np.array(example['output'])\n",
-            "        \n",
-            "        input_colors = sorted(set(input_grid.flatten()))\n",
-            "        output_colors = sorted(set(expected_output.flatten()))\n",
-            "        \n",
-            "        # Limiter le nombre de couleurs pour éviter une explosion combinatoire\n",
-            "        input_colors = input_colors[:5]\n",
-            "        output_colors = output_colors[:5]\n",
-            "        \n",
-            "        # Tester des remplacements de couleurs simples\n",
-            "        for old_color in input_colors:\n",
-            "            for new_color in output_colors:\n",
-            "                if old_color == new_color:\n",
-            "                    continue\n",
-            "                    \n",
-            "                name = f\"swap_{old_color}_to_{new_color}\"\n",
-            "                results[name] = 0.0  # Initialiser\n",
-            "                \n",
-            "                # Tester sur tous les exemples\n",
-            "                match_count = 0\n",
-            "                for ex in train_examples:\n",
-            "                    if 'input' not in ex or 'output' not in ex:\n",
-            "                        continue\n",
-            "                        \n",
-            "                    try:\n",
-            "                        in_grid = np.array(ex['input'])\n",
-            "                        exp_out = np.array(ex['output'])\n",
-            "                        \n",
-            "                        # Appliquer le remplacement\n",
-            "                        transformed = in_grid.copy()\n",
-            "                        transformed[transformed == old_color] = new_color\n",
-            "                        \n",
-            "                        # Vérifier si la transformation correspond\n",
-            "                        if transformed.shape == exp_out.shape and np.array_equal(transformed, exp_out):\n",
-            "                            match_count += 1\n",
-            "                    except Exception:\n",
-            "                        pass\n",
-            "                \n",
-            "                # Calculer le taux de correspondance\n",
-            "                match_rate = match_count / len(train_examples) if train_examples else 0\n",
-            "                results[name] = match_rate\n",
+            "    # Correspondance de couleurs inférée en une passe (remplace la recherche swap_X_to_Y)\n",
+            "    if infer_color_lut(train_examples) is not None:\n",
+            "        results[\"color_lut\"] = 1.0\n",
             "    \n",
             "    return results"
         ],
@@ -909,6 +898,11 @@ def fix_notebook(input_path, output_path):
             "        try:\n",
             "            # Appliquer la transformation à l'entrée de test\n",
             "            test_input = np.array(puzzle['test']['input'])\n",
+            "            if transform_name == \"color_lut\":\n",
+            "                # Table de couleurs inférée une fois à partir des paires du puzzle\n",
+            "                lut = infer_color_lut(puzzle.get('train', []))\n",
+            "                if lut is not None:\n",
+            "                    return apply_color_lut(lut, test_input).tolist()\n",
             "            solution = self.apply_transform(test_input, transform_name)\n",
             "            return solution.tolist()\n",
             "        except Exception as e:\n",
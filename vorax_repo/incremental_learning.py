@@ -0,0 +1,82 @@
+"""
+Apprentissage incrémental piloté par un manifeste d'empreintes de puzzles.
+
+Le modèle conserve, pour chaque puzzle appris, l'empreinte de son contenu et
+sa contribution aux statistiques agrégées (transformations essayées et
+réussies, type de puzzle). Un nouvel apprentissage compare le manifeste au
+jeu de puzzles courant : seuls les puzzles ajoutés ou modifiés sont
+analysés, et les contributions des puzzles retirés ou modifiés sont
+soustraites des agrégats.
+"""
+from analysis_memo import puzzle_content_hash
+
+
+def puzzle_contribution(transform_rates, threshold, puzzle_type=None):
+    """Contribution d'un puzzle aux agrégats (puzzle_type seulement s'il est résolu)."""
+    return {
+        'attempted': tuple(transform_rates),
+        'succeeded': tuple(name for name, rate in transform_rates.items() if rate > threshold),
+        'type': puzzle_type,
+    }
+
+
+def plan_update(content_hashes, puzzles, puzzle_ids):
+    """Compare le manifeste au jeu courant.
+
+    Returns:
+        dictionnaire de listes ordonnées : 'added', 'changed', 'unchanged'
+        (dans l'ordre de puzzle_ids) et 'removed' (dans l'ordre du manifeste)
+    """
+    plan = {'added': [], 'changed': [], 'unchanged': [], 'removed': []}
+    for puzzle_id in puzzle_ids:
+        previous = content_hashes.get(puzzle_id)
+        if previous is None:
+            plan['added'].append(puzzle_id)
+        elif previous != puzzle_content_hash(puzzles[puzzle_id]):
+            plan['changed'].append(puzzle_id)
+        else:
+            plan['unchanged'].append(puzzle_id)
+    current = set(puzzle_ids)
+    plan['removed'] = [puzzle_id for puzzle_id in content_hashes if puzzle_id not in current]
+    return plan
+
+
+def retract_puzzle(model, puzzle_id):
+    """Soustrait la contribution d'un puzzle de l'état appris du modèle.
+
+    Les compteurs sont décrémentés et les taux recalculés ; la somme des
+    difficultés d'un type est recalculée dans l'ordre des exemples restants,
+    comme dans merge_partial_state.
+    """
+    contribution = model.contributions.pop(puzzle_id, None)
+    model.content_hashes.pop(puzzle_id, None)
+    best = model.transformations.pop(puzzle_id, None)
+
+    if contribution is not None:
+        succeeded = set(contribution['succeeded'])
+        for name in contribution['attempted']:
+            stats = model.success_rates.get(name)
+            if stats is None:
+                continue
+            stats['attempts'] -= 1
+            if name in succeeded:
+                stats['successes'] -= 1
+            stats['rate'] = stats['successes'] / stats['attempts'] if stats['attempts'] else 0.0
+
+        data = model.puzzle_types.get(contribution['type'])
+        if data is not None and puzzle_id in data['examples']:
+            data['examples'].remove(puzzle_id)
+            if best is not None and best[0] in data['transformations']:
+                data['transformations'][best[0]] -= 1
+                if data['transformations'][best[0]] <= 0:
+                    del data['transformations'][best[0]]
+            if data['examples']:
+                difficulty_sum = 0.0
+                for example_id in data['examples']:
+                    difficulty_sum += model.difficulty_estimates[example_id]
+                data['difficulty_sum'] = difficulty_sum
+            else:
+                del model.puzzle_types[contribution['type']]
+
+    model.difficulty_estimates.pop(puzzle_id, None)
+    model.processing_times.pop(puzzle_id, None)
@@ -0,0 +1,222 @@
+"""
+Instantané versionné d'un modèle entraîné.
+
+Les connaissances apprises par learn_from_dataset (transformations par
+puzzle, types de puzzles, taux de réussite, difficultés, temps de
+traitement, empreintes et contributions par puzzle pour l'apprentissage
+incrémental) sont sérialisées en colonnes NumPy dans un seul fichier .npz,
+sans pickle. Un manifeste JSON inclus dans le fichier enregistre la version
+du code du modèle (code_version) et l'empreinte du jeu d'apprentissage : l'instantané n'est
+rechargé que si la version du code correspond, et n'est réutilisé tel quel
+que si le jeu de puzzles est aussi identique. find_snapshot choisit parmi
+plusieurs emplacements (sortie courante, sortie d'une exécution précédente
+jointe en entrée) le meilleur instantané compatible.
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from analysis_memo import puzzle_content_hash
+
+# Version du format de fichier
+SNAPSHOT_FORMAT = 2
+
+
+def dataset_content_hash(puzzles, puzzle_ids=None):
+    """Empreinte d'un jeu de puzzles (identifiants et contenus, dans l'ordre d'apprentissage)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for puzzle_id in (puzzle_ids if puzzle_ids is not None else puzzles):
+        digest.update(str(puzzle_id).encode())
+        digest.update(puzzle_content_hash(puzzles[puzzle_id]).encode())
+    return digest.hexdigest()
+
+
+# Version de l'état appris : à incrémenter à chaque modification du code d'apprentissage
+# (analyse, transformations, recherche de programmes...) qui change le résultat de learn_from_dataset
+SNAPSHOT_VERSION = 1
+
+
+def code_version(model):
+    """Version du code d'un modèle.
+
+    SNAPSHOT_VERSION, puis empreinte des paramètres d'apprentissage
+    (learning_settings()) et des noms de son registre de transformations.
+    """
+    cls = type(model)
+    digest = hashlib.blake2b(digest_size=8)
+    settings = model.learning_settings() if hasattr(model, 'learning_settings') else {}
+    digest.update(json.dumps(settings, sort_keys=True, default=repr).encode())
+    for name in getattr(model, 'transformation_registry', ()):
+        digest.update(name.encode())
+    return f"{cls.__name__}-{SNAPSHOT_VERSION}-{digest.hexdigest()}"
+
+
+def _strings(values):
+    return np.array(list(values), dtype=str)
+
+
+def _offsets(lengths):
+    return np.cumsum([0] + list(lengths)).astype(np.int64)
+
+
+def save_snapshot(model, path, dataset_hash=None):
+    """Sauvegarde l'état appris du modèle dans path (.npz, écriture atomique)."""
+    types = list(model.puzzle_types.values())
+    contributions = list(model.contributions.values())
+    names = list(dict.fromkeys(
+        list(model.success_rates)
+        + [name for name, _ in model.transformations.values()]
+        + [name for data in types for name in data['transformations']]
+        + [name for data in contributions for name in data['attempted']]
+    ))
+    name_ids = {name: i for i, name in enumerate(names)}
+
+    arrays = {
+        'names': _strings(names),
+        # Transformation gagnante par puzzle résolu
+        'solved_ids': _strings(model.transformations),
+        'solved_names': np.array([name_ids[name] for name, _ in model.transformations.values()], dtype=np.int64),
+        'solved_rates': np.array([rate for _, rate in model.transformations.values()], dtype=float),
+        # Taux de réussite par transformation
+        'rate_names': np.array([name_ids[name] for name in model.success_rates], dtype=np.int64),
+        'rate_counts': np.array([[data['successes'], data['attempts']] for data in model.success_rates.values()],
+                                dtype=np.int64).reshape(-1, 2),
+        'rate_values': np.array([data['rate'] for data in model.success_rates.values()], dtype=float),
+        # Difficultés et temps de traitement par puzzle
+        'difficulty_ids': _strings(model.difficulty_estimates),
+        'difficulty_values': np.array(list(model.difficulty_estimates.values()), dtype=float),
+        'time_ids': _strings(model.processing_times),
+        'time_values': np.array(list(model.processing_times.values()), dtype=float),
+        # Types de puzzles : listes d'exemples et compteurs à plat, avec décalages
+        'type_names': _strings(model.puzzle_types),
+        'type_difficulty_sums': np.array([data['difficulty_sum'] for data in types], dtype=float),
+        'type_example_offsets': _offsets(len(data['examples']) for data in types),
+        'type_examples': _strings(puzzle_id for data in types for puzzle_id in data['examples']),
+        'type_transform_offsets': _offsets(len(data['transformations']) for data in types),
+        'type_transform_names': np.array([name_ids[name] for data in types for name in data['transformations']],
+                                         dtype=np.int64),
+        'type_transform_counts': np.array([count for data in types for count in data['transformations'].values()],
+                                          dtype=np.int64),
+        # Manifeste d'empreintes et contributions par puzzle (apprentissage incrémental)
+        'hash_ids': _strings(model.content_hashes),
+        'hash_values': _strings(model.content_hashes.values()),
+        'contribution_ids': _strings(model.contributions),
+        'contribution_types': _strings(data['type'] or '' for data in contributions),
+        'attempted_offsets': _offsets(len(data['attempted']) for data in contributions),
+        'attempted_names': np.array([name_ids[name] for data in contributions for name in data['attempted']],
+                                    dtype=np.int64),
+        'succeeded_offsets': _offsets(len(data['succeeded']) for data in contributions),
+        'succeeded_names': np.array([name_ids[name] for data in contributions for name in data['succeeded']],
+                                    dtype=np.int64),
+    }
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'model': type(model).__name__,
+        'code_version': code_version(model),
+        'dataset_hash': dataset_hash,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'puzzles_solved': len(model.transformations),
+        'puzzles_processed': len(model.processing_times),
+    }
+    arrays['manifest'] = np.array(json.dumps(manifest))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def read_manifest(path):
+    """Manifeste d'un instantané, ou None s'il est absent ou illisible."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return json.loads(str(data['manifest']))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def snapshot_matches(path, model, dataset_hash=None):
+    """Vrai si l'instantané a été produit par le même code (et sur le même jeu de puzzles si dataset_hash)."""
+    manifest = read_manifest(path)
+    return (
+        manifest is not None
+        and manifest.get('format') == SNAPSHOT_FORMAT
+        and manifest.get('code_version') == code_version(model)
+        and (dataset_hash is None or manifest.get('dataset_hash') == dataset_hash)
+    )
+
+
+def find_snapshot(paths, model, dataset_hash=None):
+    """Premier instantané de paths compatible avec model, en préférant celui du même jeu de puzzles.
+
+    Retourne None si aucun instantané n'a été produit par le même code.
+    """
+    paths = [path for path in dict.fromkeys(paths) if path and os.path.exists(path)]
+    if dataset_hash is not None:
+        for path in paths:
+            if snapshot_matches(path, model, dataset_hash):
+                return path
+    for path in paths:
+        if snapshot_matches(path, model):
+            return path
+    return None
+
+
+def load_snapshot(model, path):
+    """Restaure dans model l'état appris sauvegardé par save_snapshot ; retourne le manifeste."""
+    with np.load(path, allow_pickle=False) as data:
+        manifest = json.loads(str(data['manifest']))
+        if manifest.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f"Format d'instantané non supporté: {manifest.get('format')}")
+        names = data['names'].tolist()
+
+        model.transformations = {
+            puzzle_id: (names[name], rate)
+            for puzzle_id, name, rate in zip(data['solved_ids'].tolist(), data['solved_names'].tolist(),
+                                             data['solved_rates'].tolist())
+        }
+        model.success_rates = {
+            names[name]: {'successes': successes, 'attempts': attempts, 'rate': rate}
+            for name, (successes, attempts), rate in zip(data['rate_names'].tolist(), data['rate_counts'].tolist(),
+                                                         data['rate_values'].tolist())
+        }
+        model.difficulty_estimates = dict(zip(data['difficulty_ids'].tolist(), data['difficulty_values'].tolist()))
+        model.processing_times = dict(zip(data['time_ids'].tolist(), data['time_values'].tolist()))
+
+        examples = data['type_examples'].tolist()
+        example_offsets = data['type_example_offsets'].tolist()
+        transform_names = data['type_transform_names'].tolist()
+        transform_counts = data['type_transform_counts'].tolist()
+        transform_offsets = data['type_transform_offsets'].tolist()
+        model.puzzle_types = {}
+        for i, (ptype, difficulty_sum) in enumerate(zip(data['type_names'].tolist(),
+                                                        data['type_difficulty_sums'].tolist())):
+            span = slice(transform_offsets[i], transform_offsets[i + 1])
+            model.puzzle_types[ptype] = {
+                'examples': examples[example_offsets[i]:example_offsets[i + 1]],
+                'transformations': {names[name]: count for name, count in zip(transform_names[span],
+                                                                             transform_counts[span])},
+                'difficulty_sum': difficulty_sum,
+            }
+
+        model.content_hashes = dict(zip(data['hash_ids'].tolist(), data['hash_values'].tolist()))
+        attempted = [names[name] for name in data['attempted_names'].tolist()]
+        attempted_offsets = data['attempted_offsets'].tolist()
+        succeeded = [names[name] for name in data['succeeded_names'].tolist()]
+        succeeded_offsets = data['succeeded_offsets'].tolist()
+        model.contributions = {
+            puzzle_id: {
+                'attempted': tuple(attempted[attempted_offsets[i]:attempted_offsets[i + 1]]),
+                'succeeded': tuple(succeeded[succeeded_offsets[i]:succeeded_offsets[i + 1]]),
+                'type': ptype or None,
+            }
+            for i, (puzzle_id, ptype) in enumerate(zip(data['contribution_ids'].tolist(),
+                                                      data['contribution_types'].tolist()))
+        }
+    return manifest
@@ -0,0 +1,85 @@
+"""
+Index de plus proches voisins sur les vecteurs de caractéristiques des
+puzzles résolus.
+
+Chaque puzzle résolu pendant l'apprentissage est décrit par un vecteur de
+caractéristiques (dimensions, couleurs, entropies, complexités...) et
+étiqueté par son programme gagnant. À la résolution, les programmes des k
+puzzles les plus proches sont essayés en premier. Recherche exhaustive
+vectorisée (NumPy uniquement) sur les vecteurs standardisés.
+"""
+import numpy as np
+
+# Composantes du vecteur de caractéristiques d'un puzzle
+FEATURE_NAMES = (
+    'train_count', 'consistent_dims', 'size_change', 'size_ratio',
+    'input_colors', 'output_colors', 'new_colors', 'removed_colors',
+    'input_entropy_avg', 'output_entropy_avg', 'entropy_change',
+    'input_complexity_avg', 'output_complexity_avg', 'complexity_change',
+    'input_height', 'input_width', 'output_height', 'output_width',
+)
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def puzzle_vector(features):
+    """Vecteur de caractéristiques (ordre de FEATURE_NAMES) à partir de analyze_puzzle."""
+    input_dims = features.get('input_dims', [])
+    output_dims = features.get('output_dims', [])
+    return np.array([
+        features.get('train_count', 0),
+        float(features.get('consistent_dims', False)),
+        float(any(features.get('size_change', []))),
+        _mean(features.get('size_ratios', [])),
+        len(features.get('input_values', [])),
+        len(features.get('output_values', [])),
+        len(features.get('new_values', [])),
+        len(features.get('removed_values', [])),
+        features.get('input_entropy_avg', 0.0),
+        features.get('output_entropy_avg', 0.0),
+        features.get('entropy_change', 0.0),
+        features.get('input_complexity_avg', 0.0),
+        features.get('output_complexity_avg', 0.0),
+        features.get('complexity_change', 0.0),
+        _mean([d[0] for d in input_dims]),
+        _mean([d[1] for d in input_dims]),
+        _mean([d[0] for d in output_dims]),
+        _mean([d[1] for d in output_dims]),
+    ], dtype=float)
+
+
+class NeighborIndex:
+    """Recherche exhaustive des k plus proches puzzles résolus (distance euclidienne standardisée)."""
+
+    def __init__(self, puzzle_ids, vectors, labels):
+        self.puzzle_ids = list(puzzle_ids)
+        self.labels = list(labels)
+        vectors = np.asarray(vectors, dtype=float).reshape(len(self.puzzle_ids), len(FEATURE_NAMES))
+        self.mean = vectors.mean(axis=0) if len(vectors) else np.zeros(len(FEATURE_NAMES))
+        std = vectors.std(axis=0) if len(vectors) else np.ones(len(FEATURE_NAMES))
+        self.scale = np.where(std > 0, std, 1.0)
+        self.vectors = (vectors - self.mean) / self.scale
+
+    def __len__(self):
+        return len(self.puzzle_ids)
+
+    def query(self, vector, k=5):
+        """Les k puzzles résolus les plus proches : liste de (puzzle_id, distance, étiquette)."""
+        if not self.puzzle_ids:
+            return []
+        query = (np.asarray(vector, dtype=float) - self.mean) / self.scale
+        distances = np.sqrt(((self.vectors - query) ** 2).sum(axis=1))
+        k = min(k, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return [(self.puzzle_ids[i], float(distances[i]), self.labels[i]) for i in nearest]
+
+    def ranked_labels(self, vector, k=5):
+        """Étiquettes distinctes des k voisins, de la plus proche à la plus éloignée."""
+        ranked = []
+        for _, _, label in self.query(vector, k):
+            if label not in ranked:
+                ranked.append(label)
+        return ranked
@@ -0,0 +1,145 @@
+"""
+Mode map/reduce multi-processus pour l'apprentissage sur un jeu de puzzles.
+
+Chaque worker crée une seule fois son modèle (registres, compilateur, sans
+thread d'échantillonnage) puis, pour chaque lot (shard) de puzzles, remet
+son état appris à zéro, analyse le lot et renvoie un état partiel ; le parent fusionne ces états dans l'ordre des
+lots, ce qui donne exactement le même résultat qu'un passage séquentiel.
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from resource_sampler import ResourceSampler
+
+# État hérité par les workers (copie à l'écriture avec fork)
+_WORKER_STATE = {}
+
+
+def shard_ids(puzzle_ids, chunk_size):
+    """Découpe la liste des identifiants en lots de taille fixe (ordre conservé)."""
+    chunk_size = max(1, int(chunk_size))
+    return [puzzle_ids[i:i + chunk_size] for i in range(0, len(puzzle_ids), chunk_size)]
+
+
+def default_workers():
+    """Nombre de workers par défaut (cœurs disponibles)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _mp_context():
+    """fork si disponible (pas de re-sérialisation des puzzles), sinon spawn."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def _init_worker(model_factory, puzzles):
+    # Mesures de ressources à la demande : pas de thread d'échantillonnage dans les workers
+    _WORKER_STATE['model'] = model_factory(sampler=ResourceSampler(interval=None))
+    _WORKER_STATE['puzzles'] = puzzles
+
+
+def _analyze_shard(puzzle_ids):
+    """Analyse un lot de puzzles avec le modèle du worker (état appris remis à zéro) et renvoie son état partiel."""
+    model = _WORKER_STATE['model']
+    model.reset_learning_state()
+    puzzles = _WORKER_STATE['puzzles']
+    results = []
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        for puzzle_id in puzzle_ids:
+            results.append(model.analyze_puzzle(puzzle_id, puzzles[puzzle_id]))
+    partial = partial_state(model)
+    partial['results'] = results
+    partial['log'] = log.getvalue()
+    return partial
+
+
+def map_shards(model_factory, puzzles, shards, n_workers):
+    """Analyse les lots en parallèle ; les états partiels sont produits dans l'ordre des lots.
+
+    model_factory (la classe du modèle) est appelée une fois par worker avec sampler=.
+    """
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=_mp_context(),
+        initializer=_init_worker,
+        initargs=(model_factory, puzzles)
+    ) as executor:
+        yield from executor.map(_analyze_shard, shards)
+
+
+def partial_state(model):
+    """Extrait l'état d'apprentissage agrégeable d'un modèle."""
+    return {
+        'success_rates': model.success_rates,
+        'puzzle_types': model.puzzle_types,
+        'transformations': model.transformations,
+        'difficulty_estimates': model.difficulty_estimates,
+        'processing_times': model.processing_times,
+        'content_hashes': model.content_hashes,
+        'contributions': model.contributions,
+        'memory_usage': model.memory_usage,
+        'learning_curve': model.learning_curve,
+        'shape_stats': model.shape_index.stats(),
+        'transform_profile': model.profiler.state() if model.profiler is not None else None,
+    }
+
+
+def merge_partial_state(model, partial):
+    """Fusionne un état partiel dans le modèle (déterministe, ordre des lots).
+
+    Les compteurs sont additionnés et les taux recalculés ; les sommes de
+    difficulté sont recalculées dans l'ordre des exemples pour obtenir des
+    flottants identiques à ceux d'un passage séquentiel. Les points des
+    courbes de mémoire et d'apprentissage du lot sont décalés des totaux
+    déjà fusionnés (puzzles traités et résolus, temps cumulé) : la courbe
+    fusionnée reste croissante. RSS et temps CPU restent ceux du worker.
+    """
+    # Compteurs du modèle avant ce lot : les courbes du worker repartent de zéro
+    base_processed = len(model.processing_times)
+    base_solved = len(model.transformations)
+    base_elapsed = sum(model.processing_times.values())
+
+    model.transformations.update(partial['transformations'])
+    model.difficulty_estimates.update(partial['difficulty_estimates'])
+    model.processing_times.update(partial['processing_times'])
+    model.content_hashes.update(partial['content_hashes'])
+    model.contributions.update(partial['contributions'])
+
+    for name, stats in partial['success_rates'].items():
+        target = model.success_rates.setdefault(name, {'successes': 0, 'attempts': 0, 'rate': 0.0})
+        target['successes'] += stats['successes']
+        target['attempts'] += stats['attempts']
+        target['rate'] = target['successes'] / target['attempts'] if target['attempts'] else 0.0
+
+    for puzzle_type, data in partial['puzzle_types'].items():
+        target = model.puzzle_types.setdefault(
+            puzzle_type, {'examples': [], 'transformations': {}, 'difficulty_sum': 0.0}
+        )
+        target['examples'].extend(data['examples'])
+        for transform_name, count in data['transformations'].items():
+            target['transformations'][transform_name] = target['transformations'].get(transform_name, 0) + count
+        difficulty_sum = 0.0
+        for puzzle_id in target['examples']:
+            difficulty_sum += model.difficulty_estimates[puzzle_id]
+        target['difficulty_sum'] = difficulty_sum
+
+    for entry in partial['memory_usage']:
+        previous = model.memory_usage[-1]['memory_used'] if model.memory_usage else entry['memory_used']
+        model.memory_usage.append(dict(entry, puzzles_processed=base_solved + entry['puzzles_processed'],
+                                       memory_diff=entry['memory_used'] - previous))
+    for entry in partial['learning_curve']:
+        processed = base_processed + entry['puzzles_processed']
+        solved = base_solved + entry['puzzles_solved']
+        model.learning_curve.append(dict(entry, puzzles_processed=processed, puzzles_solved=solved,
+                                         success_rate=solved / processed if processed > 0 else 0,
+                                         elapsed_time=base_elapsed + entry['elapsed_time']))
+    model.shape_index.merge_stats(partial['shape_stats'])
+    if model.profiler is not None and partial['transform_profile']:
+        model.profiler.merge(partial['transform_profile'])
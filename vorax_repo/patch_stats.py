@@ -0,0 +1,94 @@
+"""
+Statistiques de motifs k x k vectorisées.
+
+Toutes les fenêtres k x k d'une grille (ou d'un lot de grilles) sont obtenues
+par sliding_window_view, codées en un entier (k*k valeurs de b bits) puis
+comptées en un seul appel à np.unique. Les dictionnaires retournés sont
+identiques à ceux des boucles Python historiques : clé = octets du motif
+(pattern.tobytes()), valeur = nombre d'occurrences, dans l'ordre de première
+apparition en parcours ligne par ligne.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _windows(grid, k):
+    """Fenêtres k x k d'une grille, empilées en (n, k, k) dans l'ordre ligne par ligne."""
+    h, w = grid.shape
+    if h < k or w < k:
+        return np.empty((0, k, k), dtype=grid.dtype)
+    return sliding_window_view(grid, (k, k)).reshape(-1, k, k)
+
+
+def _pack_bits(grids, k):
+    """Nombre de bits par cellule pour coder un motif dans un uint64, ou None."""
+    if not all(g.dtype.kind in 'biu' for g in grids):
+        return None
+    sizes = [g for g in grids if g.size]
+    if not sizes:
+        return 1
+    if min(int(g.min()) for g in sizes) < 0:
+        return None
+    bits = max(1, max(int(g.max()) for g in sizes).bit_length())
+    return bits if bits * k * k <= 64 else None
+
+
+def _encode(windows, k, bits):
+    """Code entier de chaque fenêtre ; sans codage possible, vue d'octets (np.void)."""
+    flat = np.ascontiguousarray(windows.reshape(len(windows), k * k))
+    if bits is None:
+        return flat.view(np.dtype((np.void, flat.dtype.itemsize * k * k))).ravel()
+    shifts = np.arange(k * k, dtype=np.uint64) * np.uint64(bits)
+    return np.bitwise_or.reduce(flat.astype(np.uint64) << shifts, axis=1)
+
+
+def patch_counts_batch(grids, k=3):
+    """Compte les motifs k x k de chaque grille d'un lot.
+
+    Returns:
+        liste de dictionnaires {octets du motif: occurrences}, un par grille
+    """
+    grids = [np.asarray(grid) for grid in grids]
+    windows = [_windows(grid, k) for grid in grids]
+    offsets = np.cumsum([0] + [len(win) for win in windows])
+    results = [{} for _ in grids]
+    if offsets[-1] == 0:
+        return results
+
+    if len({grid.dtype for grid in grids}) > 1:
+        # Types différents : un appel par grille (les octets des clés diffèrent)
+        return [patch_counts_batch([grid], k)[0] for grid in grids]
+
+    bits = _pack_bits(grids, k)
+    codes = np.concatenate([_encode(win, k, bits) for win in windows if len(win)])
+    grid_index = np.repeat(np.arange(len(grids)), np.diff(offsets))
+
+    if bits is not None and bits * k * k + len(grids).bit_length() <= 64:
+        # Indice de grille dans les bits de poids fort : un seul np.unique
+        keys = codes | (grid_index.astype(np.uint64) << np.uint64(bits * k * k))
+    else:
+        # Motifs numérotés d'abord, puis regroupement (grille, motif)
+        _, pattern_ids = np.unique(codes, return_inverse=True)
+        keys = grid_index * (int(pattern_ids.max()) + 1) + pattern_ids.ravel()
+    _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+
+    # Ordre de première apparition (les positions sont déjà groupées par grille)
+    order = np.argsort(first, kind='stable')
+    first = first[order]
+    counts = counts[order].tolist()
+    owners = grid_index[first]
+
+    # Octets de tous les motifs distincts en une seule copie, découpés par motif
+    raw = np.concatenate(windows)[first].tobytes()
+    step = len(raw) // len(first)
+    patterns = [raw[i:i + step] for i in range(0, len(raw), step)]
+
+    bounds = np.searchsorted(owners, np.arange(len(grids) + 1))
+    for g in range(len(grids)):
+        results[g] = dict(zip(patterns[bounds[g]:bounds[g + 1]], counts[bounds[g]:bounds[g + 1]]))
+    return results
+
+
+def patch_counts(grid, k=3):
+    """Compte les motifs k x k d'une grille : {octets du motif: occurrences}."""
+    return patch_counts_batch([grid], k)[0]
@@ -0,0 +1,207 @@
+"""
+Recherche énumérative de programmes : compositions de transformations du
+registre jusqu'à une profondeur donnée, vérifiées sur toutes les paires
+d'entraînement.
+
+Les grilles intermédiaires sont « hash-consées » : chaque grille distincte
+reçoit un identifiant unique et chaque application (grille, transformation)
+n'est calculée qu'une fois. Un état de la recherche est le tuple des
+identifiants des grilles courantes (une par exemple) ; deux préfixes
+équivalents (rotate_90∘rotate_90 et rotate_180) mènent au même état et ne
+sont explorés qu'une seule fois.
+"""
+import time
+
+import numpy as np
+
+from batch_evaluator import _registry_items
+from shape_index import DATA_DEPENDENT
+
+# Taille maximale d'une grille ARC (les états plus grands sont abandonnés)
+MAX_GRID_SIDE = 30
+
+
+class GridTable:
+    """Table de hash-consing des grilles et des transitions (grille, transformation)."""
+
+    def __init__(self):
+        self._ids = {}  # (forme, octets) -> identifiant
+        self.grids = []  # identifiant -> tableau uint8 (lecture seule)
+        self._transitions = {}  # (identifiant, nom) -> identifiant ou None
+        self.applications = 0
+
+    def intern(self, grid):
+        """Identifiant unique de la grille (None si elle n'est pas une grille ARC valide)."""
+        grid = np.asarray(grid)
+        if grid.ndim != 2 or grid.size == 0:
+            return None
+        if grid.shape[0] > MAX_GRID_SIDE or grid.shape[1] > MAX_GRID_SIDE:
+            return None
+        if grid.dtype != np.uint8:
+            if grid.min() < 0 or grid.max() > 255:
+                return None
+            grid = grid.astype(np.uint8)
+        grid = np.ascontiguousarray(grid)
+        key = (grid.shape, grid.tobytes())
+        grid_id = self._ids.get(key)
+        if grid_id is None:
+            grid_id = len(self.grids)
+            grid.flags.writeable = False
+            self._ids[key] = grid_id
+            self.grids.append(grid)
+        return grid_id
+
+    def apply(self, grid_id, name, transform_func):
+        """Applique une transformation à une grille internée (résultat mémorisé)."""
+        key = (grid_id, name)
+        if key in self._transitions:
+            return self._transitions[key]
+        self.applications += 1
+        try:
+            result = self.intern(transform_func(self.grids[grid_id]))
+        except Exception:
+            result = None
+        self._transitions[key] = result
+        return result
+
+    def __len__(self):
+        return len(self.grids)
+
+
+def _can_produce(shape_func, shapes, target_shapes):
+    """Vrai si la fonction de forme peut produire les formes cibles (ou si elle est inconnue)."""
+    if shape_func is DATA_DEPENDENT:
+        return True
+    try:
+        return all(tuple(shape_func(s)) == t for s, t in zip(shapes, target_shapes))
+    except Exception:
+        return True
+
+
+def _compiled_step(compiler, name):
+    return lambda grid: compiler.apply((name,), grid)
+
+
+def search_program(transformations, train_examples, max_depth=3, time_budget=None,
+                   shape_functions=None, exclude=('identity',), compiler=None, token=None):
+    """Cherche la plus courte composition de transformations cohérente avec toutes les paires.
+
+    Args:
+        transformations: registre {nom: fonction} ou liste [(nom, fonction)]
+        train_examples: paires {'input', 'output'} du puzzle
+        max_depth: nombre maximal de transformations composées
+        time_budget: temps maximal (s) de la recherche, None pour illimité
+        shape_functions: fonctions de forme {nom: fonction ou DATA_DEPENDENT},
+            utilisées pour élaguer la dernière étape
+        exclude: transformations ignorées (sans effet en composition)
+        compiler: TransformCompiler optionnel ; les transformations fusionnables
+            sont alors exécutées sous forme compilée (une carte d'indices + une table)
+        token: BudgetToken optionnel ; la recherche s'arrête dès qu'il expire
+
+    Returns:
+        (programme, stats) où programme est le tuple des noms à appliquer dans
+        l'ordre, ou None si aucun programme n'a été trouvé.
+    """
+    t_start = time.time()
+    deadline = t_start + time_budget if time_budget is not None else None
+    primitives = [(name, func) for name, func in _registry_items(transformations) if name not in exclude]
+    if compiler is not None:
+        primitives = [
+            (name, _compiled_step(compiler, name) if compiler.is_fusable((name,)) else func)
+            for name, func in primitives
+        ]
+    shape_functions = shape_functions or {}
+
+    table = GridTable()
+    pairs = [ex for ex in train_examples if 'input' in ex and 'output' in ex]
+    start = tuple(table.intern(ex['input']) for ex in pairs)
+    target = tuple(table.intern(ex['output']) for ex in pairs)
+
+    stats = {'depth': 0, 'states': 1, 'duplicates': 0, 'applications': 0,
+             'grids': 0, 'timeout': False, 'time': 0.0}
+
+    def _done(program):
+        stats['applications'] = table.applications
+        stats['grids'] = len(table)
+        stats['time'] = time.time() - t_start
+        return program, stats
+
+    if not pairs or None in start or None in target:
+        return _done(None)
+    target_shapes = [table.grids[g].shape for g in target]
+
+    seen = {start}
+    frontier = [(start, ())]
+    for depth in range(1, max_depth + 1):
+        stats['depth'] = depth
+        last_step = depth == max_depth
+        next_frontier = []
+        for state, program in frontier:
+            shapes = [table.grids[g].shape for g in state] if last_step else None
+            for name, func in primitives:
+                if (deadline is not None and time.time() > deadline) or (token is not None and token.expired()):
+                    stats['timeout'] = True
+                    return _done(None)
+                # Dernière étape : seules les transformations produisant la bonne forme
+                if last_step and not _can_produce(shape_functions.get(name, DATA_DEPENDENT), shapes, target_shapes):
+                    continue
+
+                new_state = []
+                for grid_id in state:
+                    result = table.apply(grid_id, name, func)
+                    if result is None:
+                        break
+                    new_state.append(result)
+                else:
+                    new_state = tuple(new_state)
+                    if new_state == target:
+                        return _done(program + (name,))
+                    if new_state in seen:
+                        stats['duplicates'] += 1
+                        continue
+                    seen.add(new_state)
+                    stats['states'] += 1
+                    if not last_step:
+                        next_frontier.append((new_state, program + (name,)))
+        frontier = next_frontier
+        if not frontier:
+            break
+
+    return _done(None)
+
+
+def apply_program(transformations, program, grid, compiler=None):
+    """Applique un programme (suite de noms de transformations) à une grille.
+
+    Un programme entièrement fusionnable est exécuté en une seule passe compilée.
+    """
+    if compiler is not None and compiler.is_fusable(program):
+        return compiler.apply(program, grid)
+    registry = dict(_registry_items(transformations))
+    result = np.asarray(grid)
+    for name in program:
+        result = np.asarray(registry[name](result))
+    return result
+
+
+def apply_program_batch(transformations, program, grids, compiler=None):
+    """Applique un programme à plusieurs grilles (entrées de test) en une passe.
+
+    Les grilles de même forme d'un programme fusionnable sont empilées et
+    traitées par une seule exécution compilée ; sinon grille par grille.
+    Retourne les sorties dans l'ordre des grilles.
+    """
+    grids = [np.asarray(grid) for grid in grids]
+    if compiler is None or not compiler.is_fusable(program):
+        return [apply_program(transformations, program, grid) for grid in grids]
+
+    outputs = [None] * len(grids)
+    by_shape = {}
+    for i, grid in enumerate(grids):
+        by_shape.setdefault(grid.shape, []).append(i)
+    for shape, indices in by_shape.items():
+        stack = np.stack([grids[i] for i in indices])
+        results = compiler.apply_stack(program, stack)
+        for i, result in zip(indices, results):
+            outputs[i] = result
+    return outputs
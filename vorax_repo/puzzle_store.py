@@ -0,0 +1,368 @@
+"""
+Magasin binaire compact de puzzles ARC, projeté en mémoire.
+
+Les fichiers JSON ARC (un fichier par puzzle dans training/ et evaluation/,
+ou fichiers consolidés arc-agi_*_challenges.json / *_solutions.json) sont
+convertis une fois en un fichier binaire :
+
+    en-tête | grilles uint8 contiguës | table des puzzles | table des grilles
+            | table des solutions | métadonnées JSON
+
+Le fichier est ouvert avec mmap et chaque grille est une vue NumPy en
+lecture seule sur la projection (aucune copie, aucun décodage JSON) : des
+processus workers qui ouvrent le même fichier partagent une seule copie en
+cache de pages.
+
+Les puzzles lus contiennent uniquement le défi (exemples d'entraînement et
+entrées de test), comme ArcDataset sur un fichier *_challenges.json : les
+sorties de test, dans la table des solutions, ne sont accessibles que par
+solutions().
+"""
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+from arc_dataset import ArcDataset
+from arc_grid import ArcGrid
+from feature_store import TRAIN_INPUT, TRAIN_OUTPUT, TEST_INPUT
+
+# Rôle d'une grille de solution de test
+TEST_OUTPUT = 3
+
+MAGIC = b'VRXPUZ01'
+STORE_VERSION = 2
+
+# magic, version, nb puzzles, nb grilles, nb solutions,
+# offsets (puzzles, grilles, solutions, métadonnées), taille des métadonnées
+_HEADER = struct.Struct('<8sIIIIQQQQQ')
+_ALIGN = 64
+
+_PUZZLE_DTYPE = np.dtype([('first_grid', '<u4'), ('n_grids', '<u4'), ('first_solution', '<u4'),
+                          ('n_solutions', '<u4'), ('flags', 'u1')])
+_GRID_DTYPE = np.dtype([('offset', '<u8'), ('height', '<u2'), ('width', '<u2'), ('role', 'u1'), ('example', 'u1')])
+
+# Drapeaux d'un puzzle
+_HAS_TEST = 1
+_TEST_IS_LIST = 2
+
+# Jeux reconnus : (source, dossier un-fichier-par-puzzle, préfixe des fichiers consolidés)
+ARC_SOURCES = (
+    ('training', 'training', 'arc-agi_training'),
+    ('evaluation', 'evaluation', 'arc-agi_evaluation'),
+    ('test', None, 'arc-agi_test'),
+)
+
+
+def _is_grid_list(value):
+    """Vrai pour une liste de grilles (solutions multi-tests) plutôt qu'une grille."""
+    return isinstance(value, list) and bool(value) and isinstance(value[0], list) and bool(value[0]) \
+        and isinstance(value[0][0], list)
+
+
+def _split_solutions(puzzle):
+    """Défi sans les sorties de test, et ces sorties (une par exemple de test, None si absente)."""
+    test = puzzle.get('test')
+    if test is None:
+        return puzzle, []
+    tests = test if isinstance(test, list) else [test]
+    solutions = [example.get('output') for example in tests]
+    if all(solution is None for solution in solutions):
+        return puzzle, []
+    challenges = [{key: value for key, value in example.items() if key != 'output'} for example in tests]
+    return dict(puzzle, test=challenges if isinstance(test, list) else challenges[0]), solutions
+
+
+def _solution_grids(solution):
+    """Entrée d'un fichier *_solutions.json : une grille par exemple de test."""
+    if solution is None:
+        return []
+    return solution if _is_grid_list(solution) else [solution]
+
+
+def _source_files(data_path):
+    """Fichiers JSON source d'un répertoire de données ARC, par jeu."""
+    files = []
+    for source, directory, prefix in ARC_SOURCES:
+        directory_path = os.path.join(data_path, directory) if directory else None
+        if directory_path and os.path.isdir(directory_path):
+            files.extend(os.path.join(directory_path, name)
+                         for name in sorted(os.listdir(directory_path)) if name.endswith('.json'))
+        else:
+            for suffix in ('challenges', 'solutions'):
+                path = os.path.join(data_path, f'{prefix}_{suffix}.json')
+                if os.path.exists(path):
+                    files.append(path)
+    return files
+
+
+def source_signature(data_path):
+    """Signature (chemin, taille, mtime) des fichiers source, pour détecter un magasin périmé."""
+    signature = []
+    for path in _source_files(data_path):
+        stat = os.stat(path)
+        signature.append([os.path.relpath(path, data_path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def iter_arc_puzzles(data_path, with_solutions=False):
+    """Parcourt les puzzles des deux dispositions ARC : (source, identifiant, défi JSON).
+
+    Les défis ne contiennent pas les sorties de test ; avec with_solutions,
+    elles sont fournies à part : (source, identifiant, défi, solutions).
+    """
+    for source, directory, prefix in ARC_SOURCES:
+        directory_path = os.path.join(data_path, directory) if directory else None
+        if directory_path and os.path.isdir(directory_path):
+            for name in sorted(os.listdir(directory_path)):
+                if name.endswith('.json'):
+                    with open(os.path.join(directory_path, name), 'r') as f:
+                        challenge, solutions = _split_solutions(json.load(f))
+                    entry = (source, name[:-len('.json')], challenge)
+                    yield entry + (solutions,) if with_solutions else entry
+            continue
+
+        challenges_path = os.path.join(data_path, f'{prefix}_challenges.json')
+        solutions_path = os.path.join(data_path, f'{prefix}_solutions.json')
+        if not os.path.exists(challenges_path):
+            continue
+        dataset = ArcDataset(challenges_path, cache_size=0, build=lambda puzzle_id, challenge, _: challenge)
+        solutions = None
+        if with_solutions and os.path.exists(solutions_path):
+            solutions = ArcDataset(solutions_path, cache_size=0, build=lambda puzzle_id, solution, _: solution)
+        for puzzle_id in dataset:
+            if not with_solutions:
+                yield source, puzzle_id, dataset[puzzle_id]
+                continue
+            solution = solutions[puzzle_id] if solutions is not None and puzzle_id in solutions else None
+            yield source, puzzle_id, dataset[puzzle_id], _solution_grids(solution)
+        dataset.close()
+        if solutions is not None:
+            solutions.close()
+
+
+def _puzzle_grids(puzzle):
+    """Grilles du défi d'un puzzle : (rôle, indice d'exemple, grille) et drapeaux."""
+    grids = []
+    for i, example in enumerate(puzzle.get('train', [])):
+        for key, role in (('input', TRAIN_INPUT), ('output', TRAIN_OUTPUT)):
+            if key in example:
+                grids.append((role, i, example[key]))
+    flags = 0
+    test = puzzle.get('test')
+    if test is not None:
+        flags |= _HAS_TEST
+        if isinstance(test, list):
+            flags |= _TEST_IS_LIST
+        for i, example in enumerate(test if isinstance(test, list) else [test]):
+            if 'input' in example:
+                grids.append((TEST_INPUT, i, example['input']))
+    return grids, flags
+
+
+def write_puzzle_store(entries, path, signature=None):
+    """Écrit un magasin à partir de (source, identifiant, défi, solutions) ; écriture atomique.
+
+    solutions donne la sortie de chaque exemple de test (None si inconnue).
+    Les grilles sont écrites au fil de l'eau : seul le puzzle courant est en mémoire.
+    """
+    puzzle_rows, grid_rows, solution_rows, puzzle_ids, sources = [], [], [], [], []
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * _ALIGN)
+        offset = _ALIGN
+        for source, puzzle_id, puzzle, solutions in entries:
+            grids, flags = _puzzle_grids(puzzle)
+            solutions = [(TEST_OUTPUT, i, grid) for i, grid in enumerate(solutions)
+                         if grid is not None and not _is_grid_list(grid)]
+            puzzle_rows.append((len(grid_rows), len(grids), len(solution_rows), len(solutions), flags))
+            puzzle_ids.append(puzzle_id)
+            sources.append(source)
+            for rows, items in ((grid_rows, grids), (solution_rows, solutions)):
+                for role, example, grid in items:
+                    data = ArcGrid(grid).array
+                    rows.append((offset, data.shape[0], data.shape[1], role, example))
+                    f.write(np.ascontiguousarray(data).tobytes())
+                    offset += data.size
+
+        tables = []
+        for rows, dtype in ((puzzle_rows, _PUZZLE_DTYPE), (grid_rows, _GRID_DTYPE), (solution_rows, _GRID_DTYPE)):
+            padding = -offset % _ALIGN
+            f.write(b'\0' * padding)
+            offset += padding
+            tables.append(offset)
+            table = np.array(rows, dtype=dtype)
+            f.write(table.tobytes())
+            offset += table.nbytes
+
+        meta = json.dumps({'ids': puzzle_ids, 'sources': sources, 'signature': signature}).encode()
+        f.write(meta)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, STORE_VERSION, len(puzzle_rows), len(grid_rows), len(solution_rows),
+                             tables[0], tables[1], tables[2], offset, len(meta)))
+    os.replace(tmp_path, path)
+    return len(puzzle_rows)
+
+
+def convert_arc_data(data_path, store_path):
+    """Convertit un répertoire de données ARC (les deux dispositions) en magasin binaire."""
+    return write_puzzle_store(iter_arc_puzzles(data_path, with_solutions=True), store_path,
+                              source_signature(data_path))
+
+
+class PuzzleStore(Mapping):
+    """Mapping identifiant -> puzzle sur un magasin binaire projeté en mémoire.
+
+    Les grilles sont des ArcGrid enveloppant des vues uint8 en lecture seule
+    sur la projection ; les puzzles construits sont gardés (seules les
+    enveloppes sont allouées, jamais les cellules). Les puzzles ne contiennent
+    que le défi ; les sorties de test sont lues par solutions().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._open()
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = struct.unpack_from('<8sI', self._buffer)
+        if magic != MAGIC or version != STORE_VERSION:
+            self._buffer.close()
+            raise ValueError(f"Magasin de puzzles invalide ou de version non supportée: {self.path}")
+        n_puzzles, n_grids, n_solutions, puzzles_at, grids_at, solutions_at, meta_at, meta_length = \
+            _HEADER.unpack_from(self._buffer)[2:]
+        self._data = np.frombuffer(self._buffer, dtype=np.uint8)
+        self._puzzles = np.frombuffer(self._buffer, dtype=_PUZZLE_DTYPE, count=n_puzzles, offset=puzzles_at)
+        grids = np.frombuffer(self._buffer, dtype=_GRID_DTYPE, count=n_grids, offset=grids_at)
+        self._columns = {name: grids[name] for name in _GRID_DTYPE.names}
+        solutions = np.frombuffer(self._buffer, dtype=_GRID_DTYPE, count=n_solutions, offset=solutions_at)
+        self._solution_columns = {name: solutions[name] for name in _GRID_DTYPE.names}
+        meta = json.loads(bytes(self._buffer[meta_at:meta_at + meta_length]))
+        self.puzzle_ids = meta['ids']
+        self.sources = meta['sources']
+        self.signature = meta['signature']
+        self._rows = {puzzle_id: i for i, puzzle_id in enumerate(self.puzzle_ids)}
+        self._built = {}
+
+    def _view(self, columns, index):
+        offset = int(columns['offset'][index])
+        height = int(columns['height'][index])
+        width = int(columns['width'][index])
+        return self._data[offset:offset + height * width].reshape(height, width)
+
+    def grid(self, index):
+        """Vue uint8 (h, w) en lecture seule de la grille d'indice donné."""
+        return self._view(self._columns, index)
+
+    def __getitem__(self, puzzle_id):
+        puzzle = self._built.get(puzzle_id)
+        if puzzle is not None:
+            return puzzle
+        first, count, _, _, flags = self._puzzles[self._rows[puzzle_id]].item()
+
+        roles = self._columns['role'][first:first + count].tolist()
+        examples = self._columns['example'][first:first + count].tolist()
+        train, test = {}, {}
+        for index, role, example in zip(range(first, first + count), roles, examples):
+            if role == TEST_INPUT:
+                test.setdefault(example, {})['input'] = ArcGrid(self.grid(index))
+            else:
+                key = 'input' if role == TRAIN_INPUT else 'output'
+                train.setdefault(example, {})[key] = ArcGrid(self.grid(index))
+
+        puzzle = {'train': [train[i] for i in sorted(train)]}
+        if flags & _HAS_TEST:
+            tests = [test[i] for i in sorted(test)]
+            puzzle['test'] = tests if flags & _TEST_IS_LIST else (tests[0] if tests else {})
+        self._built[puzzle_id] = puzzle
+        return puzzle
+
+    def solutions(self, puzzle_id):
+        """Sorties de test d'un puzzle (ArcGrid par exemple de test, None si inconnue)."""
+        _, _, first, count, _ = self._puzzles[self._rows[puzzle_id]].item()
+        examples = self._solution_columns['example'][first:first + count].tolist()
+        solutions = [None] * (max(examples) + 1 if examples else 0)
+        for index, example in zip(range(first, first + count), examples):
+            solutions[example] = ArcGrid(self._view(self._solution_columns, index))
+        return solutions
+
+    def __contains__(self, puzzle_id):
+        return puzzle_id in self._rows
+
+    def __iter__(self):
+        return iter(self.puzzle_ids)
+
+    def __len__(self):
+        return len(self.puzzle_ids)
+
+    def select(self, source):
+        """Sous-ensemble des puzzles d'un jeu ('training', 'evaluation', 'test')."""
+        return _StoreSubset(self, [puzzle_id for puzzle_id, s in zip(self.puzzle_ids, self.sources) if s == source])
+
+    def is_current(self, data_path):
+        """Vrai si le magasin a été converti depuis les fichiers source actuels."""
+        return self.signature == source_signature(data_path)
+
+    def close(self):
+        """Libère la projection (les vues déjà distribuées ne doivent plus être utilisées)."""
+        self._built.clear()
+        self._data = self._puzzles = self._columns = self._solution_columns = None
+        self._buffer.close()
+
+    def __getstate__(self):
+        # La projection ne se sérialise pas : rouverte (partagée) dans le processus cible
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+
+class _StoreSubset(Mapping):
+    """Vue d'un magasin restreinte à une liste d'identifiants."""
+
+    def __init__(self, store, puzzle_ids):
+        self.store = store
+        self.puzzle_ids = puzzle_ids
+        self._ids = set(puzzle_ids)
+
+    def __getitem__(self, puzzle_id):
+        if puzzle_id not in self._ids:
+            raise KeyError(puzzle_id)
+        return self.store[puzzle_id]
+
+    def solutions(self, puzzle_id):
+        """Sorties de test d'un puzzle du sous-ensemble."""
+        if puzzle_id not in self._ids:
+            raise KeyError(puzzle_id)
+        return self.store.solutions(puzzle_id)
+
+    def __contains__(self, puzzle_id):
+        return puzzle_id in self._ids
+
+    def __iter__(self):
+        return iter(self.puzzle_ids)
+
+    def __len__(self):
+        return len(self.puzzle_ids)
+
+
+def open_puzzle_store(data_path, store_path):
+    """Ouvre le magasin, en le (re)convertissant d'abord s'il est absent ou périmé."""
+    if os.path.exists(store_path):
+        try:
+            store = PuzzleStore(store_path)
+            if store.is_current(data_path):
+                return store
+            store.close()
+        except (OSError, ValueError, struct.error):
+            pass
+    directory = os.path.dirname(store_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    convert_arc_data(data_path, store_path)
+    return PuzzleStore(store_path)
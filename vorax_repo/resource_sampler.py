@@ -0,0 +1,205 @@
+"""
+Échantillonneur de ressources du processus en arrière-plan.
+
+Un thread démon relève à intervalle fixe la mémoire résidente (RSS) du
+processus, son temps CPU (utilisateur + système) et, si tracemalloc est
+actif, le pic de mémoire allouée, dans un tampon circulaire de taille fixe.
+Le code du solveur ne fait que marquer des débuts de phase (mark) et lire le
+dernier échantillon (latest) ; les statistiques d'une phase sont calculées à
+partir du tampon. Contrairement à psutil.virtual_memory() (mémoire de tout le
+système) et à psutil.cpu_percent(interval=0.1) (qui attend 100 ms), les
+mesures portent sur le processus et restent hors du chemin du solveur.
+"""
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SAMPLE_DTYPE = np.dtype([('time', 'f8'), ('rss', 'i8'), ('cpu_time', 'f8'), ('traced_peak', 'i8')])
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def process_rss():
+    """Mémoire résidente du processus en octets (/proc, sinon psutil, sinon 0)."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return 0
+
+
+def total_memory():
+    """Mémoire physique totale en octets, ou None si inconnue."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return psutil.virtual_memory().total if psutil is not None else None
+
+
+def _as_dict(row):
+    return {name: row[name].item() for name in SAMPLE_DTYPE.names}
+
+
+class ResourceSampler:
+    """Échantillons (instant, RSS, temps CPU, pic tracemalloc) dans un tampon circulaire.
+
+    Args:
+        interval: période d'échantillonnage du thread (s) ; None : pas de thread,
+            chaque lecture (latest, mark) relève un échantillon
+        capacity: nombre d'échantillons conservés (les plus anciens sont écrasés)
+        trace_memory: démarre tracemalloc pour relever le pic de mémoire allouée
+            (coûteux : à réserver au diagnostic)
+    """
+
+    def __init__(self, interval=0.1, capacity=4096, trace_memory=False):
+        self.interval = interval
+        self.capacity = capacity
+        self.trace_memory = trace_memory
+        self._thread = None
+        self._running = False
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._buffer = np.zeros(self.capacity, dtype=SAMPLE_DTYPE)
+        self._count = 0
+        self._marks = deque(maxlen=self.capacity)
+
+    def _check_fork(self):
+        # Après un fork, le thread n'existe plus dans le processus enfant : repartir de zéro
+        if os.getpid() != self._pid:
+            running = self._running
+            self._thread = None
+            self._reset()
+            if running:
+                self._running = False
+                self.start()
+
+    def start(self):
+        """Démarre le thread d'échantillonnage ; retourne le sampler."""
+        self._check_fork()
+        if self._running or self.interval is None:
+            return self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._running = True
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le thread (les échantillons restent lisibles)."""
+        self._running = False
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Relève un échantillon immédiatement et le range dans le tampon."""
+        times = os.times()
+        traced_peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        row = (time.time(), process_rss(), times.user + times.system, traced_peak)
+        with self._lock:
+            self._buffer[self._count % self.capacity] = row
+            self._count += 1
+        return dict(zip(SAMPLE_DTYPE.names, row))
+
+    def samples(self, since=None, until=None):
+        """Échantillons du tampon dans l'ordre chronologique (tableau structuré), filtrés par instant."""
+        self._check_fork()
+        with self._lock:
+            if self._count <= self.capacity:
+                rows = self._buffer[:self._count].copy()
+            else:
+                start = self._count % self.capacity
+                rows = np.concatenate([self._buffer[start:], self._buffer[:start]])
+        if since is not None:
+            rows = rows[rows['time'] >= since]
+        if until is not None:
+            rows = rows[rows['time'] <= until]
+        return rows
+
+    def latest(self):
+        """Dernier échantillon du tampon (dict), sans nouvelle mesure si le thread tourne."""
+        self._check_fork()
+        with self._lock:
+            if self._count and self._running:
+                return _as_dict(self._buffer[(self._count - 1) % self.capacity])
+        return self.sample()
+
+    def mark(self, phase):
+        """Marque le début d'une phase (un échantillon est relevé à la frontière et gardé avec la marque).
+
+        Le pic tracemalloc est remis à zéro : traced_peak porte sur la phase.
+        """
+        self._check_fork()
+        sample = self.sample()
+        if tracemalloc.is_tracing():
+            # Après l'échantillon de frontière, qui garde le pic de la phase précédente
+            tracemalloc.reset_peak()
+        self._marks.append((sample, phase))
+        return sample['time']
+
+    def phase_stats(self, phase):
+        """Statistiques de la dernière phase marquée phase, jusqu'à la marque suivante ou maintenant.
+
+        Les écarts sont calculés entre les échantillons des deux frontières,
+        gardés avec les marques : ils restent exacts quand le tampon circulaire
+        ne couvre plus toute la phase (rss_max et samples ne portent alors que
+        sur les échantillons encore présents).
+
+        Returns:
+            dict avec wall (s), cpu_time (s), cpu_percent (temps CPU du
+            processus / temps écoulé), rss_start, rss_end, rss_max, rss_delta
+            et traced_peak (octets), ou None si la phase n'a pas été marquée
+        """
+        self._check_fork()
+        marks = list(self._marks)
+        starts = [i for i, (_, name) in enumerate(marks) if name == phase]
+        if not starts:
+            return None
+        i = starts[-1]
+        first = marks[i][0]
+        last = marks[i + 1][0] if i + 1 < len(marks) else self.sample()
+        rows = self.samples(since=first['time'], until=last['time'])
+        wall = last['time'] - first['time']
+        cpu_time = last['cpu_time'] - first['cpu_time']
+        return {
+            'wall': wall,
+            'cpu_time': cpu_time,
+            'cpu_percent': cpu_time / wall * 100 if wall > 0 else 0.0,
+            'rss_start': int(first['rss']),
+            'rss_end': int(last['rss']),
+            'rss_max': int(max(rows['rss'].max(initial=0), first['rss'], last['rss'])),
+            'rss_delta': int(last['rss'] - first['rss']),
+            'traced_peak': int(max(rows['traced_peak'][rows['time'] > first['time']].max(initial=0),
+                                   last['traced_peak'])),
+            'samples': int(len(rows)),
+        }
@@ -0,0 +1,132 @@
+"""
+Index des transformations par signature de forme (entrée -> sortie).
+
+Chaque transformation déclare une fonction de forme bon marché
+(h, w) -> (h', w'), ou DATA_DEPENDENT si la forme de sortie dépend du
+contenu de la grille. Pour une paire de dimensions observée dans les
+exemples d'entraînement, seules les transformations capables de produire
+la bonne forme sont exécutées ; les autres ne pourraient jamais réussir.
+"""
+import numpy as np
+
+# Forme de sortie dépendante du contenu : la transformation est toujours exécutée
+DATA_DEPENDENT = None
+
+
+def same_shape(shape):
+    return shape
+
+
+def transposed_shape(shape):
+    return shape[1], shape[0]
+
+
+def scaled_shape(factor):
+    """Forme d'un agrandissement de chaque cellule par un facteur."""
+    return lambda shape: (shape[0] * factor, shape[1] * factor)
+
+
+def padded_shape(border_width=1):
+    """Forme après ajout d'une bordure."""
+    return lambda shape: (shape[0] + 2 * border_width, shape[1] + 2 * border_width)
+
+
+def cropped_shape(border_width=1):
+    """Forme après suppression d'une bordure (grille inchangée si trop petite)."""
+    def _shape(shape):
+        if shape[0] <= 2 * border_width or shape[1] <= 2 * border_width:
+            return shape
+        return shape[0] - 2 * border_width, shape[1] - 2 * border_width
+    return _shape
+
+
+# Formes des transformations standard (mêmes noms dans les registres V2 et V3)
+STANDARD_SHAPES = {
+    "identity": same_shape,
+    "flip_horizontal": same_shape,
+    "flip_vertical": same_shape,
+    "rotate_90": transposed_shape,
+    "rotate_180": same_shape,
+    "rotate_270": transposed_shape,
+    "invert_colors": same_shape,
+    "expand_2x": scaled_shape(2),
+    "expand_3x": scaled_shape(3),
+    "remove_borders": cropped_shape(1),
+    "add_borders": padded_shape(1),
+    "extract_pattern": DATA_DEPENDENT,
+    "apply_mask": same_shape,
+    "crop_to_content": DATA_DEPENDENT,
+    "color_remap": same_shape,
+    "flip_and_rotate": transposed_shape,
+    "extract_and_expand": DATA_DEPENDENT,
+    "adaptive_transform": same_shape,
+}
+
+
+class ShapeSignatureIndex:
+    """Transformations candidates par signature (forme d'entrée, forme de sortie).
+
+    Les candidats d'une signature sont calculés une seule fois puis réutilisés
+    pour tous les puzzles qui la partagent. Une transformation sans fonction de
+    forme déclarée est traitée comme dépendante des données.
+    """
+
+    def __init__(self, names, shape_functions=None):
+        self.names = list(names)
+        shape_functions = STANDARD_SHAPES if shape_functions is None else shape_functions
+        self._shape_functions = [shape_functions.get(name, DATA_DEPENDENT) for name in self.names]
+        self._data_dependent = np.array(
+            [func is DATA_DEPENDENT for func in self._shape_functions], dtype=bool
+        )
+        self._candidates = {}  # (forme entrée, forme sortie) -> indices des lignes
+        self.reset_stats()
+
+    def candidates(self, input_shape, output_shape):
+        """Indices (ordre du registre) des transformations à exécuter pour cette signature."""
+        key = (tuple(input_shape), tuple(output_shape))
+        rows = self._candidates.get(key)
+        if rows is None:
+            keep = []
+            for row, func in enumerate(self._shape_functions):
+                if func is DATA_DEPENDENT:
+                    keep.append(row)
+                    continue
+                try:
+                    if tuple(func(key[0])) == key[1]:
+                        keep.append(row)
+                except Exception:
+                    keep.append(row)  # En cas de doute, la transformation est exécutée
+            rows = np.array(keep, dtype=np.intp)
+            self._candidates[key] = rows
+
+        self.groups += 1
+        self.evaluated += len(rows)
+        self.pruned += len(self.names) - len(rows)
+        self.data_dependent += int(self._data_dependent[rows].sum())
+        return rows
+
+    def reset_stats(self):
+        """Remet à zéro les compteurs d'élagage (les candidats restent en cache)."""
+        self.groups = 0
+        self.evaluated = 0
+        self.pruned = 0
+        self.data_dependent = 0
+
+    def merge_stats(self, stats):
+        """Ajoute les compteurs d'un autre index (worker)."""
+        self.groups += stats['groups']
+        self.evaluated += stats['evaluated']
+        self.pruned += stats['pruned']
+        self.data_dependent += stats['data_dependent']
+
+    def stats(self):
+        """Statistiques d'élagage depuis la dernière remise à zéro."""
+        considered = self.evaluated + self.pruned
+        return {
+            'signatures': len(self._candidates),
+            'groups': self.groups,
+            'evaluated': self.evaluated,
+            'pruned': self.pruned,
+            'data_dependent': self.data_dependent,
+            'pruned_rate': self.pruned / considered if considered else 0.0,
+        }
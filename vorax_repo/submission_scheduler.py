@@ -0,0 +1,204 @@
+"""
+Ordonnanceur de soumission avec échéance globale et budgets par puzzle.
+
+Chaque puzzle est résolu dans son propre processus, avec un budget dérivé de
+sa difficulté estimée (BudgetAllocator) et un BudgetToken que le solveur
+consulte pour s'arrêter de lui-même. Un puzzle qui dépasse son budget (plus
+une courte marge de grâce) est interrompu et reçoit sa réponse de repli
+(identité ou meilleure réponse rapportée jusque-là) ; le temps laissé par les
+puzzles rapides est redistribué aux puzzles non résolus lors de tours
+suivants. Un submission.json complet est écrit dès le départ puis mis à
+jour, de sorte qu'un fichier valide existe toujours avant l'échéance.
+"""
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from arc_grid import test_inputs
+from time_budget import BudgetAllocator, BudgetToken
+
+# Connexion vers le parent dans un processus worker (None ailleurs)
+_progress_conn = None
+
+
+def report_progress(solution):
+    """Rapporte une meilleure réponse provisoire (sans effet hors d'un worker)."""
+    if _progress_conn is not None:
+        try:
+            _progress_conn.send(('partial', solution))
+        except (OSError, ValueError):
+            pass
+
+
+def reporting_progress():
+    """Vrai dans un worker de run_with_deadline, où report_progress transmet les réponses."""
+    return _progress_conn is not None
+
+
+def attempts_entry(attempt_outputs):
+    """Entrée de soumission ARC Prize : [{'attempt_1': ..., 'attempt_2': ...}] par entrée de test.
+
+    attempt_outputs[k][i] est la sortie de l'essai k pour l'entrée de test i.
+    """
+    n_tests = len(attempt_outputs[0]) if attempt_outputs else 0
+    return [
+        {f'attempt_{k + 1}': (outputs[i].tolist() if hasattr(outputs[i], 'tolist') else outputs[i])
+         for k, outputs in enumerate(attempt_outputs)}
+        for i in range(n_tests)
+    ]
+
+
+def identity_attempts(puzzle, n_attempts=2):
+    """Réponse de repli au format ARC Prize : l'entrée de chaque test, pour chaque essai."""
+    grids = test_inputs(puzzle) or [[[0]]]
+    return attempts_entry([grids] * n_attempts)
+
+
+def write_submission(path, submission):
+    """Écriture atomique du fichier de soumission."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(submission, f)
+    os.replace(tmp_path, path)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def _run_task(task_fn, puzzle_id, puzzle, budget, conn):
+    """Point d'entrée du processus worker."""
+    global _progress_conn
+    _progress_conn = conn
+    try:
+        conn.send(('final', task_fn(puzzle_id, puzzle, BudgetToken(budget))))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
+
+
+def run_with_deadline(task_fn, puzzles, difficulties, deadline, submission_path,
+                      n_workers=1, fallback_fn=identity_attempts, solution_key='solution',
+                      safety_margin=30.0, min_budget=0.5, max_budget=60.0,
+                      checkpoint_every=10, max_rounds=3, grace=1.0):
+    """Résout les puzzles en parallèle sous une échéance globale.
+
+    Args:
+        task_fn: fonction (puzzle_id, puzzle, token) -> dict contenant au moins
+            solution_key ; 'cancelled' vrai signale un budget épuisé
+        puzzles: dict {puzzle_id: puzzle}
+        difficulties: dict {puzzle_id: difficulté estimée (1-10)}
+        deadline: échéance absolue (time.time())
+        submission_path: chemin du submission.json
+        n_workers: nombre de processus simultanés
+        fallback_fn: réponse de repli par puzzle (par défaut l'entrée de chaque test, pour chaque essai)
+        safety_margin: marge (s) réservée à l'écriture finale avant l'échéance
+        max_rounds: nombre maximal de tours (le premier compris)
+        grace: délai (s) laissé au solveur après son budget avant interruption
+
+    Returns:
+        (submission, records) où records[puzzle_id] décrit l'issue de chaque puzzle
+        ('solved', 'timeout', 'error' ou 'skipped'), son résultat éventuel et le
+        nombre de tentatives.
+    """
+    n_workers = max(1, int(n_workers))
+    submission = {puzzle_id: fallback_fn(puzzle) for puzzle_id, puzzle in puzzles.items()}
+    records = {puzzle_id: {'status': 'skipped', 'budget': 0.0, 'time': 0.0, 'result': None, 'attempts': 0}
+               for puzzle_id in puzzles}
+    write_submission(submission_path, submission)
+
+    if not puzzles:
+        return submission, records
+
+    mean_difficulty = sum(difficulties.values()) / len(difficulties) if difficulties else 5.0
+    # La marge ne peut pas consommer plus de 10% du temps disponible
+    hard_stop = deadline - min(safety_margin, 0.1 * max(0.0, deadline - time.time()))
+    allocator = BudgetAllocator({puzzle_id: difficulties.get(puzzle_id, mean_difficulty) for puzzle_id in puzzles},
+                                n_workers, min_budget, max_budget, max_rounds)
+    ctx = _mp_context()
+    budgets = allocator.initial(hard_stop - time.time())
+    pending = deque(budgets)
+    running = {}  # conn -> (puzzle_id, process, start, budget)
+    completed_since_checkpoint = 0
+
+    def _finish(conn, status, finished=False):
+        puzzle_id, process, start, budget = running.pop(conn)
+        if process.is_alive():
+            process.kill()
+        process.join()
+        conn.close()
+        elapsed = time.time() - start
+        records[puzzle_id]['status'] = status
+        records[puzzle_id]['time'] += elapsed
+        allocator.record(puzzle_id, elapsed, finished)
+
+    try:
+        while pending or running:
+            now = time.time()
+            if now >= hard_stop:
+                break
+
+            # Lancer de nouveaux puzzles tant que des workers sont libres
+            while pending and len(running) < n_workers:
+                puzzle_id = pending.popleft()
+                budget = max(0.0, min(budgets[puzzle_id], hard_stop - now))
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                process = ctx.Process(target=_run_task,
+                                      args=(task_fn, puzzle_id, puzzles[puzzle_id], budget, send_conn))
+                process.daemon = True
+                process.start()
+                send_conn.close()
+                running[recv_conn] = (puzzle_id, process, time.time(), budget)
+                records[puzzle_id]['budget'] = budget
+                records[puzzle_id]['attempts'] += 1
+
+            # Attendre un message ou l'échéance la plus proche
+            next_expiry = min(start + budget + grace for _, _, start, budget in running.values())
+            timeout = max(0.0, min(next_expiry, hard_stop) - time.time())
+            for conn in wait(list(running), timeout=timeout):
+                puzzle_id = running[conn][0]
+                try:
+                    kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    _finish(conn, 'error', finished=True)
+                    continue
+                if kind == 'partial':
+                    submission[puzzle_id] = payload
+                    continue
+                if kind == 'final':
+                    records[puzzle_id]['result'] = payload
+                    if payload and payload.get(solution_key):
+                        submission[puzzle_id] = payload[solution_key]
+                    cancelled = bool(payload and payload.get('cancelled'))
+                    _finish(conn, 'timeout' if cancelled else 'solved', finished=not cancelled)
+                else:
+                    # Une erreur ne se corrige pas avec plus de temps : pas de nouvelle tentative
+                    _finish(conn, 'error', finished=True)
+                completed_since_checkpoint += 1
+
+            # Interrompre les puzzles qui ont dépassé leur budget et la marge de grâce
+            now = time.time()
+            for conn, (puzzle_id, _, start, budget) in list(running.items()):
+                if now - start >= budget + grace:
+                    _finish(conn, 'timeout')
+                    completed_since_checkpoint += 1
+
+            if completed_since_checkpoint >= checkpoint_every:
+                write_submission(submission_path, submission)
+                completed_since_checkpoint = 0
+
+            # Tour terminé : redistribuer le temps restant aux puzzles non résolus
+            if not pending and not running:
+                budgets = allocator.next_round(hard_stop - time.time())
+                pending.extend(budgets)
+    finally:
+        for conn in list(running):
+            _finish(conn, 'timeout')
+        write_submission(submission_path, submission)
+
+    return submission, records
@@ -0,0 +1,272 @@
+"""
+Générateur de puzzles ARC synthétiques pour les tests de charge.
+
+Chaque puzzle est défini par un programme connu (composition de 1 à
+max_depth transformations du registre du modèle) appliqué à des grilles
+aléatoires de 1x1 à 30x30 ; les sorties qui sortent du format ARC (grille
+vide, plus de 30 cellules de côté, couleurs hors 0-9) sont rejetées et un
+autre programme est tiré. Chaque puzzle a son propre générateur aléatoire
+dérivé de (graine, indice) : le même puzzle est reproduit quels que soient
+le nombre de puzzles générés et l'ordre de génération.
+
+Les puzzles sont écrits dans les deux dispositions lues par
+utils/data_loader.load_arc_data et puzzle_store.iter_arc_puzzles :
+- un fichier par puzzle : training/<id>.json, evaluation/<id>.json ;
+- consolidée : arc-agi_{training,evaluation}_{challenges,solutions}.json.
+Le programme de chaque puzzle est enregistré dans synthetic_programs.json.
+
+Usage :
+    python synthetic_arc.py data/synthetic --puzzles 40000 --seed 0 --layout both
+"""
+import argparse
+import hashlib
+import json
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from parallel_learning import default_workers
+
+# Limites du format ARC
+MAX_SIZE = 30
+N_COLORS = 10
+
+# Fichier des programmes de référence
+PROGRAMS_NAME = 'synthetic_programs.json'
+
+# Dispositions : sous-répertoire de chaque disposition lorsque les deux sont écrites
+LAYOUTS = ('files', 'consolidated')
+
+# Puzzles générés par lot envoyé à un worker
+CHUNK_SIZE = 500
+
+
+def puzzle_id(seed, index):
+    """Identifiant à 8 chiffres hexadécimaux (comme ARC), stable pour (graine, indice)."""
+    return hashlib.blake2b(f'{seed}:{index}'.encode(), digest_size=4).hexdigest()
+
+
+def random_grid(rng, height, width):
+    """Grille aléatoire : bruit coloré, ou rectangles colorés sur fond uni."""
+    n_colors = int(rng.integers(2, N_COLORS + 1))
+    if rng.random() < 0.5:
+        return rng.integers(0, n_colors, size=(height, width))
+    grid = np.full((height, width), int(rng.integers(0, n_colors)), dtype=np.int64)
+    for _ in range(int(rng.integers(1, 4))):
+        top, left = int(rng.integers(0, height)), int(rng.integers(0, width))
+        bottom = int(rng.integers(top + 1, height + 1))
+        right = int(rng.integers(left + 1, width + 1))
+        grid[top:bottom, left:right] = int(rng.integers(0, n_colors))
+    return grid
+
+
+def run_program(registry, program, grid):
+    """Sortie du programme sur une grille, ou None si elle sort du format ARC."""
+    result = np.asarray(grid)
+    try:
+        for name in program:
+            result = np.asarray(registry[name](result))
+    except Exception:
+        return None
+    if result.ndim != 2 or result.size == 0 or max(result.shape) > MAX_SIZE:
+        return None
+    if not np.all(np.mod(result, 1) == 0) or result.min() < 0 or result.max() >= N_COLORS:
+        return None
+    return result.astype(np.int64)
+
+
+def generate_puzzle(registry, rng, max_depth=2, min_size=1, max_size=MAX_SIZE, max_tries=100):
+    """Un puzzle et son programme de référence.
+
+    Returns:
+        (puzzle, programme) où puzzle = {'train': [...], 'test': [{'input', 'output'}, ...]}
+        au format ARC (listes), ou (None, None) après max_tries programmes rejetés.
+    """
+    names = sorted(registry)
+    for _ in range(max_tries):
+        depth = int(rng.integers(1, max_depth + 1))
+        program = tuple(names[int(i)] for i in rng.integers(0, len(names), size=depth))
+        # Taille de base du puzzle, légèrement variée d'un exemple à l'autre
+        base_h, base_w = (int(v) for v in rng.integers(min_size, max_size + 1, size=2))
+        n_train = int(rng.integers(2, 6))
+        n_test = 1 if rng.random() < 0.8 else 2
+        examples = []
+        for _ in range(n_train + n_test):
+            height = min(max_size, max(min_size, base_h + int(rng.integers(-2, 3))))
+            width = min(max_size, max(min_size, base_w + int(rng.integers(-2, 3))))
+            grid = random_grid(rng, height, width)
+            output = run_program(registry, program, grid)
+            if output is None:
+                break
+            examples.append({'input': grid.tolist(), 'output': output.tolist()})
+        if len(examples) < n_train + n_test:
+            continue
+        # Un programme sans effet sur tous les exemples n'apprend rien
+        if all(example['input'] == example['output'] for example in examples):
+            continue
+        return {'train': examples[:n_train], 'test': examples[n_train:]}, program
+    return None, None
+
+
+def _generate_range(registry, seed, start, stop, options):
+    generated = []
+    for index in range(start, stop):
+        puzzle, program = generate_puzzle(registry, np.random.default_rng([seed, index]), **options)
+        if puzzle is not None:
+            generated.append((puzzle_id(seed, index), puzzle, program))
+    return generated
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+# Registre du processus worker (transmis une seule fois à l'initialisation)
+_worker_registry = None
+
+
+def _init_worker(registry):
+    global _worker_registry
+    _worker_registry = registry
+
+
+def _generate_chunk(args):
+    seed, start, stop, options = args
+    return _generate_range(_worker_registry, seed, start, stop, options)
+
+
+def generate_puzzles(registry, n_puzzles, seed=0, start=0, n_workers=1, **options):
+    """Générateur de (identifiant, puzzle, programme) pour les indices start..start+n_puzzles-1.
+
+    Les options sont celles de generate_puzzle. Un indice dont tous les
+    programmes sont rejetés est sauté. Avec n_workers > 1, les lots sont
+    générés en parallèle et produits dans l'ordre des indices (résultat
+    identique au mode séquentiel).
+    """
+    stop = start + n_puzzles
+    if n_workers <= 1 or n_puzzles <= CHUNK_SIZE:
+        for index in range(start, stop):
+            yield from _generate_range(registry, seed, index, index + 1, options)
+        return
+    chunks = [(seed, first, min(first + CHUNK_SIZE, stop), options) for first in range(start, stop, CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=_mp_context(),
+                             initializer=_init_worker, initargs=(registry,)) as executor:
+        for generated in executor.map(_generate_chunk, chunks):
+            yield from generated
+
+
+def generate_corpus(registry, n_puzzles, seed=0, **options):
+    """Corpus en mémoire {identifiant: puzzle}."""
+    return {pid: puzzle for pid, puzzle, _ in generate_puzzles(registry, n_puzzles, seed, **options)}
+
+
+class _ConsolidatedWriter:
+    """Écriture en flux d'un couple challenges/solutions (un puzzle à la fois)."""
+
+    def __init__(self, directory, prefix):
+        self._paths = [os.path.join(directory, f'{prefix}_{kind}.json') for kind in ('challenges', 'solutions')]
+        self._files = [open(path + '.tmp', 'w') for path in self._paths]
+        for f in self._files:
+            f.write('{')
+        self._count = 0
+
+    def add(self, pid, puzzle):
+        challenge = {'train': puzzle['train'], 'test': [{'input': example['input']} for example in puzzle['test']]}
+        solution = [example['output'] for example in puzzle['test']]
+        separator = ',' if self._count else ''
+        for f, value in zip(self._files, (challenge, solution)):
+            f.write(f'{separator}{json.dumps(pid)}:{json.dumps(value, separators=(",", ":"))}')
+        self._count += 1
+
+    def close(self):
+        for f, path in zip(self._files, self._paths):
+            f.write('}')
+            f.close()
+            os.replace(path + '.tmp', path)
+
+
+def write_dataset(registry, output_dir, n_puzzles, seed=0, layout='both', eval_fraction=0.2, n_workers=1,
+                  **options):
+    """Génère n_puzzles puzzles et les écrit dans output_dir.
+
+    Les premiers puzzles vont dans training, la fraction eval_fraction
+    restante dans evaluation. layout vaut 'files', 'consolidated' ou 'both'
+    (chaque disposition dans son sous-répertoire output_dir/files et
+    output_dir/consolidated).
+
+    Returns:
+        {'training': nombre, 'evaluation': nombre, 'directories': [...]}
+    """
+    layouts = LAYOUTS if layout == 'both' else (layout,)
+    if any(name not in LAYOUTS for name in layouts):
+        raise ValueError(f"Disposition inconnue: {layout}")
+    directories = {name: os.path.join(output_dir, name) if layout == 'both' else output_dir for name in layouts}
+    n_eval = int(round(n_puzzles * eval_fraction))
+    splits = (('training', 'arc-agi_training', 0, n_puzzles - n_eval),
+              ('evaluation', 'arc-agi_evaluation', n_puzzles - n_eval, n_eval))
+
+    counts = {'directories': sorted(set(directories.values()))}
+    programs = {}
+    for source, prefix, start, count in splits:
+        writer = None
+        if 'files' in directories:
+            os.makedirs(os.path.join(directories['files'], source), exist_ok=True)
+        if 'consolidated' in directories:
+            os.makedirs(directories['consolidated'], exist_ok=True)
+            writer = _ConsolidatedWriter(directories['consolidated'], prefix)
+        counts[source] = 0
+        try:
+            for pid, puzzle, program in generate_puzzles(registry, count, seed, start, n_workers, **options):
+                if 'files' in directories:
+                    with open(os.path.join(directories['files'], source, f'{pid}.json'), 'w') as f:
+                        json.dump(puzzle, f, separators=(',', ':'))
+                if writer is not None:
+                    writer.add(pid, puzzle)
+                programs[pid] = {'source': source, 'program': list(program)}
+                counts[source] += 1
+        finally:
+            if writer is not None:
+                writer.close()
+
+    for directory in counts['directories']:
+        with open(os.path.join(directory, PROGRAMS_NAME), 'w') as f:
+            json.dump(programs, f)
+    return counts
+
+
+def model_registry(model):
+    """Transformations du modèle utilisables sans paramètres (hors transformations paramétrées)."""
+    parametric = getattr(model, 'parametric_registry', {})
+    return {name: func for name, func in model.transformation_registry.items() if name not in parametric}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Générateur de puzzles ARC synthétiques')
+    parser.add_argument('output_dir')
+    parser.add_argument('--puzzles', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--layout', choices=LAYOUTS + ('both',), default='both')
+    parser.add_argument('--eval-fraction', type=float, default=0.2)
+    parser.add_argument('--max-depth', type=int, default=2, help='transformations composées au plus')
+    parser.add_argument('--min-size', type=int, default=1)
+    parser.add_argument('--max-size', type=int, default=MAX_SIZE)
+    parser.add_argument('--workers', type=int, default=default_workers())
+    args = parser.parse_args(argv)
+
+    # Registre du modèle V3 (paquet vorax)
+    from analysis_memo import AnalysisMemo
+    from vorax import HybridVoraxModelV3
+    registry = model_registry(HybridVoraxModelV3(memo=AnalysisMemo()))
+
+    counts = write_dataset(registry, args.output_dir, args.puzzles, args.seed, args.layout, args.eval_fraction,
+                           args.workers, max_depth=args.max_depth, min_size=args.min_size,
+                           max_size=min(args.max_size, MAX_SIZE))
+    print(f"{counts['training']} puzzles d'entraînement et {counts['evaluation']} d'évaluation "
+          f"écrits dans {', '.join(counts['directories'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Configuration pytest : modules du dépôt importables et fixtures partagées
+(modèle V3 avec son propre mémo, corpus synthétique déterministe).
+"""
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from analysis_memo import AnalysisMemo
+from synthetic_arc import generate_corpus, model_registry
+
+
+@pytest.fixture(scope='session')
+def model():
+    """Modèle V3 neuf, avec un mémo distinct du mémo global."""
+    from vorax import HybridVoraxModelV3
+    return HybridVoraxModelV3(memo=AnalysisMemo())
+
+
+@pytest.fixture(scope='session')
+def corpus(model):
+    """40 puzzles synthétiques générés avec les transformations du modèle (graine fixe)."""
+    return generate_corpus(model_registry(model), 40, seed=0)
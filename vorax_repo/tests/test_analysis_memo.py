@@ -0,0 +1,94 @@
+"""Mémo LRU borné : éviction, copies figées et valeurs non partagées."""
+import numpy as np
+import pytest
+
+from analysis_memo import AnalysisMemo, estimate_nbytes, puzzle_content_hash
+from arc_grid import as_arc_puzzle
+from batch_evaluator import MatchMatrix
+
+
+def test_lru_eviction_respects_byte_bound():
+    size = estimate_nbytes(np.zeros(100, dtype=np.uint8))
+    memo = AnalysisMemo(max_bytes=3 * size)
+    for key in 'abc':
+        memo.put(key, np.zeros(100, dtype=np.uint8))
+    memo.get('a')  # 'a' devient la plus récente : 'b' est évincée
+    memo.put('d', np.zeros(100, dtype=np.uint8))
+    assert 'b' not in memo and all(key in memo for key in 'acd')
+    assert memo.current_bytes == 3 * size <= memo.max_bytes
+    assert memo.stats()['evictions'] == 1
+
+    # Une valeur plus grande que le mémo entier n'est pas gardée
+    memo.put('big', np.zeros(10 * 100, dtype=np.uint8))
+    assert 'big' not in memo and len(memo) == 3
+
+    # Remplacer une clé ne compte pas deux fois sa taille
+    memo.put('a', np.zeros(100, dtype=np.uint8))
+    assert memo.current_bytes == 3 * size
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    memo = AnalysisMemo()
+    calls = []
+    for _ in range(3):
+        assert memo.get_or_compute('key', lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+    assert (memo.hits, memo.misses) == (2, 1)
+
+
+def test_put_keeps_arguments_and_returns_private_copies():
+    memo = AnalysisMemo()
+    array = np.arange(6).reshape(2, 3)
+    value = {'grid': array, 'dims': [(2, 3)], 'colors': {1, 2}}
+    assert memo.put('key', value) is value
+    assert array.flags.writeable and value['grid'] is array
+
+    # Le mémo a sa propre copie : modifier l'original ne la change pas
+    array[0, 0] = 99
+    first = memo.get('key')
+    assert first['grid'][0, 0] == 0 and not first['grid'].flags.writeable
+    with pytest.raises(ValueError):
+        first['grid'][0, 0] = 1
+
+    # Chaque lecture renvoie des conteneurs distincts
+    first['dims'].append((9, 9))
+    first['colors'].add(7)
+    second = memo.get('key')
+    assert second['dims'] == [(2, 3)] and second['colors'] == {1, 2}
+
+
+def test_views_are_stored_without_their_base():
+    memo = AnalysisMemo()
+    batch = np.zeros((1000, 30, 30), dtype=np.uint8)
+    batch.flags.writeable = False
+    view = batch[0]
+    memo.put('view', view)
+    stored = memo.get('view')
+    assert stored.base is None and stored.nbytes == view.nbytes
+    assert memo.current_bytes < batch.nbytes // 100
+
+    # Un tableau en lecture seule qui possède ses données est gardé tel quel
+    owned = np.ones(4)
+    owned.flags.writeable = False
+    memo.put('owned', owned)
+    assert memo.get('owned') is owned
+
+
+def test_match_matrix_is_frozen():
+    memo = AnalysisMemo()
+    matches = np.array([[True, False], [True, True]])
+    memo.put('matrix', MatchMatrix(['a', 'b'], matches, 2))
+    matrix = memo.get('matrix')
+    assert matrix.consistent() == ['b']
+    assert matrix.matches is not matches and not matrix.matches.flags.writeable
+    with pytest.raises(ValueError):
+        matrix.matches[0, 1] = True
+    matches[0, 1] = True
+    assert memo.get('matrix').consistent() == ['b']
+
+
+def test_content_hash_ignores_representation():
+    puzzle = {'train': [{'input': [[1, 2]], 'output': [[2, 1]]}], 'test': [{'input': [[3]]}]}
+    assert puzzle_content_hash(puzzle) == puzzle_content_hash(as_arc_puzzle(puzzle))
+    other = {'train': puzzle['train'], 'test': [{'input': [[4]]}]}
+    assert puzzle_content_hash(other) != puzzle_content_hash(puzzle)
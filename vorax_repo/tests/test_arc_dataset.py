@@ -0,0 +1,108 @@
+"""Index par plages d'octets d'ArcDataset contre un json.load du fichier complet."""
+import json
+import os
+import pickle
+
+import pytest
+
+from analysis_memo import puzzle_content_hash
+from arc_dataset import ArcDataset, ChainedDataset
+from arc_grid import as_arc_puzzle
+from synthetic_arc import model_registry, write_dataset
+
+
+@pytest.fixture(scope='module')
+def consolidated(model, tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('consolidated'))
+    write_dataset(model_registry(model), directory, 30, seed=1, layout='consolidated')
+    return directory
+
+
+def _challenges_path(directory, source='training'):
+    return os.path.join(directory, f'arc-agi_{source}_challenges.json')
+
+
+def _solutions_path(directory, source='training'):
+    return os.path.join(directory, f'arc-agi_{source}_solutions.json')
+
+
+def _assert_matches_json(dataset, path):
+    with open(path) as f:
+        expected = json.load(f)
+    assert list(dataset) == list(expected)
+    assert len(dataset) == len(expected)
+    for puzzle_id, challenge in expected.items():
+        assert puzzle_id in dataset
+        assert json.loads(dataset.raw(puzzle_id)) == challenge
+        assert puzzle_content_hash(dataset[puzzle_id]) == puzzle_content_hash(as_arc_puzzle(challenge))
+    assert 'absent' not in dataset
+    with pytest.raises(KeyError):
+        dataset['absent']
+
+
+@pytest.mark.parametrize('source', ['training', 'evaluation'])
+def test_generated_file_matches_json_load(consolidated, source):
+    dataset = ArcDataset(_challenges_path(consolidated, source), cache_size=4)
+    try:
+        _assert_matches_json(dataset, _challenges_path(consolidated, source))
+    finally:
+        dataset.close()
+
+
+def test_indented_file_with_tricky_keys(tmp_path):
+    # Indentation, crochets dans les clés et objet vide : l'index ne doit suivre que la structure
+    challenges = {
+        'a{b]': {'train': [{'input': [[1, 2]], 'output': [[2, 1]]}], 'test': [{'input': [[0]]}]},
+        'plain': {'train': [], 'test': [{'input': [[3], [4]]}]},
+        '[]': {'train': [{'input': [[5]], 'output': [[5]]}], 'test': {'input': [[5, 5]]}},
+    }
+    path = str(tmp_path / 'indented.json')
+    with open(path, 'w') as f:
+        json.dump(challenges, f, indent=4)
+    dataset = ArcDataset(path)
+    _assert_matches_json(dataset, path)
+
+    # Clé avec échappement : repli sur un décodage complet
+    escaped = str(tmp_path / 'escaped.json')
+    with open(escaped, 'w') as f:
+        json.dump({'quote"d': challenges['plain'], 'plain': challenges['a{b]']}, f, indent=2)
+    _assert_matches_json(ArcDataset(escaped), escaped)
+
+
+def test_solutions_restrict_ids(consolidated, tmp_path):
+    with open(_solutions_path(consolidated)) as f:
+        solutions = json.load(f)
+    kept = list(solutions)[::2]
+    partial = str(tmp_path / 'solutions.json')
+    with open(partial, 'w') as f:
+        json.dump({puzzle_id: solutions[puzzle_id] for puzzle_id in kept}, f)
+
+    received = {}
+    dataset = ArcDataset(_challenges_path(consolidated), partial,
+                         build=lambda pid, challenge, solution: received.setdefault(pid, solution))
+    assert list(dataset) == kept
+    for puzzle_id in kept:
+        assert dataset[puzzle_id] == solutions[puzzle_id]
+
+
+def test_cache_and_pickle(consolidated):
+    dataset = ArcDataset(_challenges_path(consolidated), cache_size=2)
+    ids = list(dataset)
+    for puzzle_id in ids[:3] + ids[2:3]:
+        dataset[puzzle_id]
+    stats = dataset.stats()
+    assert (stats['misses'], stats['hits'], stats['cached']) == (3, 1, 2)
+
+    copy = pickle.loads(pickle.dumps(dataset))
+    assert list(copy) == ids
+    assert copy.stats()['cached'] == 0
+    assert puzzle_content_hash(copy[ids[0]]) == puzzle_content_hash(dataset[ids[0]])
+
+
+def test_chained_dataset(consolidated):
+    training = ArcDataset(_challenges_path(consolidated, 'training'))
+    evaluation = ArcDataset(_challenges_path(consolidated, 'evaluation'))
+    chained = ChainedDataset([training, evaluation])
+    assert list(chained) == list(training) + list(evaluation)
+    puzzle_id = list(evaluation)[0]
+    assert chained[puzzle_id] is evaluation[puzzle_id]
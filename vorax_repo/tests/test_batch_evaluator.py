@@ -0,0 +1,45 @@
+"""Matrice de correspondance groupée : mêmes taux que la boucle par transformation d'origine."""
+import numpy as np
+import pytest
+
+from analysis_memo import AnalysisMemo
+from batch_evaluator import evaluate_transformations
+
+
+@pytest.fixture
+def fresh_model():
+    from vorax import HybridVoraxModelV3
+    return HybridVoraxModelV3(memo=AnalysisMemo())
+
+
+def _naive_rates(registry, train):
+    """Boucle d'origine : chaque transformation appliquée à chaque paire, une à une."""
+    rates = {}
+    for name, func in registry.items():
+        matches = 0
+        for example in train:
+            try:
+                result = func(np.array(example['input']))
+                matches += result is not None and np.array_equal(result, np.array(example['output']))
+            except Exception:
+                pass
+        rates[name] = matches / len(train)
+    return rates
+
+
+def test_match_matrix_equals_naive_loop(fresh_model, corpus):
+    for puzzle in corpus.values():
+        registry = fresh_model._bound_registry(puzzle)
+        rates = fresh_model._test_transformations(puzzle).rates()
+        assert rates == pytest.approx(_naive_rates(registry, puzzle['train']))
+
+
+def test_puzzle_without_train_is_not_counted(fresh_model):
+    puzzle = {'train': [], 'test': [{'input': [[1, 2], [3, 4]]}]}
+    matrix = evaluate_transformations(fresh_model.transformation_registry, [])
+    assert matrix.rates() == {} and matrix.best()[1] == 0.0
+
+    fresh_model.analyze_puzzle('vide', puzzle)
+    assert all(stats['attempts'] == 0 for stats in fresh_model.success_rates.values())
+    assert 'vide' not in fresh_model.transformations
+    assert fresh_model.contributions['vide']['attempted'] == ()
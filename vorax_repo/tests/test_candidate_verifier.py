@@ -0,0 +1,59 @@
+"""Vérification groupée des candidats : mêmes programmes retenus que la validation exemple par exemple."""
+import numpy as np
+
+from candidate_verifier import buffer_digest, group_train_outputs, verify_programs
+from synthetic_arc import model_registry
+
+
+def _naive_verified(registry, puzzle):
+    """Validation d'origine : chaque transformation comparée sur toutes les paires."""
+    verified = []
+    for name, func in registry.items():
+        try:
+            if all(np.array_equal(np.asarray(func(np.asarray(ex['input']))), np.asarray(ex['output']))
+                   for ex in puzzle['train']):
+                verified.append(name)
+        except Exception:
+            pass
+    return verified
+
+
+def test_matches_naive_validation(model, corpus):
+    registry = model_registry(model)
+    found = 0
+    for puzzle in corpus.values():
+        verified = verify_programs(registry, puzzle)
+        assert verified == _naive_verified(registry, puzzle)
+        found += bool(verified)
+    assert found > 0
+    assert verify_programs(list(registry.items()), next(iter(corpus.values()))) == \
+        verify_programs(registry, next(iter(corpus.values())))
+
+
+def test_rejected_candidates_are_not_run_again():
+    calls = {'identity': 0, 'zeros': 0}
+
+    def _counted(name, func):
+        def _run(grid):
+            calls[name] += 1
+            return func(grid)
+        return _run
+
+    puzzle = {'train': [{'input': [[1, 2]], 'output': [[1, 2]]}, {'input': [[3]], 'output': [[3]]},
+                        {'input': [[4, 5, 6]], 'output': [[4, 5, 6]]}]}
+    programs = {'identity': _counted('identity', lambda g: g), 'zeros': _counted('zeros', np.zeros_like)}
+    assert verify_programs(programs, puzzle) == ['identity']
+    assert calls == {'identity': 3, 'zeros': 1}  # la plus petite sortie est vérifiée en premier
+
+
+def test_digest_collisions_are_confirmed_elementwise():
+    # 256 et 0 ont les mêmes octets uint8 : l'empreinte seule ne suffit pas
+    assert buffer_digest(np.array([[256]])) == buffer_digest(np.array([[0]]))
+    puzzle = {'train': [{'input': [[0]], 'output': [[0]]}]}
+    assert verify_programs({'plus_256': lambda g: g + 256, 'identity': lambda g: g}, puzzle) == ['identity']
+
+
+def test_incomplete_or_empty_train():
+    assert group_train_outputs([{'input': [[1]]}]) is None
+    assert verify_programs({'identity': lambda g: g}, {'train': [{'input': [[1]]}]}) == []
+    assert verify_programs({'identity': lambda g: g}, {'train': []}) == []
@@ -0,0 +1,68 @@
+"""Table de couleurs inférée en forme close contre la recherche des échanges deux à deux."""
+import itertools
+
+import numpy as np
+
+from color_lut import apply_color_lut, infer_color_lut
+
+
+def _pair(grid, mapping):
+    grid = np.asarray(grid)
+    output = grid.copy()
+    for old, new in mapping.items():
+        output[grid == old] = new
+    return {'input': grid.tolist(), 'output': output.tolist()}
+
+
+def _brute_force_swaps(train_examples):
+    """Ancienne recherche : échanges old -> new qui reproduisent toutes les paires."""
+    found = []
+    for old, new in itertools.permutations(range(10), 2):
+        if all(np.array_equal(np.where(np.asarray(ex['input']) == old, new, ex['input']), ex['output'])
+               for ex in train_examples):
+            found.append((old, new))
+    return found
+
+
+def test_lut_agrees_with_single_swaps():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        old, new = (int(c) for c in rng.choice(10, size=2, replace=False))
+        grids = [rng.integers(0, 10, size=(3, 4)) for _ in range(2)]
+        grids[0][0, 0] = old
+        train = [_pair(grid, {old: new}) for grid in grids]
+        assert (old, new) in _brute_force_swaps(train)
+        lut = infer_color_lut(train)
+        assert lut[old] == new
+        for example in train:
+            assert np.array_equal(apply_color_lut(lut, example['input']), example['output'])
+
+
+def test_permutations_out_of_reach_of_swaps():
+    # Cycle de trois couleurs : aucun échange unique ne suffit
+    mapping = {1: 2, 2: 3, 3: 1}
+    train = [_pair([[1, 2, 3], [0, 1, 2]], mapping), _pair([[3, 3], [2, 0]], mapping)]
+    assert _brute_force_swaps(train) == []
+    lut = infer_color_lut(train)
+    assert lut.tolist() == [0, 2, 3, 1, 4, 5, 6, 7, 8, 9]
+    assert apply_color_lut(lut, np.array([[[1, 9]], [[3, 0]]])).tolist() == [[[2, 9]], [[1, 0]]]
+    assert not lut.flags.writeable
+
+
+def test_inconsistent_pairs_have_no_lut():
+    # Une couleur d'entrée vers deux couleurs de sortie
+    assert infer_color_lut([{'input': [[1, 1]], 'output': [[2, 3]]}]) is None
+    assert infer_color_lut([_pair([[1]], {1: 2}), _pair([[1]], {1: 3})]) is None
+    # Changement de forme, valeurs hors format, aucun exemple complet
+    assert infer_color_lut([{'input': [[1, 1]], 'output': [[1], [1]]}]) is None
+    assert infer_color_lut([{'input': [[12]], 'output': [[1]]}]) is None
+    assert infer_color_lut([{'input': [[1]]}]) is None
+
+
+def test_model_binds_lut_per_puzzle(model):
+    puzzle = {'train': [_pair([[1, 2], [2, 0]], {1: 5, 2: 6})], 'test': [{'input': [[2, 1]]}]}
+    registry = model._bound_registry(puzzle)
+    assert registry['color_lut']([[2, 1]]).tolist() == [[6, 5]]
+    # Sans table cohérente, la transformation reste non liée
+    unbound = model._bound_registry({'train': [{'input': [[1, 1]], 'output': [[2, 3]]}]})
+    assert unbound['color_lut'] == model._unbound_transform
@@ -0,0 +1,82 @@
+"""Chargement des répertoires un-fichier-par-puzzle : lecture parallèle et instantané à clé de mtime."""
+import json
+import os
+import runpy
+
+import numpy as np
+import pytest
+
+from synthetic_arc import model_registry, write_dataset
+
+LOADER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils', 'data_loader.py')
+
+
+@pytest.fixture(scope='module')
+def dataset(model, tmp_path_factory):
+    """12 puzzles synthétiques écrits dans les deux dispositions."""
+    root = tmp_path_factory.mktemp('arc')
+    write_dataset(model_registry(model), str(root), 12, seed=3, layout='both')
+    return root
+
+
+@pytest.fixture
+def loader(dataset):
+    """Globales de utils/data_loader.py, exécuté comme dans le notebook (input_dir défini avant la cellule)."""
+    namespace = runpy.run_path(LOADER_PATH, init_globals={'input_dir': str(dataset / 'files')})
+    # Espace de noms réellement lu par les fonctions (run_path en retourne une copie)
+    return namespace['load_arc_data'].__globals__
+
+
+def _grids(puzzles):
+    return [(p['id'], [[np.asarray(ex[key]).tolist() for key in ('input', 'output')] for ex in p['train']])
+            for p in puzzles]
+
+
+def test_directory_layout_matches_files_and_consolidated_layout(dataset, loader):
+    files_dir = dataset / 'files'
+    for source, loaded in (('training', loader['train_data']), ('evaluation', loader['test_data'])):
+        names = sorted(os.listdir(files_dir / source))
+        assert [p['id'] for p in loaded] == [name[:-len('.json')] for name in names]
+        for puzzle, name in zip(loaded, names):
+            with open(files_dir / source / name) as f:
+                raw = json.load(f)
+            assert [np.asarray(ex['output']).tolist() for ex in puzzle['train']] == \
+                [ex['output'] for ex in raw['train']]
+
+    train, test = loader['load_arc_data'](str(dataset / 'consolidated'))
+    assert sorted(_grids(train)) == sorted(_grids(loader['train_data']))
+    assert sorted(_grids(test)) == sorted(_grids(loader['test_data']))
+
+
+def test_no_snapshot_is_written_without_cache_path(dataset, loader):
+    assert loader['DIRECTORY_CACHE_NAME'] not in os.listdir(dataset / 'files')
+
+
+def test_snapshot_is_reused_until_a_file_changes(dataset, loader, tmp_path):
+    files_dir = str(dataset / 'files')
+    cache_path = str(tmp_path / loader['DIRECTORY_CACHE_NAME'])
+    first = loader['load_arc_data'](files_dir, cache_path=cache_path)
+    assert os.path.exists(cache_path)
+
+    # Instantané valide : aucun fichier de puzzle n'est relu
+    executor = loader['ThreadPoolExecutor']
+    loader['ThreadPoolExecutor'] = None
+    assert _grids(loader['load_arc_data'](files_dir, cache_path=cache_path)[0]) == _grids(first[0])
+
+    # Un fichier modifié (taille et mtime) invalide l'instantané
+    path = os.path.join(files_dir, 'training', sorted(os.listdir(os.path.join(files_dir, 'training')))[0])
+    with open(path) as f:
+        puzzle = json.load(f)
+    original = json.dumps(puzzle)
+    puzzle['train'][0]['output'] = [[7]]
+    try:
+        with open(path, 'w') as f:
+            json.dump(puzzle, f)
+        with pytest.raises(TypeError):
+            loader['load_arc_data'](files_dir, cache_path=cache_path)
+        loader['ThreadPoolExecutor'] = executor
+        reloaded = loader['load_arc_data'](files_dir, cache_path=cache_path)[0]
+        assert np.asarray(reloaded[0]['train'][0]['output']).tolist() == [[7]]
+    finally:
+        with open(path, 'w') as f:
+            f.write(original)
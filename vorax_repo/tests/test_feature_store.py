@@ -0,0 +1,60 @@
+"""Magasin de caractéristiques en colonnes contre analyze_puzzle / estimate_puzzle_difficulty."""
+import numpy as np
+import pytest
+
+from analysis_memo import puzzle_content_hash
+from arc_grid import ArcGrid, as_arc_puzzle
+from feature_store import _row_entropy, build_feature_store, load_or_build_feature_store
+from vorax.analysis import _extract_puzzle_features, estimate_puzzle_difficulty
+
+
+@pytest.fixture(scope='module')
+def puzzles(corpus):
+    puzzles = {puzzle_id: as_arc_puzzle(puzzle) for puzzle_id, puzzle in corpus.items()}
+    # Cas limites : aucun exemple d'entraînement, test unique (dict)
+    puzzles['no_train'] = as_arc_puzzle({'train': [], 'test': [{'input': [[1]]}]})
+    first = next(iter(corpus.values()))
+    puzzles['single_test'] = as_arc_puzzle({'train': first['train'], 'test': first['test'][0]})
+    return puzzles
+
+
+def _assert_features_close(expected, actual, puzzle_id):
+    assert set(actual) == set(expected), puzzle_id
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert actual[key] == pytest.approx(value, rel=1e-12, abs=1e-12), (puzzle_id, key)
+        else:
+            assert actual[key] == value, (puzzle_id, key)
+
+
+def test_row_entropy_matches_grid_entropy():
+    rng = np.random.default_rng(0)
+    grids = [rng.integers(0, n_colors, size=(h, w)) for n_colors, h, w in
+             [(1, 3, 3), (2, 1, 5), (10, 30, 30), (7, 4, 9), (10, 2, 2)]]
+    histograms = np.array([np.bincount(grid.ravel(), minlength=10) for grid in grids])
+    sizes = np.array([grid.size for grid in grids])
+    entropy = _row_entropy(histograms, sizes)
+    np.testing.assert_allclose(entropy, [ArcGrid(grid).entropy for grid in grids], rtol=1e-12, atol=1e-12)
+    assert _row_entropy(np.zeros((1, 10), dtype=np.int64), np.array([0]))[0] == 0.0
+
+
+def test_store_features_match_analyze_puzzle(puzzles):
+    store = build_feature_store(puzzles)
+    for puzzle_id, puzzle in puzzles.items():
+        expected = _extract_puzzle_features(puzzle)
+        _assert_features_close(expected, store.features(puzzle_id), puzzle_id)
+        assert store.difficulty(puzzle_id) == pytest.approx(estimate_puzzle_difficulty(expected), rel=1e-12)
+
+
+def test_store_is_reloaded_until_content_changes(puzzles, tmp_path):
+    path = str(tmp_path / 'features.npz')
+    built = load_or_build_feature_store(puzzles, path)
+    reloaded = load_or_build_feature_store(puzzles, path)
+    assert reloaded.puzzle_ids == built.puzzle_ids
+    np.testing.assert_array_equal(reloaded['difficulty'], built['difficulty'])
+
+    changed = dict(puzzles)
+    changed['no_train'] = as_arc_puzzle({'train': [], 'test': [{'input': [[2]]}]})
+    rebuilt = load_or_build_feature_store(changed, path)
+    assert rebuilt.find(puzzle_content_hash(puzzles['no_train'])) is None
+    assert rebuilt.find(puzzle_content_hash(changed['no_train'])) == 'no_train'
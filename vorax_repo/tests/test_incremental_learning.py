@@ -0,0 +1,70 @@
+"""Apprentissage incrémental : retrait et ajout de puzzles équivalents à un réapprentissage complet."""
+import pytest
+
+from analysis_memo import AnalysisMemo, puzzle_content_hash
+from incremental_learning import plan_update, puzzle_contribution, retract_puzzle
+from synthetic_arc import generate_corpus, model_registry
+
+
+def _learn(puzzles, model=None):
+    if model is None:
+        from vorax import HybridVoraxModelV3
+        model = HybridVoraxModelV3(memo=AnalysisMemo())
+    model.learn_from_dataset(puzzles, n_workers=1)
+    return model
+
+
+def _updated_corpus(model, corpus):
+    """Jeu modifié : 5 puzzles retirés, 5 modifiés, 5 ajoutés."""
+    extra = list(generate_corpus(model_registry(model), 10, seed=1).values())
+    ids = list(corpus)
+    updated = {puzzle_id: corpus[puzzle_id] for puzzle_id in ids[5:]}
+    for puzzle_id, puzzle in zip(ids[5:10], extra[:5]):
+        updated[puzzle_id] = puzzle
+    for i, puzzle in enumerate(extra[5:]):
+        updated[f'ajout_{i}'] = puzzle
+    return updated
+
+
+def test_plan_update_classifies_puzzles(model, corpus):
+    updated = _updated_corpus(model, corpus)
+    hashes = {puzzle_id: puzzle_content_hash(puzzle) for puzzle_id, puzzle in corpus.items()}
+    plan = plan_update(hashes, updated, list(updated))
+    ids = list(corpus)
+    assert plan['removed'] == ids[:5]
+    assert plan['changed'] == ids[5:10]
+    assert plan['added'] == [f'ajout_{i}' for i in range(5)]
+    assert plan['unchanged'] == ids[10:]
+
+
+def test_incremental_update_matches_full_relearn(model, corpus):
+    updated = _updated_corpus(model, corpus)
+    incremental = _learn(updated, _learn(corpus))
+    full = _learn(updated)
+
+    for name in ('transformations', 'success_rates', 'content_hashes', 'contributions', 'difficulty_estimates'):
+        assert getattr(incremental, name) == getattr(full, name), name
+    assert set(incremental.processing_times) == set(full.processing_times)
+    # Les exemples d'un type sont dans l'ordre d'apprentissage : seuls leurs ensembles sont comparés
+    assert set(incremental.puzzle_types) == set(full.puzzle_types)
+    for ptype, data in full.puzzle_types.items():
+        other = incremental.puzzle_types[ptype]
+        assert set(other['examples']) == set(data['examples'])
+        assert other['transformations'] == data['transformations']
+        assert other['difficulty_sum'] == pytest.approx(data['difficulty_sum'])
+
+
+def test_retracting_every_puzzle_empties_the_model(corpus):
+    model = _learn(corpus)
+    for puzzle_id in list(corpus):
+        retract_puzzle(model, puzzle_id)
+    assert not (model.transformations or model.puzzle_types or model.contributions or model.content_hashes
+                or model.difficulty_estimates or model.processing_times)
+    assert all(stats == {'successes': 0, 'attempts': 0, 'rate': 0.0} for stats in model.success_rates.values())
+
+
+def test_puzzle_contribution_keeps_type_only_when_solved():
+    rates = {'identity': 1.0, 'rotate_90': 0.5}
+    assert puzzle_contribution(rates, 0.8, 'geometric') == {
+        'attempted': ('identity', 'rotate_90'), 'succeeded': ('identity',), 'type': 'geometric'}
+    assert puzzle_contribution({}, 0.8)['type'] is None
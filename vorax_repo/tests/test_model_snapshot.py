@@ -0,0 +1,76 @@
+"""Instantané du modèle : aller-retour .npz, version du code et choix de l'emplacement."""
+import pytest
+
+from analysis_memo import AnalysisMemo
+from model_snapshot import (code_version, dataset_content_hash, find_snapshot, load_snapshot, read_manifest,
+                            save_snapshot, snapshot_matches)
+
+LEARNED_STATE = ('transformations', 'success_rates', 'puzzle_types', 'difficulty_estimates', 'processing_times',
+                 'content_hashes', 'contributions')
+
+
+def _fresh_model():
+    from vorax import HybridVoraxModelV3
+    return HybridVoraxModelV3(memo=AnalysisMemo())
+
+
+@pytest.fixture(scope='module')
+def trained(corpus):
+    model = _fresh_model()
+    model.learn_from_dataset(corpus, n_workers=1)
+    return model
+
+
+def test_round_trip_restores_learned_state(trained, corpus, tmp_path):
+    path = str(tmp_path / 'snapshot.npz')
+    manifest = save_snapshot(trained, path, dataset_content_hash(corpus))
+    assert read_manifest(path) == manifest
+    assert manifest['puzzles_processed'] == len(corpus)
+
+    restored = _fresh_model()
+    load_snapshot(restored, path)
+    for name in LEARNED_STATE:
+        assert getattr(restored, name) == getattr(trained, name), name
+
+
+def test_snapshot_matches_code_and_dataset(trained, corpus, tmp_path, monkeypatch):
+    path = str(tmp_path / 'snapshot.npz')
+    dataset_hash = dataset_content_hash(corpus)
+    save_snapshot(trained, path, dataset_hash)
+    model = _fresh_model()
+    assert snapshot_matches(path, model) and snapshot_matches(path, model, dataset_hash)
+    assert not snapshot_matches(path, model, dataset_content_hash(corpus, list(corpus)[:10]))
+    assert not snapshot_matches(str(tmp_path / 'absent.npz'), model)
+
+    # Un paramètre d'apprentissage différent change la version du code
+    from vorax import Config
+    version = code_version(model)
+    monkeypatch.setattr(Config, 'PERFORMANCE_THRESHOLD', Config.PERFORMANCE_THRESHOLD / 2)
+    assert code_version(model) != version and not snapshot_matches(path, model)
+    monkeypatch.undo()
+
+    # Tout comme un changement de SNAPSHOT_VERSION
+    monkeypatch.setattr('model_snapshot.SNAPSHOT_VERSION', -1)
+    assert not snapshot_matches(path, model)
+
+
+def test_dataset_hash_depends_on_order_and_content(corpus):
+    ids = list(corpus)
+    assert dataset_content_hash(corpus) == dataset_content_hash(corpus, ids)
+    assert dataset_content_hash(corpus, ids[::-1]) != dataset_content_hash(corpus, ids)
+    changed = dict(corpus)
+    changed[ids[0]] = dict(corpus[ids[0]], test=[{'input': [[9]]}])
+    assert dataset_content_hash(changed) != dataset_content_hash(corpus)
+
+
+def test_find_snapshot_prefers_same_dataset(trained, corpus, tmp_path):
+    dataset_hash = dataset_content_hash(corpus)
+    working, previous = str(tmp_path / 'working.npz'), str(tmp_path / 'input.npz')
+    save_snapshot(trained, working, 'autre-jeu')
+    save_snapshot(trained, previous, dataset_hash)
+    model = _fresh_model()
+
+    assert find_snapshot([working, previous], model, dataset_hash) == previous
+    assert find_snapshot([working, previous], model, 'inconnu') == working
+    assert find_snapshot([str(tmp_path / 'absent.npz'), previous], model) == previous
+    assert find_snapshot([str(tmp_path / 'absent.npz')], model) is None
@@ -0,0 +1,75 @@
+"""Classement par plus proches voisins : transformations réellement évaluées par résolution."""
+import pytest
+
+from analysis_memo import AnalysisMemo
+from batch_evaluator import evaluate_transformations
+
+
+def _fresh_model():
+    from vorax import HybridVoraxModelV3
+    return HybridVoraxModelV3(memo=AnalysisMemo())
+
+
+@pytest.fixture(scope='module')
+def trained(corpus):
+    """Modèle entraîné sur le corpus, avec son index des voisins."""
+    model = _fresh_model()
+    model.learn_from_dataset(corpus, n_workers=1)
+    model.build_neighbor_index(corpus)
+    return model
+
+
+def _variant(puzzle):
+    """Même puzzle avec une autre entrée de test (contenu différent, mêmes paires)."""
+    return dict(puzzle, test=[{'input': [[1, 2], [3, 4]]}])
+
+
+def _candidate_rows(model, train):
+    """Lignes du registre retenues par l'index de formes pour les dimensions des paires."""
+    rows = set()
+    for example in train:
+        input_shape = (len(example['input']), len(example['input'][0]))
+        output_shape = (len(example['output']), len(example['output'][0]))
+        rows.update(model.shape_index.candidates(input_shape, output_shape))
+    return rows
+
+
+def test_executed_excludes_pruned_and_memoized(model, corpus):
+    registry = model._bound_registry(next(iter(corpus.values())))
+    for puzzle in list(corpus.values())[:10]:
+        train = puzzle['train']
+        full = {}
+        evaluate_transformations(registry, train, stats=full)
+        assert full['executed'] == len(registry)
+
+        memo = AnalysisMemo()
+        pruned = {}
+        first = evaluate_transformations(registry, train, memo=memo, shape_index=model.shape_index, stats=pruned)
+        assert pruned['executed'] == len(_candidate_rows(model, train))
+
+        # Résultats grille par grille relus dans le mémo : seules les versions empilées s'exécutent
+        again = {}
+        second = evaluate_transformations(registry, train, memo=memo, shape_index=model.shape_index,
+                                          stack_transforms=model.stack_registry, stats=again)
+        assert again['executed'] <= len(model.stack_registry)
+        assert second.consistent() == first.consistent()
+
+
+def test_memoized_matrix_counts_nothing(corpus):
+    model = _fresh_model()
+    puzzle = next(iter(corpus.values()))
+    stats = {}
+    model._test_transformations(puzzle, stats)
+    assert 0 < stats['executed'] <= len(model.transformation_registry)
+    model._test_transformations(puzzle, stats)
+    assert stats['executed'] == 0
+
+
+def test_neighbors_reduce_evaluated_transforms(trained, corpus):
+    from vorax import Config
+    solved = [puzzle_id for puzzle_id in corpus if puzzle_id in trained.transformations][:10]
+    assert solved
+    for puzzle_id in solved:
+        trained.predict(puzzle_id + '_variant', _variant(corpus[puzzle_id]), n_attempts=1)
+        # Le programme d'un voisin suffit : seuls les programmes des voisins sont vérifiés
+        assert 1 <= trained.transforms_evaluated[puzzle_id + '_variant'] <= Config.NEIGHBOR_K
@@ -0,0 +1,41 @@
+"""Apprentissage map/reduce : même état appris qu'un passage séquentiel, modèle du worker réutilisé."""
+import parallel_learning
+from analysis_memo import AnalysisMemo
+from parallel_learning import shard_ids
+
+LEARNED_STATE = ('transformations', 'success_rates', 'puzzle_types', 'difficulty_estimates', 'content_hashes',
+                 'contributions')
+
+
+def _learn(corpus, n_workers):
+    from vorax import HybridVoraxModelV3
+    model = HybridVoraxModelV3(memo=AnalysisMemo())
+    model.learn_from_dataset(corpus, n_workers=n_workers)
+    return model
+
+
+def test_parallel_learning_matches_sequential(corpus, monkeypatch):
+    from vorax import Config
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', 7)  # plusieurs lots par worker
+    sequential = _learn(corpus, 1)
+    parallel = _learn(corpus, 2)
+    for name in LEARNED_STATE:
+        assert getattr(parallel, name) == getattr(sequential, name), name
+    assert list(parallel.processing_times) == list(sequential.processing_times)
+
+
+def test_worker_model_is_built_once_and_reset_per_shard(corpus, monkeypatch):
+    from vorax import HybridVoraxModelV3
+    monkeypatch.setattr(parallel_learning, '_WORKER_STATE', {})
+    parallel_learning._init_worker(HybridVoraxModelV3, corpus)
+    model = parallel_learning._WORKER_STATE['model']
+    assert model.sampler.interval is None and model.sampler._thread is None
+
+    first, second = shard_ids(list(corpus), 20)
+    parallel_learning._analyze_shard(first)
+    partial = parallel_learning._analyze_shard(second)
+    assert parallel_learning._WORKER_STATE['model'] is model
+    # Le second lot ne garde rien du premier
+    assert set(partial['processing_times']) == set(second)
+    assert sum(stats['attempts'] for stats in partial['success_rates'].values()) == sum(
+        len(contribution['attempted']) for contribution in partial['contributions'].values())
@@ -0,0 +1,49 @@
+"""Statistiques de motifs k x k : mêmes dictionnaires (clés, comptes, ordre) que les boucles d'origine."""
+import numpy as np
+import pytest
+
+from patch_stats import patch_counts, patch_counts_batch
+from pattern_detector import PatternDetector
+from transformations import pattern_extraction
+
+
+def _loop_counts(grid, k):
+    """Boucle d'origine : fenêtres parcourues ligne par ligne."""
+    h, w = grid.shape
+    patterns = {}
+    for i in range(h - k + 1):
+        for j in range(w - k + 1):
+            key = grid[i:i + k, j:j + k].tobytes()
+            patterns[key] = patterns.get(key, 0) + 1
+    return patterns
+
+
+def _grids(dtype, low=0, high=4):
+    rng = np.random.default_rng(0)
+    shapes = [(1, 1), (2, 5), (5, 5), (7, 3), (30, 30)]
+    return [rng.integers(low, high, size=shape).astype(dtype) for shape in shapes]
+
+
+@pytest.mark.parametrize('k', [1, 2, 3, 5])
+@pytest.mark.parametrize('dtype,low,high', [
+    (np.uint8, 0, 4), (np.int64, 0, 10), (np.int32, -3, 3), (np.float64, 0, 3), (np.int64, 0, 2**40),
+])
+def test_patch_counts_match_loops(k, dtype, low, high):
+    grids = _grids(dtype, low, high)
+    expected = [_loop_counts(grid, k) for grid in grids]
+    for grid, counts in zip(grids, expected):
+        assert list(patch_counts(grid, k).items()) == list(counts.items())
+    assert [list(c.items()) for c in patch_counts_batch(grids, k)] == [list(c.items()) for c in expected]
+
+
+def test_mixed_dtypes_and_empty_batches():
+    grids = [np.eye(3, dtype=np.uint8), np.eye(4, dtype=np.int64), np.zeros((1, 4), dtype=np.int64)]
+    assert patch_counts_batch(grids, 2) == [_loop_counts(grid, 2) for grid in grids]
+    assert patch_counts_batch([np.zeros((1, 1))], 3) == [{}]
+
+
+def test_callers_keep_their_original_windows():
+    grid = np.random.default_rng(1).integers(0, 3, size=(6, 8))
+    assert PatternDetector().analyze_grid(grid) == _loop_counts(grid, 3)
+    assert PatternDetector().analyze_grids([grid, grid.T]) == [_loop_counts(grid, 3), _loop_counts(grid.T, 3)]
+    assert pattern_extraction(grid) == _loop_counts(grid, 2)
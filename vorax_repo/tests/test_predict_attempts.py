@@ -0,0 +1,63 @@
+"""Prédiction ARC Prize : n essais par entrée de test, programmes classés une seule fois."""
+import numpy as np
+import pytest
+
+from analysis_memo import AnalysisMemo
+from program_search import apply_program
+
+
+@pytest.fixture
+def fresh_model():
+    from vorax import HybridVoraxModelV3
+    return HybridVoraxModelV3(memo=AnalysisMemo())
+
+
+def _puzzle(model, program, train_shapes, test_shapes, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def _example(shape):
+        grid = rng.integers(0, 5, size=shape)
+        return {'input': grid.tolist(), 'output': apply_program(model.transformation_registry, program, grid).tolist()}
+
+    return {'train': [_example(shape) for shape in train_shapes], 'test': [_example(shape) for shape in test_shapes]}
+
+
+def test_every_test_input_gets_n_attempts(fresh_model):
+    puzzle = _puzzle(fresh_model, ('flip_horizontal',), [(3, 4), (4, 4), (2, 5)], [(3, 4), (5, 2), (3, 4)])
+    prediction = fresh_model.predict('p', puzzle, n_attempts=2)
+    assert len(prediction) == 3
+    for entry, example in zip(prediction, puzzle['test']):
+        assert set(entry) == {'attempt_1', 'attempt_2'}
+        assert entry['attempt_1'] == example['output']
+        assert isinstance(entry['attempt_2'], list)
+    assert fresh_model.transforms_evaluated['p'] >= 1 and not fresh_model.interrupted['p']
+
+    assert [set(entry) for entry in fresh_model.predict('p', puzzle, n_attempts=3)] == \
+        [{'attempt_1', 'attempt_2', 'attempt_3'}] * 3
+
+
+def test_second_attempt_uses_the_next_consistent_program(fresh_model):
+    # Entrées symétriques gauche-droite : flip_vertical et rotate_180 reproduisent tous les exemples
+    rng = np.random.default_rng(4)
+    train = []
+    for shape in [(3, 2), (4, 3)]:
+        half = rng.integers(0, 5, size=shape)
+        grid = np.hstack([half, half[:, ::-1]])
+        train.append({'input': grid.tolist(), 'output': np.flipud(grid).tolist()})
+    test_grid = np.arange(12).reshape(3, 4) % 7
+    puzzle = {'train': train, 'test': [{'input': test_grid.tolist()}]}
+
+    prediction = fresh_model.predict('q', puzzle, n_attempts=2)
+    assert prediction == [{'attempt_1': np.flipud(test_grid).tolist(), 'attempt_2': np.rot90(test_grid, 2).tolist()}]
+
+
+def test_solve_returns_first_attempt_of_first_test(fresh_model):
+    puzzle = _puzzle(fresh_model, ('rotate_180',), [(3, 3), (2, 4)], [(4, 2), (3, 3)], seed=5)
+    expected = fresh_model.predict('r', puzzle, n_attempts=2)[0]['attempt_1']
+    assert np.asarray(fresh_model.solve('r', puzzle)).tolist() == expected == puzzle['test'][0]['output']
+
+
+def test_puzzle_without_test_input(fresh_model):
+    assert fresh_model.predict('s', {'train': [], 'test': []}, n_attempts=2) == [{'attempt_1': [[0]],
+                                                                                   'attempt_2': [[0]]}]
+    assert fresh_model.solve('s', {'train': [], 'test': []}) == [[0]]
@@ -0,0 +1,68 @@
+"""Recherche de programmes : plus courte composition cohérente, états partagés et arrêt sur budget."""
+import numpy as np
+
+from program_search import GridTable, apply_program, apply_program_batch, search_program
+from time_budget import BudgetToken
+
+
+def _pairs(model, program, shapes, seed=0):
+    rng = np.random.default_rng(seed)
+    inputs = [rng.integers(0, 4, size=shape) for shape in shapes]
+    return [{'input': grid.tolist(), 'output': apply_program(model.transformation_registry, program, grid).tolist()}
+            for grid in inputs]
+
+
+def test_finds_shortest_consistent_program(model):
+    train = _pairs(model, ('flip_horizontal', 'expand_2x'), [(2, 3), (3, 3)])
+    program, stats = search_program(model.transformation_registry, train, max_depth=3,
+                                    shape_functions=model.shape_registry)
+    assert len(program) == 2 and stats['depth'] == 2 and not stats['timeout']
+    for example in train:
+        assert np.array_equal(apply_program(model.transformation_registry, program, example['input']),
+                              example['output'])
+
+
+def test_equivalent_prefixes_are_explored_once(model):
+    train = _pairs(model, ('rotate_90', 'expand_3x', 'flip_vertical'), [(2, 2), (2, 3)], seed=1)
+    program, stats = search_program(model.transformation_registry, train, max_depth=3,
+                                    shape_functions=model.shape_registry)
+    assert program == ('expand_3x', 'flip_and_rotate')  # plus court que le programme générateur
+    assert stats['duplicates'] > 0  # rotate_90∘rotate_90 et rotate_180, etc.
+    assert stats['applications'] <= stats['grids'] * len(model.transformation_registry)
+
+
+def test_compiled_search_agrees_with_registry(model):
+    train = _pairs(model, ('rotate_180', 'invert_colors'), [(3, 4), (2, 2)], seed=2)
+    plain, _ = search_program(model.transformation_registry, train, shape_functions=model.shape_registry)
+    compiled, _ = search_program(model.transformation_registry, train, shape_functions=model.shape_registry,
+                                 compiler=model.compiler)
+    assert plain == compiled
+    grids = [np.arange(6).reshape(2, 3) % 2, np.ones((2, 3), dtype=int), np.eye(3, dtype=int)]
+    for expected, result in zip([apply_program(model.transformation_registry, plain, g) for g in grids],
+                                apply_program_batch(model.transformation_registry, plain, grids, model.compiler)):
+        assert np.array_equal(expected, result)
+
+
+def test_stops_when_budget_or_token_expires(model):
+    train = _pairs(model, ('flip_horizontal', 'expand_2x'), [(2, 3)])
+    token = BudgetToken()
+    token.cancel()
+    program, stats = search_program(model.transformation_registry, train, token=token)
+    assert program is None and stats['timeout']
+    program, stats = search_program(model.transformation_registry, train, time_budget=0.0)
+    assert program is None and stats['timeout']
+
+
+def test_grid_table_interns_and_memoizes():
+    table = GridTable()
+    a = table.intern([[1, 2], [3, 4]])
+    assert table.intern(np.array([[1, 2], [3, 4]])) == a and len(table) == 1
+    calls = []
+
+    def _flip(grid):
+        calls.append(1)
+        return np.fliplr(grid)
+
+    b = table.apply(a, 'flip', _flip)
+    assert table.apply(a, 'flip', _flip) == b and len(calls) == 1
+    assert np.array_equal(table.grids[b], [[2, 1], [4, 3]])
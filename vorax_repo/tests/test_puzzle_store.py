@@ -0,0 +1,91 @@
+"""Aller-retour JSON -> magasin binaire -> puzzles, pour les deux dispositions ARC."""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from analysis_memo import puzzle_content_hash
+from arc_dataset import ArcDataset
+from puzzle_store import PuzzleStore, iter_arc_puzzles, open_puzzle_store
+from synthetic_arc import model_registry, write_dataset
+
+
+@pytest.fixture(scope='module')
+def data_dir(model, tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('arc'))
+    write_dataset(model_registry(model), directory, 25, seed=2, layout='both')
+    return directory
+
+
+def _expected_puzzles(consolidated):
+    """{source: {identifiant: solutions}} lues directement dans les fichiers consolidés."""
+    expected = {}
+    for source in ('training', 'evaluation'):
+        with open(os.path.join(consolidated, f'arc-agi_{source}_challenges.json')) as f:
+            challenges = json.load(f)
+        with open(os.path.join(consolidated, f'arc-agi_{source}_solutions.json')) as f:
+            solutions = json.load(f)
+        expected[source] = {puzzle_id: solutions[puzzle_id] for puzzle_id in challenges}
+    return expected
+
+
+@pytest.mark.parametrize('layout', ['files', 'consolidated'])
+def test_round_trip(data_dir, layout, tmp_path):
+    expected = _expected_puzzles(os.path.join(data_dir, 'consolidated'))
+    store = open_puzzle_store(os.path.join(data_dir, layout), str(tmp_path / 'puzzles.bin'))
+    assert sorted(store) == sorted(pid for puzzles in expected.values() for pid in puzzles)
+    for source, puzzles in expected.items():
+        subset = store.select(source)
+        assert sorted(subset) == sorted(puzzles)
+        challenges = ArcDataset(os.path.join(data_dir, 'consolidated', f'arc-agi_{source}_challenges.json'))
+        for puzzle_id, solutions in puzzles.items():
+            puzzle = subset[puzzle_id]
+            # Défi seul, identique à celui d'ArcDataset (aucune sortie de test)
+            assert all('output' not in example for example in puzzle['test'])
+            assert puzzle_content_hash(puzzle) == puzzle_content_hash(challenges[puzzle_id])
+            assert [np.asarray(grid).tolist() for grid in subset.solutions(puzzle_id)] == solutions
+        challenges.close()
+
+
+def test_grids_are_read_only_views(data_dir, tmp_path):
+    store = open_puzzle_store(os.path.join(data_dir, 'files'), str(tmp_path / 'puzzles.bin'))
+    puzzle_id = next(iter(store))
+    grid = np.asarray(store[puzzle_id]['train'][0]['input'])
+    assert not grid.flags.writeable
+    with pytest.raises(ValueError):
+        grid[0, 0] = 1
+    assert store[puzzle_id] is store[puzzle_id]
+
+
+def test_store_is_reconverted_when_sources_change(data_dir, tmp_path):
+    source_dir = str(tmp_path / 'files')
+    os.makedirs(os.path.join(source_dir, 'training'))
+    names = sorted(os.listdir(os.path.join(data_dir, 'files', 'training')))[:3]
+    for name in names:
+        with open(os.path.join(data_dir, 'files', 'training', name)) as f:
+            content = f.read()
+        with open(os.path.join(source_dir, 'training', name), 'w') as f:
+            f.write(content)
+    store_path = str(tmp_path / 'puzzles.bin')
+
+    store = open_puzzle_store(source_dir, store_path)
+    assert len(store) == 3 and store.is_current(source_dir)
+    store.close()
+
+    os.remove(os.path.join(source_dir, 'training', names[0]))
+    assert not PuzzleStore(store_path).is_current(source_dir)
+    store = open_puzzle_store(source_dir, store_path)
+    assert sorted(store) == sorted(name[:-len('.json')] for name in names[1:])
+    store.close()
+
+
+def test_iter_arc_puzzles_strips_test_outputs(data_dir):
+    for layout in ('files', 'consolidated'):
+        entries = list(iter_arc_puzzles(os.path.join(data_dir, layout)))
+        assert entries and all(len(entry) == 3 for entry in entries)
+        assert all('output' not in example for _, _, challenge in entries for example in challenge['test'])
+
+        with_solutions = list(iter_arc_puzzles(os.path.join(data_dir, layout), with_solutions=True))
+        assert [entry[:3] for entry in with_solutions] == entries
+        assert all(len(solutions) == len(challenge['test']) for _, _, challenge, solutions in with_solutions)
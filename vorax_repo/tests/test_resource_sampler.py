@@ -0,0 +1,55 @@
+"""Échantillonneur de ressources : tampon circulaire, marques de phase et mode sans thread."""
+import time
+
+import pytest
+
+from resource_sampler import ResourceSampler, process_rss
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_background_thread_fills_ring_buffer():
+    sampler = ResourceSampler(interval=0.005, capacity=8)
+    with sampler:
+        assert sampler._thread is not None and sampler._thread.is_alive()
+        time.sleep(0.1)
+    assert sampler._thread is None
+    rows = sampler.samples()
+    assert len(rows) == 8  # les plus anciens ont été écrasés
+    assert (rows['time'][1:] >= rows['time'][:-1]).all()
+    assert rows['rss'].min() > 0
+
+
+def test_on_demand_sampler_has_no_thread():
+    sampler = ResourceSampler(interval=None).start()
+    assert sampler._thread is None and len(sampler.samples()) == 0
+    first = sampler.latest()
+    assert sampler.latest()['time'] >= first['time'] and len(sampler.samples()) == 2
+    assert first['rss'] == pytest.approx(process_rss(), rel=0.5)
+
+
+def test_phase_stats_use_mark_samples():
+    sampler = ResourceSampler(interval=None, capacity=2)
+    assert sampler.phase_stats('learn') is None
+
+    sampler.mark('learn')
+    _busy(0.05)
+    for _ in range(5):
+        sampler.sample()  # le tampon ne couvre plus le début de la phase
+    sampler.mark('submission')
+    time.sleep(0.02)
+
+    learn = sampler.phase_stats('learn')
+    assert learn['wall'] >= 0.05 and learn['cpu_time'] > 0.02
+    assert learn['cpu_percent'] == pytest.approx(learn['cpu_time'] / learn['wall'] * 100)
+    assert learn['rss_max'] >= max(learn['rss_start'], learn['rss_end'])
+    assert learn['rss_delta'] == learn['rss_end'] - learn['rss_start']
+    assert learn['samples'] <= 2
+
+    # Phase ouverte : jusqu'à maintenant
+    submission = sampler.phase_stats('submission')
+    assert submission['wall'] >= 0.02 and submission['cpu_time'] < learn['cpu_time']
@@ -0,0 +1,39 @@
+"""Élagage par signature de forme : formes déclarées exactes et candidats retenus."""
+import numpy as np
+import pytest
+
+from shape_index import DATA_DEPENDENT, STANDARD_SHAPES, ShapeSignatureIndex
+
+
+def test_model_shape_registry_extends_standard_shapes(model):
+    for name, func in STANDARD_SHAPES.items():
+        assert model.shape_registry[name] is func
+
+
+@pytest.mark.parametrize('shape', [(1, 1), (2, 2), (3, 5), (6, 4)])
+def test_declared_shapes_match_transform_outputs(model, shape):
+    grid = np.random.default_rng(sum(shape)).integers(0, 3, size=shape)
+    for name, func in model.shape_registry.items():
+        if func is DATA_DEPENDENT or name in model.parametric_registry:
+            continue
+        assert np.asarray(model.transformation_registry[name](grid)).shape == func(shape), name
+
+
+def test_candidates_prune_impossible_shapes():
+    names = ['identity', 'rotate_90', 'expand_2x', 'crop_to_content', 'inconnue']
+    index = ShapeSignatureIndex(names)
+
+    rows = index.candidates((2, 3), (2, 3))
+    assert [names[row] for row in rows] == ['identity', 'crop_to_content', 'inconnue']
+    rows = index.candidates((2, 3), (4, 6))
+    assert [names[row] for row in rows] == ['expand_2x', 'crop_to_content', 'inconnue']
+    index.candidates((2, 3), (2, 3))  # signature déjà en cache
+
+    stats = index.stats()
+    assert stats['signatures'] == 2 and stats['groups'] == 3
+    assert stats['evaluated'] == 9 and stats['pruned'] == 6
+    assert stats['data_dependent'] == 6  # crop_to_content et la transformation sans forme déclarée
+    assert stats['pruned_rate'] == pytest.approx(6 / 15)
+
+    index.reset_stats()
+    assert index.stats()['groups'] == 0 and index.stats()['signatures'] == 2
@@ -0,0 +1,80 @@
+"""Ordonnanceur de soumission : replis, réponses provisoires et format ARC Prize."""
+import json
+import time
+
+import numpy as np
+
+import arc_grid
+import submission_scheduler
+from submission_scheduler import attempts_entry, identity_attempts, report_progress, run_with_deadline
+
+
+def _task(puzzle_id, puzzle, token):
+    """Tâche de test : 'error' échoue, 'slow' ignore son budget, 'partial' rapporte une réponse puis ignore son budget."""
+    kind = puzzle['kind']
+    if kind == 'error':
+        raise RuntimeError('échec')
+    if kind == 'partial':
+        report_progress([{'attempt_1': [[9]], 'attempt_2': [[0]]}])
+    time.sleep(60)
+
+
+def _puzzle(kind):
+    return {'kind': kind, 'test': [{'input': [[0]]}]}
+
+
+def test_attempts_format():
+    puzzle = {'train': [], 'test': [{'input': [[1, 2]]}, {'input': np.array([[3]])}]}
+    assert identity_attempts(puzzle) == [{'attempt_1': [[1, 2]], 'attempt_2': [[1, 2]]},
+                                         {'attempt_1': [[3]], 'attempt_2': [[3]]}]
+    assert identity_attempts({'train': [], 'test': []}, n_attempts=1) == [{'attempt_1': [[0]]}]
+    assert attempts_entry([[np.ones((1, 2), dtype=int)], [[[5]]]]) == [{'attempt_1': [[1, 1]], 'attempt_2': [[5]]}]
+
+
+def test_interrupted_puzzles_keep_fallback_or_reported_answer(tmp_path):
+    puzzles = {kind: _puzzle(kind) for kind in ('error', 'slow', 'partial')}
+    path = str(tmp_path / 'submission.json')
+    start = time.time()
+    submission, records = run_with_deadline(_task, puzzles, dict.fromkeys(puzzles, 5.0), start + 1.0, path,
+                                            n_workers=3, safety_margin=0.0, min_budget=0.1, grace=0.1)
+    assert time.time() - start < 5.0
+    # Une erreur n'est pas retentée ; un puzzle interrompu garde la dernière réponse
+    # rapportée, sinon l'entrée de test pour chaque essai
+    assert records['error']['status'] == 'error' and records['error']['attempts'] == 1
+    assert records['slow']['status'] == 'timeout' and records['partial']['status'] == 'timeout'
+    identity = [{'attempt_1': [[0]], 'attempt_2': [[0]]}]
+    assert submission == {'error': identity, 'slow': identity,
+                          'partial': [{'attempt_1': [[9]], 'attempt_2': [[0]]}]}
+    with open(path) as f:
+        assert json.load(f) == submission
+
+
+class _Conn:
+    """Connexion factice qui garde les messages envoyés."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+
+
+def test_model_reports_verified_programs(model, corpus, monkeypatch):
+    puzzle = next(iter(corpus.values()))
+    registry = model._bound_registry(puzzle)
+    test_grids = [np.asarray(grid) for grid in arc_grid.test_inputs(puzzle)]
+    program = ('rotate_90',)
+
+    # Hors d'un worker, ou sans programme vérifié : rien n'est rapporté
+    conn = _Conn()
+    model._report_programs(registry, [program], test_grids, 2)
+    monkeypatch.setattr(submission_scheduler, '_progress_conn', conn)
+    model._report_programs(registry, [], test_grids, 2)
+    assert conn.sent == []
+
+    # Essais des programmes vérifiés, complétés par l'entrée de test
+    model._report_programs(registry, [program], test_grids, 2)
+    kind, entry = conn.sent[0]
+    assert kind == 'partial' and len(entry) == len(test_grids)
+    for grid, attempts in zip(test_grids, entry):
+        assert attempts == {'attempt_1': np.rot90(grid, k=3).tolist(), 'attempt_2': grid.tolist()}
@@ -0,0 +1,93 @@
+"""Budgets par puzzle, tours de redistribution et nouvelle tentative sous échéance."""
+import json
+import os
+import time
+from collections import OrderedDict
+
+import pytest
+
+from submission_scheduler import run_with_deadline
+from time_budget import BudgetAllocator, BudgetToken, allocate_budgets
+
+
+def test_allocate_budgets_proportional_and_clamped():
+    assert allocate_budgets({'a': 1, 'b': 3}, 8.0, min_budget=0.0) == pytest.approx({'a': 2.0, 'b': 6.0})
+    assert allocate_budgets({'a': 1, 'b': 3}, 8.0, min_budget=3.0, max_budget=5.0) == {'a': 3.0, 'b': 5.0}
+    # Deux workers : deux fois plus de temps de calcul, sans dépasser le temps total par puzzle
+    assert allocate_budgets({'a': 1, 'b': 3}, 8.0, n_workers=2, min_budget=0.0) == pytest.approx({'a': 4.0, 'b': 8.0})
+    assert allocate_budgets({'a': 0, 'b': 0}, 8.0, max_budget=5.0) == {'a': 5.0, 'b': 5.0}
+    assert allocate_budgets({'a': 1}, -1.0) == {'a': 0.0}
+
+
+def test_allocator_rounds():
+    allocator = BudgetAllocator({'a': 1, 'b': 2, 'c': 3}, min_budget=0.0, max_rounds=3)
+    assert allocator.initial(6.0) == OrderedDict([('a', 1.0), ('b', 2.0), ('c', 3.0)])
+    allocator.record('a', 0.1, finished=True)
+    allocator.record('b', 2.0, finished=False)
+    allocator.record('c', 3.0, finished=False)
+    assert allocator.unfinished() == ['c', 'b']
+
+    # Le plus difficile d'abord ; chaque budget dépasse 1,5 fois le précédent
+    second = allocator.next_round(10.0)
+    assert list(second) == ['c', 'b']
+    assert second == pytest.approx({'c': 6.0, 'b': 4.0})
+    assert allocator.round == 2
+
+    # Gains insuffisants : aucun tour, le compteur ne bouge pas
+    assert allocator.next_round(5.0) == OrderedDict()
+    assert allocator.round == 2
+
+    # Seul c reste retenté quand b n'y gagnerait pas assez
+    allocator.record('b', 4.0, finished=True)
+    assert allocator.next_round(9.0) == OrderedDict([('c', 9.0)])
+    assert allocator.round == 3
+    assert allocator.next_round(100.0) == OrderedDict()
+    assert allocator.spent == pytest.approx({'a': 0.1, 'b': 6.0, 'c': 3.0})
+
+
+def test_budget_token():
+    token = BudgetToken(10.0)
+    assert not token.expired() and 9.0 < token.remaining() <= 10.0
+    token.cancel()
+    assert token.expired()
+    assert BudgetToken(0.0).expired()
+
+
+def _task(puzzle_id, puzzle, token):
+    """Tâche de test : 'retry' abandonne au premier essai, les autres puzzles sont résolus."""
+    if puzzle['kind'] == 'retry' and not os.path.exists(puzzle['marker']):
+        open(puzzle['marker'], 'w').close()
+        return {'solution': None, 'cancelled': True}
+    return {'solution': [[1 if puzzle_id == 'easy' else 2]]}
+
+
+def _puzzle(kind, tmp_path):
+    return {'kind': kind, 'marker': str(tmp_path / 'marker'), 'test': [{'input': [[0]]}]}
+
+
+def test_run_with_deadline_retries_cancelled_puzzle(tmp_path):
+    puzzles = {'easy': _puzzle('solve', tmp_path), 'hard': _puzzle('retry', tmp_path)}
+    path = str(tmp_path / 'submission.json')
+    submission, records = run_with_deadline(_task, puzzles, {'easy': 5.0, 'hard': 5.0}, time.time() + 3.0, path,
+                                            safety_margin=0.0, min_budget=0.1)
+    assert records['easy']['status'] == 'solved' and records['easy']['attempts'] == 1
+    assert records['hard']['status'] == 'solved' and records['hard']['attempts'] == 2
+    assert submission == {'easy': [[1]], 'hard': [[2]]}
+    with open(path) as f:
+        assert json.load(f) == submission
+
+
+def test_solve_reports_interruption_from_predict(model, corpus, monkeypatch):
+    from vorax import submission
+    monkeypatch.setattr(submission, '_worker_model', model)
+    puzzle_id, puzzle = next(iter(corpus.items()))
+
+    # Budget épuisé d'emblée : classement tronqué, pas de classification
+    expired = BudgetToken(0.0)
+    result = submission._solve_and_classify(puzzle_id, puzzle, expired)
+    assert result['cancelled'] and result['type'] == 'unknown'
+    assert len(result['solution']) == len(puzzle['test'])
+
+    # Sans échéance : classement complet
+    result = submission._solve_and_classify(puzzle_id, puzzle, BudgetToken())
+    assert not result['cancelled'] and not model.interrupted[puzzle_id]
@@ -0,0 +1,67 @@
+"""Programmes compilés (une carte d'indices + une table) contre exécution transformation par transformation."""
+import itertools
+
+import numpy as np
+import pytest
+
+from program_search import apply_program, apply_program_batch
+from transform_compiler import TransformCompiler
+
+SHAPES = [(1, 1), (3, 5), (6, 6), (2, 7)]
+
+
+@pytest.fixture(scope='module')
+def compiler(model):
+    return TransformCompiler(model.transformation_registry, model.fusion_registry)
+
+
+@pytest.fixture(scope='module')
+def grids():
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 10, size=shape).astype(np.uint8) for shape in SHAPES]
+
+
+def _programs(compiler, max_length=2):
+    names = sorted(compiler.fusion_kinds)
+    for length in range(1, max_length + 1):
+        yield from itertools.product(names, repeat=length)
+
+
+def test_compiled_programs_match_interpreted(model, compiler, grids):
+    registry = model.transformation_registry
+    for program in _programs(compiler):
+        for grid in grids:
+            expected = apply_program(registry, program, grid)
+            result = compiler.apply(program, grid)
+            assert result.shape == expected.shape, program
+            assert np.array_equal(result, expected), program
+
+
+def test_compiled_stack_matches_per_grid(model, compiler):
+    rng = np.random.default_rng(1)
+    stack = rng.integers(0, 10, size=(4, 3, 5)).astype(np.uint8)
+    for program in _programs(compiler):
+        expected = [apply_program(model.transformation_registry, program, grid) for grid in stack]
+        result = compiler.apply_stack(program, stack)
+        assert all(np.array_equal(r, e) for r, e in zip(result, expected)), program
+
+
+def test_batch_groups_shapes_and_keeps_order(model, compiler, grids):
+    program = ('rotate_90', 'invert_colors')
+    outputs = apply_program_batch(model.transformation_registry, program, grids + grids[:1], compiler)
+    expected = [apply_program(model.transformation_registry, program, grid) for grid in grids + grids[:1]]
+    assert all(np.array_equal(o, e) for o, e in zip(outputs, expected))
+
+
+def test_compiled_programs_are_cached(model, grids):
+    compiler = TransformCompiler(model.transformation_registry, model.fusion_registry)
+    compiler.apply(('flip_horizontal', 'rotate_90'), grids[1])
+    compiler.apply(('flip_horizontal', 'rotate_90'), grids[1])
+    compiler.apply(('flip_horizontal', 'rotate_90'), grids[2])
+    assert compiler.stats() == {'compiled': 2, 'hits': 1, 'misses': 2}
+
+
+def test_non_fusable_program_is_rejected(compiler):
+    assert not compiler.is_fusable(('extract_pattern',))
+    with pytest.raises(ValueError):
+        compiler.compile(('extract_pattern',), (3, 3))
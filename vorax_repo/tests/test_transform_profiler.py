@@ -0,0 +1,68 @@
+"""Profilage des transformations : compteurs, fusion des workers et instrumentation du modèle."""
+import json
+
+import numpy as np
+import pytest
+
+from analysis_memo import AnalysisMemo
+from transform_profiler import TransformProfiler
+
+
+def _fail(grid):
+    raise ValueError('échec')
+
+
+def test_wrap_counts_calls_errors_and_bytes():
+    profiler = TransformProfiler()
+    registry = profiler.instrument({'flip': np.fliplr, 'fail': _fail})
+    grid = np.zeros((3, 4), dtype=np.uint8)
+    for _ in range(3):
+        registry['flip'](grid)
+    with pytest.raises(ValueError):
+        registry['fail'](grid)
+    assert registry['flip'].profiled is np.fliplr
+
+    rows = {row['name']: row for row in profiler.report()}
+    assert rows['flip']['calls'] == 3 and rows['flip']['errors'] == 0 and rows['flip']['output_bytes'] == 36
+    assert rows['fail']['calls'] == 1 and rows['fail']['errors'] == 1 and rows['fail']['output_bytes'] == 0
+    assert 'flip' in profiler.format_table()
+
+
+def test_state_merge_reset_and_json(tmp_path):
+    worker, parent = TransformProfiler(), TransformProfiler()
+    for profiler in (worker, parent):
+        profiler.measure('rotate', np.rot90, np.eye(2))
+    parent.merge(worker.state())
+    assert parent.report()[0]['calls'] == 2
+
+    path = str(tmp_path / 'profile.json')
+    parent.to_json(path)
+    with open(path) as f:
+        assert json.load(f)['transforms'][0]['name'] == 'rotate'
+
+    parent.reset()
+    assert parent.report() == [] and len(parent) == 1
+
+
+def test_model_profiles_registry_stacks_and_compiled_programs(monkeypatch):
+    from vorax import Config, HybridVoraxModelV3
+    monkeypatch.setattr(Config, 'PROFILE_TRANSFORMS', True)
+    model = HybridVoraxModelV3(memo=AnalysisMemo())
+    grid = np.arange(6).reshape(2, 3) % 3
+
+    model.transformation_registry['rotate_90'](grid)
+    model.stack_registry['rotate_90'](grid[None])
+    model.compiler.apply(('rotate_90', 'invert_colors'), grid)
+    model.compiler.apply_stack(('rotate_90', 'invert_colors'), grid[None])
+    names = {row['name'] for row in model.profiler.report()}
+    assert {'rotate_90', 'rotate_90 (pile)', 'rotate_90+invert_colors',
+            'rotate_90+invert_colors (pile)'} <= names
+
+    # Les transformations paramétrées non liées ne sont pas enveloppées
+    for name in model.parametric_registry:
+        assert not hasattr(model.transformation_registry[name], 'profiled')
+
+
+def test_profiling_is_off_by_default(model):
+    assert model.profiler is None
+    assert not hasattr(model.transformation_registry['rotate_90'], 'profiled')
@@ -0,0 +1,128 @@
+"""
+Budgets de temps de la soumission : répartition globale et jeton d'annulation.
+
+Le temps total disponible est réparti entre les puzzles d'évaluation au
+prorata de leur difficulté estimée. Le temps laissé par les puzzles résolus
+rapidement est redistribué, par tours successifs, aux puzzles non résolus
+les plus difficiles. Chaque résolution reçoit un BudgetToken que le solveur
+consulte (recherche de programmes, replis) pour s'arrêter de lui-même avant
+d'être interrompu.
+"""
+import time
+from collections import OrderedDict
+
+
+class BudgetToken:
+    """Jeton de budget annulable : échéance optionnelle et drapeau d'annulation."""
+
+    def __init__(self, seconds=None):
+        self.deadline = time.time() + seconds if seconds is not None else None
+        self.cancelled = False
+
+    def cancel(self):
+        """Annule le jeton."""
+        self.cancelled = True
+
+    def remaining(self):
+        """Temps restant (s) : 0 si annulé, inf sans échéance."""
+        if self.cancelled:
+            return 0.0
+        if self.deadline is None:
+            return float('inf')
+        return max(0.0, self.deadline - time.time())
+
+    def expired(self):
+        """Vrai si le budget est épuisé ou annulé."""
+        return self.remaining() <= 0.0
+
+
+def allocate_budgets(difficulties, total_time, n_workers=1, min_budget=0.5, max_budget=60.0):
+    """Budget initial (s) de chaque puzzle : temps total réparti au prorata de la difficulté.
+
+    Avec n_workers processus simultanés, n_workers * total_time secondes de
+    calcul sont à répartir.
+    """
+    total_difficulty = sum(difficulties.values())
+    if total_difficulty <= 0:
+        return {puzzle_id: max(0.0, min(max_budget, total_time)) for puzzle_id in difficulties}
+    capacity = max(0.0, total_time) * max(1, n_workers)
+    budgets = {}
+    for puzzle_id, difficulty in difficulties.items():
+        budget = capacity * difficulty / total_difficulty
+        budget = max(min_budget, min(max_budget, budget))
+        budgets[puzzle_id] = max(0.0, min(budget, total_time))
+    return budgets
+
+
+class BudgetAllocator:
+    """Répartition du temps de soumission en tours successifs.
+
+    Le premier tour attribue à chaque puzzle son budget initial
+    (allocate_budgets). Aux tours suivants, le temps restant est redistribué
+    aux puzzles non résolus, les plus difficiles d'abord, à condition que le
+    nouveau budget dépasse d'au moins min_gain fois le précédent (une nouvelle
+    tentative avec le même budget échouerait de la même façon).
+    """
+
+    def __init__(self, difficulties, n_workers=1, min_budget=0.5, max_budget=60.0,
+                 max_rounds=3, min_gain=1.5):
+        self.difficulties = dict(difficulties)
+        self.n_workers = max(1, int(n_workers))
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.max_rounds = max_rounds
+        self.min_gain = min_gain
+        self.round = 0
+        self.budgets = {}
+        self.spent = {puzzle_id: 0.0 for puzzle_id in self.difficulties}
+        self.finished = set()
+
+    def initial(self, total_time):
+        """Budgets du premier tour, dans l'ordre des puzzles."""
+        self.round = 1
+        self.budgets = allocate_budgets(self.difficulties, total_time, self.n_workers,
+                                        self.min_budget, self.max_budget)
+        return OrderedDict(self.budgets)
+
+    def record(self, puzzle_id, elapsed, finished):
+        """Enregistre l'issue d'une tentative.
+
+        finished est vrai si le puzzle est résolu ou ne gagnerait rien à plus
+        de temps (erreur) : il n'est alors plus retenté.
+        """
+        self.spent[puzzle_id] = self.spent.get(puzzle_id, 0.0) + elapsed
+        if finished:
+            self.finished.add(puzzle_id)
+        else:
+            self.finished.discard(puzzle_id)
+
+    def unfinished(self):
+        """Puzzles non résolus à retenter, du plus difficile au plus facile."""
+        return sorted((puzzle_id for puzzle_id in self.difficulties if puzzle_id not in self.finished),
+                      key=lambda puzzle_id: -self.difficulties[puzzle_id])
+
+    def next_round(self, remaining):
+        """Budgets du tour suivant (temps restant redistribué aux puzzles non résolus).
+
+        Returns:
+            OrderedDict {puzzle_id: budget}, du plus difficile au plus facile ;
+            vide s'il n'y a plus de tour utile.
+        """
+        if self.round >= self.max_rounds or remaining <= 0:
+            return OrderedDict()
+        candidates = {puzzle_id: self.difficulties[puzzle_id] for puzzle_id in self.unfinished()}
+        budgets = OrderedDict()
+        # Retirer les puzzles dont le gain serait insuffisant, puis répartir à nouveau
+        while candidates:
+            shares = allocate_budgets(candidates, remaining, self.n_workers, 0.0, self.max_budget)
+            too_small = [puzzle_id for puzzle_id, budget in shares.items()
+                         if budget < max(self.min_budget, self.min_gain * self.budgets.get(puzzle_id, 0.0))]
+            if not too_small:
+                budgets = OrderedDict((puzzle_id, shares[puzzle_id]) for puzzle_id in candidates)
+                break
+            for puzzle_id in too_small:
+                del candidates[puzzle_id]
+        if budgets:
+            self.round += 1
+            self.budgets.update(budgets)
+        return budgets
@@ -0,0 +1,167 @@
+"""
+Compilateur de fusion des transformations géométriques et de couleur.
+
+Une transformation géométrique (flips, rotations, agrandissement, bordures)
+est un réarrangement d'indices ; une transformation de couleur ponctuelle
+(inversion, masque, échange de couleurs) est une table de 10 entrées. Toute
+chaîne de telles transformations se réduit donc, pour une forme (h, w)
+donnée, à une seule carte d'indices et une seule table de couleurs :
+
+    sortie = concat(lut[entrée], constantes)[index]
+
+Les programmes compilés sont mis en cache par (programme, forme). Avec un
+TransformProfiler, les exécutions de apply et apply_stack sont mesurées sous
+le nom du programme (« a+b »), comme les appels au registre.
+"""
+import numpy as np
+
+from batch_evaluator import _registry_items
+
+# Genres de transformations fusionnables
+GATHER = 'gather'  # Réarrangement des cellules (nouvelles cellules remplies de 0)
+LUT = 'lut'  # Table de couleurs ponctuelle, indépendante du contenu
+
+# Nombre de couleurs ARC
+N_COLORS = 10
+
+
+class CompiledProgram:
+    """Programme fusionné pour une forme d'entrée donnée : une carte d'indices et une table."""
+
+    __slots__ = ('program', 'input_shape', 'output_shape', 'index', 'lut', 'consts')
+
+    def __init__(self, program, input_shape, output_shape, index, lut, consts):
+        self.program = program
+        self.input_shape = input_shape
+        self.output_shape = output_shape
+        self.index = index
+        self.lut = lut
+        self.consts = consts
+
+    def __call__(self, grid):
+        grid = np.asarray(grid)
+        if grid.shape != self.input_shape:
+            raise ValueError(f"Programme compilé pour {self.input_shape}, reçu {grid.shape}")
+        values = self.lut[grid.ravel()]
+        if len(self.consts):
+            values = np.concatenate([values, self.consts])
+        return values[self.index].reshape(self.output_shape)
+
+    def apply_stack(self, stack):
+        """Applique le programme à une pile (k, h, w) de grilles de même forme."""
+        stack = np.asarray(stack)
+        k = len(stack)
+        values = self.lut[stack.reshape(k, -1)]
+        if len(self.consts):
+            values = np.concatenate([values, np.broadcast_to(self.consts, (k, len(self.consts)))], axis=1)
+        return np.take(values, self.index, axis=1).reshape((k,) + self.output_shape)
+
+
+class TransformCompiler:
+    """Compile les chaînes de transformations fusionnables d'un registre.
+
+    Les cartes d'indices et les tables sont dérivées en appliquant une fois
+    chaque transformation à une grille d'indices (GATHER) ou à la rangée des
+    10 couleurs (LUT) ; aucune description manuelle n'est nécessaire.
+    """
+
+    def __init__(self, transformations, fusion_kinds, profiler=None):
+        self.profiler = profiler
+        self._registry = dict(_registry_items(transformations))
+        self.fusion_kinds = {
+            name: kind for name, kind in fusion_kinds.items()
+            if kind in (GATHER, LUT) and name in self._registry
+        }
+        self._cache = {}  # (programme, forme) -> CompiledProgram
+        self._luts = {}  # nom -> table de couleurs
+        self.hits = 0
+        self.misses = 0
+
+    def is_fusable(self, program):
+        """Vrai si toutes les étapes du programme sont fusionnables."""
+        return all(name in self.fusion_kinds for name in program)
+
+    def _color_table(self, name):
+        lut = self._luts.get(name)
+        if lut is None:
+            lut = np.asarray(self._registry[name](np.arange(N_COLORS, dtype=np.uint8).reshape(1, N_COLORS)))
+            if lut.shape != (1, N_COLORS) or lut.min() < 0 or lut.max() >= N_COLORS:
+                raise ValueError(f"{name} n'est pas une table de couleurs ponctuelle")
+            lut = lut.ravel().astype(np.uint8)
+            self._luts[name] = lut
+        return lut
+
+    def _gather_map(self, name, shape):
+        """Carte (1 + indice source) de la transformation, 0 pour les cellules remplies de 0."""
+        size = shape[0] * shape[1]
+        gathered = np.asarray(self._registry[name](np.arange(1, size + 1, dtype=np.int64).reshape(shape)))
+        if gathered.ndim != 2 or gathered.min() < 0 or gathered.max() > size:
+            raise ValueError(f"{name} n'est pas un réarrangement de cellules")
+        return gathered
+
+    def compile(self, program, shape):
+        """Programme compilé pour la forme d'entrée donnée (mis en cache)."""
+        program = tuple(program)
+        shape = tuple(shape)
+        key = (program, shape)
+        compiled = self._cache.get(key)
+        if compiled is not None:
+            self.hits += 1
+            return compiled
+        self.misses += 1
+
+        n_inputs = shape[0] * shape[1]
+        index = np.arange(n_inputs, dtype=np.intp)
+        lut = np.arange(N_COLORS, dtype=np.uint8)
+        consts = np.zeros(0, dtype=np.uint8)
+        current_shape = shape
+
+        for name in program:
+            kind = self.fusion_kinds.get(name)
+            if kind == LUT:
+                table = self._color_table(name)
+                lut = table[lut]
+                consts = table[consts]
+            elif kind == GATHER:
+                gathered = self._gather_map(name, current_shape)
+                current_shape = gathered.shape
+                gathered = gathered.ravel()
+                filled = gathered == 0
+                new_index = np.empty(len(gathered), dtype=np.intp)
+                new_index[~filled] = index[gathered[~filled] - 1]
+                if filled.any():
+                    new_index[filled] = n_inputs + len(consts)
+                    consts = np.append(consts, np.uint8(0))
+                index = new_index
+            else:
+                raise ValueError(f"Transformation non fusionnable: {name}")
+
+        compiled = CompiledProgram(program, shape, current_shape, index, lut, consts)
+        self._cache[key] = compiled
+        return compiled
+
+    def apply(self, program, grid):
+        """Applique un programme fusionnable à une grille."""
+        grid = np.asarray(grid)
+        if self.profiler is not None:
+            return self.profiler.measure('+'.join(program), self.compile(program, grid.shape), grid)
+        return self.compile(program, grid.shape)(grid)
+
+    def apply_stack(self, program, stack):
+        """Applique un programme fusionnable à une pile (k, h, w) de grilles de même forme."""
+        stack = np.asarray(stack)
+        compiled = self.compile(program, stack.shape[1:])
+        if self.profiler is not None:
+            return self.profiler.measure('+'.join(program) + ' (pile)', compiled.apply_stack, stack)
+        return compiled.apply_stack(stack)
+
+    def stack_transforms(self):
+        """Versions compilées {nom: fonction sur pile (k, h, w)} des transformations fusionnables."""
+        return {
+            name: (lambda stack, program=(name,): self.compile(program, stack.shape[1:]).apply_stack(stack))
+            for name in self.fusion_kinds
+        }
+
+    def stats(self):
+        """Statistiques du cache de programmes compilés."""
+        return {'compiled': len(self._cache), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,143 @@
+"""
+Instrumentation optionnelle du registre de transformations.
+
+TransformProfiler.instrument() remplace chaque entrée d'un registre (dict
+{nom: fonction} du modèle V3 ou liste de paires de get_transformation_set)
+par une enveloppe qui compte les appels, mesure leur durée, compte les
+exceptions et cumule la taille des grilles produites. Sans instrumentation, le registre n'est pas
+modifié : aucun coût n'est ajouté aux appels.
+"""
+import json
+import time
+from array import array
+from functools import wraps
+
+import numpy as np
+
+
+class _TransformStats:
+    __slots__ = ('calls', 'errors', 'output_bytes', 'durations')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.output_bytes = 0
+        self.durations = array('d')
+
+
+class TransformProfiler:
+    """Compteurs par transformation : appels, temps cumulé et p95, exceptions, octets produits."""
+
+    def __init__(self):
+        self._stats = {}
+
+    def _entry(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _TransformStats()
+        return stats
+
+    def wrap(self, name, func):
+        """Enveloppe mesurée de func, enregistrée sous name."""
+        stats = self._entry(name)
+        clock = time.perf_counter
+
+        @wraps(func)
+        def _profiled(*args, **kwargs):
+            t_start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                stats.durations.append(clock() - t_start)
+                stats.calls += 1
+                stats.errors += 1
+                raise
+            stats.durations.append(clock() - t_start)
+            stats.calls += 1
+            stats.output_bytes += getattr(result, 'nbytes', 0)
+            return result
+
+        _profiled.profiled = func
+        return _profiled
+
+    def measure(self, name, func, *args):
+        """Appelle func(*args) et l'enregistre sous name (exécutions hors registre, ex. programmes compilés)."""
+        stats = self._entry(name)
+        t_start = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception:
+            stats.durations.append(time.perf_counter() - t_start)
+            stats.calls += 1
+            stats.errors += 1
+            raise
+        stats.durations.append(time.perf_counter() - t_start)
+        stats.calls += 1
+        stats.output_bytes += getattr(result, 'nbytes', 0)
+        return result
+
+    def instrument(self, transformations, suffix=''):
+        """Registre de même forme (dict ou liste de paires) dont chaque transformation est mesurée."""
+        if isinstance(transformations, dict):
+            return {name: self.wrap(name + suffix, func) for name, func in transformations.items()}
+        return [(name, self.wrap(name + suffix, func)) for name, func in transformations]
+
+    def __len__(self):
+        return len(self._stats)
+
+    def report(self):
+        """Statistiques par transformation, par temps cumulé décroissant."""
+        rows = []
+        for name, stats in self._stats.items():
+            if not stats.calls:
+                continue
+            durations = np.frombuffer(stats.durations, dtype=float)
+            total = float(durations.sum())
+            rows.append({
+                'name': name,
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'total_s': total,
+                'mean_ms': total / stats.calls * 1000,
+                'p95_ms': float(np.percentile(durations, 95) * 1000),
+                'output_bytes': stats.output_bytes,
+            })
+        rows.sort(key=lambda row: -row['total_s'])
+        return rows
+
+    def format_table(self, top_n=None):
+        """Tableau trié par temps cumulé (top_n premières lignes)."""
+        rows = self.report()[:top_n]
+        lines = [f"{'transformation':<32} {'appels':>9} {'total (s)':>10} {'moy (ms)':>9} "
+                 f"{'p95 (ms)':>9} {'erreurs':>8} {'sorties (Mo)':>12}"]
+        for row in rows:
+            lines.append(f"{row['name']:<32} {row['calls']:>9} {row['total_s']:>10.3f} {row['mean_ms']:>9.3f} "
+                         f"{row['p95_ms']:>9.3f} {row['errors']:>8} {row['output_bytes'] / 1024 ** 2:>12.2f}")
+        return '\n'.join(lines)
+
+    def to_json(self, path):
+        """Exporte le rapport en JSON."""
+        with open(path, 'w') as f:
+            json.dump({'transforms': self.report()}, f, indent=2)
+
+    def state(self):
+        """État brut sérialisable (pour fusionner les compteurs des workers)."""
+        return {name: (stats.calls, stats.errors, stats.output_bytes, stats.durations.tobytes())
+                for name, stats in self._stats.items()}
+
+    def merge(self, state):
+        """Ajoute les compteurs d'un état produit par state()."""
+        for name, (calls, errors, output_bytes, durations) in state.items():
+            stats = self._entry(name)
+            stats.calls += calls
+            stats.errors += errors
+            stats.output_bytes += output_bytes
+            stats.durations.frombytes(durations)
+
+    def reset(self):
+        """Remet les compteurs à zéro (les enveloppes existantes restent valides)."""
+        for stats in self._stats.values():
+            stats.calls = 0
+            stats.errors = 0
+            stats.output_bytes = 0
+            stats.durations = array('d')
@@ -1,20 +1,16 @@
 import numpy as np
 
+from patch_stats import patch_counts
+
 def color_mapping(grid):
     """Applique une transformation de couleurs."""
     unique_values = np.unique(grid)
     mapping = {v: i for i, v in enumerate(unique_values)}
     return np.vectorize(mapping.get)(grid)
 
-def pattern_extraction(grid):
-    """Extrait les motifs récurrents."""
-    h, w = grid.shape
-    patterns = {}
-    for i in range(h-1):
-        for j in range(w-1):
-            pattern = grid[i:i+2, j:j+2].tobytes()
-            patterns[pattern] = patterns.get(pattern, 0) + 1
-    return patterns
+def pattern_extraction(grid, k=2):
+    """Extrait les motifs récurrents (fenêtres k x k)."""
+    return patch_counts(grid, k)
 
 def transform_grid(grid, transform_type="identity"):
     """Transformation robuste des grilles avec validation."""
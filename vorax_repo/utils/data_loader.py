@@ -4,75 +4,136 @@
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from arc_grid import as_arc_puzzle
+from arc_dataset import ArcDataset, peak_rss
 
 logger = logging.getLogger('ARC-HybridVoraxModelV2')
 
-def load_arc_data(data_path):
-    """Chargement des données ARC."""
+# Nom conseillé de l'instantané des répertoires training/ et evaluation/ (un seul fichier,
+# relu au démarrage à chaud), à placer dans un répertoire de sortie : jamais dans data_path
+DIRECTORY_CACHE_NAME = '.arc_directory_cache.json'
+DEFAULT_READ_THREADS = 8
+
+def _directory_signature(directory):
+    """Liste (nom, taille, mtime) des fichiers JSON d'un répertoire de puzzles."""
+    signature = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.json'):
+            stat = os.stat(os.path.join(directory, filename))
+            signature.append([filename, stat.st_size, stat.st_mtime_ns])
+    return signature
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _read_directories(data_path, directories, cache_path=None, max_workers=DEFAULT_READ_THREADS):
+    """Puzzles JSON bruts {répertoire: [(id, puzzle), ...]} des répertoires un-fichier-par-puzzle.
+
+    Les fichiers sont lus et décodés par un pool de threads ; le résultat est
+    mis en cache dans un seul fichier, réutilisé tant que la liste des
+    fichiers et leurs mtimes n'ont pas changé.
+    """
+    signature = {name: _directory_signature(os.path.join(data_path, name)) for name in directories}
+    if cache_path and os.path.exists(cache_path):
+        try:
+            cached = _read_json(cache_path)
+            if cached.get('signature') == signature:
+                logger.info(f"Directory snapshot reused: {cache_path}")
+                return {name: [tuple(entry) for entry in entries] for name, entries in cached['puzzles'].items()}
+        except (OSError, ValueError):
+            logger.warning(f"Unreadable directory snapshot ignored: {cache_path}")
+
+    puzzles = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, files in signature.items():
+            paths = [os.path.join(data_path, name, filename) for filename, _, _ in files]
+            ids = [filename[:-len('.json')] for filename, _, _ in files]
+            puzzles[name] = list(zip(ids, executor.map(_read_json, paths)))
+
+    if cache_path:
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'signature': signature, 'puzzles': puzzles}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Directory snapshot not written ({cache_path}): {e}")
+    return puzzles
+
+def _build_puzzle(puzzle_id, challenge, solution):
+    """Puzzle avec sa solution de test, à partir des fichiers consolidés.
+    
+    Un test unique (dict) reçoit sa grille solution ; une liste de tests
+    (format ARC Prize) reçoit la liste des grilles solutions.
+    """
+    puzzle = {
+        'id': puzzle_id,
+        'train': [{'input': example['input'], 'output': example['output']} 
+                  for example in challenge['train']]
+    }
+    if isinstance(challenge['test'], list):
+        puzzle['test'] = [{'input': example['input'], 'output': output}
+                          for example, output in zip(challenge['test'], solution)]
+    else:
+        puzzle['test'] = {'input': challenge['test']['input'], 'output': solution}
+    return as_arc_puzzle(puzzle)
+
+def load_arc_data(data_path, cache_path=None, max_workers=DEFAULT_READ_THREADS):
+    """Chargement des données ARC.
+    
+    Disposition un-fichier-par-puzzle (training/, evaluation/) : lecture en
+    parallèle et, si cache_path est donné (par exemple DIRECTORY_CACHE_NAME
+    dans le répertoire de travail), instantané dans ce fichier. Aucun
+    instantané n'est écrit par défaut : data_path peut être en lecture seule
+    (/kaggle/input) et ne doit pas être modifié. Disposition consolidée :
+    fichiers challenges/solutions.
+    """
+    peak_before = peak_rss()
     train_data = []
     test_data = []
     
-    # Chargement des données d'entraînement
     train_path = os.path.join(data_path, 'training')
+    test_path = os.path.join(data_path, 'evaluation')
+    directories = [name for name, path in (('training', train_path), ('evaluation', test_path)) if os.path.exists(path)]
+    if directories:
+        directory_puzzles = _read_directories(data_path, directories, cache_path, max_workers)
+    
+    # Chargement des données d'entraînement
     if os.path.exists(train_path):
-        for filename in os.listdir(train_path):
-            if filename.endswith('.json'):
-                with open(os.path.join(train_path, filename), 'r') as f:
-                    puzzle = json.load(f)
-                    puzzle['id'] = filename.replace('.json', '')
-                    train_data.append(puzzle)
+        for puzzle_id, puzzle in directory_puzzles['training']:
+            puzzle['id'] = puzzle_id
+            train_data.append(as_arc_puzzle(puzzle))
     else:
         train_challenges_path = os.path.join(data_path, 'arc-agi_training_challenges.json')
         train_solutions_path = os.path.join(data_path, 'arc-agi_training_solutions.json')
         
         if os.path.exists(train_challenges_path) and os.path.exists(train_solutions_path):
-            with open(train_challenges_path, 'r') as f:
-                train_challenges = json.load(f)
-            with open(train_solutions_path, 'r') as f:
-                train_solutions = json.load(f)
-                
-            for puzzle_id, challenge in train_challenges.items():
-                if puzzle_id in train_solutions:
-                    puzzle = {
-                        'id': puzzle_id,
-                        'train': [{'input': example['input'], 'output': example['output']} 
-                                  for example in challenge['train']],
-                        'test': {'input': challenge['test']['input']}
-                    }
-                    puzzle['test']['output'] = train_solutions[puzzle_id]
-                    train_data.append(puzzle)
+            # Index des octets de chaque puzzle, décodage un puzzle à la fois
+            train_dataset = ArcDataset(train_challenges_path, train_solutions_path, cache_size=0, build=_build_puzzle)
+            train_data.extend(train_dataset.values())
+            train_dataset.close()
     
     # Chargement des données de test
-    test_path = os.path.join(data_path, 'evaluation')
     if os.path.exists(test_path):
-        for filename in os.listdir(test_path):
-            if filename.endswith('.json'):
-                with open(os.path.join(test_path, filename), 'r') as f:
-                    puzzle = json.load(f)
-                    puzzle['id'] = filename.replace('.json', '')
-                    test_data.append(puzzle)
+        for puzzle_id, puzzle in directory_puzzles['evaluation']:
+            puzzle['id'] = puzzle_id
+            test_data.append(as_arc_puzzle(puzzle))
     else:
         eval_challenges_path = os.path.join(data_path, 'arc-agi_evaluation_challenges.json')
         eval_solutions_path = os.path.join(data_path, 'arc-agi_evaluation_solutions.json')
         
         if os.path.exists(eval_challenges_path) and os.path.exists(eval_solutions_path):
-            with open(eval_challenges_path, 'r') as f:
-                eval_challenges = json.load(f)
-            with open(eval_solutions_path, 'r') as f:
-                eval_solutions = json.load(f)
-                
-            for puzzle_id, challenge in eval_challenges.items():
-                if puzzle_id in eval_solutions:
-                    puzzle = {
-                        'id': puzzle_id,
-                        'train': [{'input': example['input'], 'output': example['output']} 
-                                  for example in challenge['train']],
-                        'test': {'input': challenge['test']['input']}
-                    }
-                    puzzle['test']['output'] = eval_solutions[puzzle_id]
-                    test_data.append(puzzle)
+            # Index des octets de chaque puzzle, décodage un puzzle à la fois
+            eval_dataset = ArcDataset(eval_challenges_path, eval_solutions_path, cache_size=0, build=_build_puzzle)
+            test_data.extend(eval_dataset.values())
+            eval_dataset.close()
     
     logger.info(f"Loaded {len(train_data)} training puzzles and {len(test_data)} test puzzles")
+    if peak_before is not None:
+        logger.info(f"Peak RSS: {peak_before/(1024**2):.1f} MB before, {peak_rss()/(1024**2):.1f} MB after loading")
     return train_data, test_data
 
 # Chargement des données
@@ -0,0 +1,28 @@
+"""
+Solveur HybridVoraxModelV3 pour ARC Prize 2025, importable.
+
+Le notebook Kaggle est généré à partir de ce paquet par bundle_notebook.py :
+le pilote arc_model/hybridvoraxmodelv3.py enchaîne chargement, apprentissage
+et soumission, et les modules dont il dépend sont intégrés au notebook.
+L'affichage (matplotlib) est dans vorax.visualization, qui n'est pas importé
+ici.
+
+Le paquet s'appuie sur les modules de premier niveau du dépôt (arc_grid,
+batch_evaluator, parallel_learning...), importés par leur nom : le
+répertoire qui contient vorax/ doit être dans sys.path. Il y est ajouté
+(en fin de liste) à l'import du paquet, pour que vorax reste importable
+depuis un autre répertoire (import vorax_repo.vorax).
+"""
+import os
+import sys
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_DIR not in sys.path:
+    sys.path.append(_REPO_DIR)
+
+from .config import Config
+from .analysis import (analysis_memo, resource_sampler, set_feature_store, analyze_puzzle, puzzle_difficulty,
+                       estimate_puzzle_difficulty, calculate_entropy, calculate_complexity_score)
+from .data import load_all_arc_data
+from .model import HybridVoraxModelV3
+from .submission import generate_submission
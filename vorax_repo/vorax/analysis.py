@@ -0,0 +1,209 @@
+"""
+Analyse des puzzles : caractéristiques, complexité et difficulté estimée.
+
+Les résultats sont mis en cache par contenu dans le mémo partagé
+(analysis_memo) ; les puzzles présents dans le magasin de caractéristiques
+(set_feature_store) y sont lus au lieu d'être analysés.
+"""
+import numpy as np
+
+from analysis_memo import AnalysisMemo, puzzle_content_hash
+from arc_grid import as_grid
+from resource_sampler import ResourceSampler
+
+from .config import Config
+
+
+def calculate_entropy(grid):
+    """Calcule l'entropie de Shannon d'une grille."""
+    return as_grid(grid).entropy
+
+
+def calculate_complexity_score(grid):
+    """Calcule un score de complexité pour une grille."""
+    grid = as_grid(grid)
+    entropy = grid.entropy
+    unique_values = len(grid.colors)
+    size_factor = np.log2(grid.size) if grid.size > 0 else 0
+    return entropy * unique_values * size_factor / 10
+
+# Mémo partagé (analyse, difficulté, transformations) entre apprentissage,
+# résolution et génération de la soumission
+analysis_memo = AnalysisMemo(max_bytes=Config.MEMO_MAX_BYTES)
+
+# Échantillonneur de ressources (RSS, temps CPU), démarré par le premier modèle créé :
+# le solveur ne fait que marquer ses phases
+resource_sampler = ResourceSampler(Config.SAMPLER_INTERVAL, Config.SAMPLER_CAPACITY,
+                                   trace_memory=Config.SAMPLER_TRACEMALLOC)
+
+# Magasin de caractéristiques en colonnes (construit au chargement des données) ;
+# les puzzles absents du magasin sont analysés individuellement
+feature_store = None
+
+
+def set_feature_store(store):
+    """Installe le magasin de caractéristiques lu par analyze_puzzle et puzzle_difficulty."""
+    global feature_store
+    feature_store = store
+
+
+def _stored_puzzle_id(puzzle_hash):
+    """Identifiant du puzzle dans le magasin de caractéristiques, ou None."""
+    return feature_store.find(puzzle_hash) if feature_store is not None else None
+
+
+def analyze_puzzle(puzzle):
+    """Analyse avancée des caractéristiques d'un puzzle ARC (mise en cache par contenu)."""
+    puzzle_hash = puzzle_content_hash(puzzle)
+
+    def _compute():
+        puzzle_id = _stored_puzzle_id(puzzle_hash)
+        if puzzle_id is not None:
+            return feature_store.features(puzzle_id, Config.ENABLE_COMPLEXITY_METRICS)
+        return _extract_puzzle_features(puzzle)
+
+    return analysis_memo.get_or_compute(('features', puzzle_hash), _compute)
+
+
+def puzzle_difficulty(puzzle):
+    """Difficulté estimée d'un puzzle (mise en cache par contenu)."""
+    puzzle_hash = puzzle_content_hash(puzzle)
+
+    def _compute():
+        puzzle_id = _stored_puzzle_id(puzzle_hash)
+        if puzzle_id is not None and Config.ENABLE_COMPLEXITY_METRICS:
+            return feature_store.difficulty(puzzle_id)
+        return estimate_puzzle_difficulty(analyze_puzzle(puzzle))
+
+    return analysis_memo.get_or_compute(('difficulty', puzzle_hash), _compute)
+
+
+def _extract_puzzle_features(puzzle):
+    """Extraction des caractéristiques d'un puzzle ARC (sans cache)."""
+    results = {}
+
+    # Vérification des données d'entrée
+    if not puzzle or 'train' not in puzzle:
+        return {'train_count': 0, 'input_dims': [], 'output_dims': [], 'consistent_dims': False,
+               'input_values': [], 'output_values': [], 'new_values': [], 'removed_values': []}
+
+    # Nombres d'exemples d'entraînement
+    train_examples = puzzle.get('train', [])
+    results['train_count'] = len(train_examples)
+
+    if not train_examples:
+        return results
+
+    # Analyse des dimensions
+    input_dims = []
+    output_dims = []
+    unique_values_in = []
+    unique_values_out = []
+    input_entropies = []
+    output_entropies = []
+    input_complexities = []
+    output_complexities = []
+
+    for example in train_examples:
+        if 'input' not in example or 'output' not in example:
+            continue
+
+        input_grid = as_grid(example['input'])
+        output_grid = as_grid(example['output'])
+
+        input_dims.append(input_grid.shape)
+        output_dims.append(output_grid.shape)
+        unique_values_in.append(set(input_grid.colors))
+        unique_values_out.append(set(output_grid.colors))
+
+        # Calculer des métriques d'information
+        if Config.ENABLE_COMPLEXITY_METRICS:
+            input_entropies.append(calculate_entropy(input_grid))
+            output_entropies.append(calculate_entropy(output_grid))
+            input_complexities.append(calculate_complexity_score(input_grid))
+            output_complexities.append(calculate_complexity_score(output_grid))
+
+    results['input_dims'] = input_dims
+    results['output_dims'] = output_dims
+    results['consistent_dims'] = len(set(input_dims)) == 1 and len(set(output_dims)) == 1
+    results['size_change'] = [o != i for i, o in zip(input_dims, output_dims)]
+
+    # Calculer les ratios de taille (pour détecter des patterns comme x2, x3, etc.)
+    size_ratios = []
+    for i, o in zip(input_dims, output_dims):
+        in_size = i[0] * i[1] if len(i) >= 2 else 0
+        out_size = o[0] * o[1] if len(o) >= 2 else 0
+        ratio = out_size / in_size if in_size > 0 else 0
+        size_ratios.append(ratio)
+    results['size_ratios'] = size_ratios
+
+    # Valeurs utilisées
+    if unique_values_in:
+        all_values_in = set().union(*unique_values_in)
+        all_values_out = set().union(*unique_values_out)
+        results['input_values'] = sorted(all_values_in)
+        results['output_values'] = sorted(all_values_out)
+        results['new_values'] = sorted(all_values_out - all_values_in)
+        results['removed_values'] = sorted(all_values_in - all_values_out)
+    else:
+        results['input_values'] = []
+        results['output_values'] = []
+        results['new_values'] = []
+        results['removed_values'] = []
+
+    # Métriques d'information
+    if Config.ENABLE_COMPLEXITY_METRICS and input_entropies:
+        results['input_entropy_avg'] = sum(input_entropies) / len(input_entropies)
+        results['output_entropy_avg'] = sum(output_entropies) / len(output_entropies)
+        results['input_complexity_avg'] = sum(input_complexities) / len(input_complexities)
+        results['output_complexity_avg'] = sum(output_complexities) / len(output_complexities)
+        results['entropy_change'] = results['output_entropy_avg'] - results['input_entropy_avg']
+        results['complexity_change'] = results['output_complexity_avg'] - results['input_complexity_avg']
+
+    # Dimension du test si disponible
+    if 'test' in puzzle and 'input' in puzzle['test']:
+        test_input = as_grid(puzzle['test']['input'])
+        results['test_dim'] = test_input.shape
+        results['test_values'] = test_input.colors
+
+        # Complexité de l'entrée de test
+        if Config.ENABLE_COMPLEXITY_METRICS:
+            results['test_entropy'] = calculate_entropy(test_input)
+            results['test_complexity'] = calculate_complexity_score(test_input)
+
+    return results
+
+
+def estimate_puzzle_difficulty(features):
+    """Estime la difficulté d'un puzzle sur une échelle de 1 à 10 (version avancée)."""
+    # Difficulté de base
+    difficulty = 5.0
+
+    # Facteurs qui augmentent la difficulté
+    if features.get('train_count', 0) <= 1:
+        difficulty += 2.0  # Peu d'exemples d'entraînement
+
+    if features.get('new_values', []):
+        difficulty += 1.5  # Création de nouvelles valeurs
+
+    if any(features.get('size_change', [])):
+        difficulty += 1.0  # Changement de taille
+
+    # Facteur basé sur la complexité
+    if Config.ENABLE_COMPLEXITY_METRICS and 'output_complexity_avg' in features:
+        complexity_factor = min(3.0, features['output_complexity_avg'] / 5.0)  # Plafonné à 3.0
+        difficulty += complexity_factor
+
+    input_dims = features.get('input_dims', [])
+    if input_dims and any(dim[0] > 10 or dim[1] > 10 for dim in input_dims):
+        difficulty += 1.0  # Grandes dimensions
+
+    # Facteurs qui réduisent la difficulté
+    if features.get('consistent_dims', False):
+        difficulty -= 0.5  # Dimensions constantes
+
+    if len(features.get('input_values', [])) <= 2:
+        difficulty -= 1.0  # Peu de valeurs (binaire)
+
+    # Limites
+    return max(1.0, min(10.0, difficulty))
@@ -0,0 +1,80 @@
+"""
+Configuration du solveur : chemins des données et de sortie, paramètres.
+
+Les chemins dépendent de l'environnement (Kaggle ou dépôt local). Config est
+une classe de constantes partagée par tous les modules du paquet : modifier
+un attribut (Config.MAX_PUZZLES, Config.N_WORKERS, ...) avant l'apprentissage
+suffit à changer le comportement.
+"""
+import os
+
+from parallel_learning import default_workers
+
+
+# Vérification de l'environnement Kaggle
+is_kaggle = 'KAGGLE_KERNEL_RUN_TYPE' in os.environ
+
+
+# Configuration des chemins d'accès aux données
+competition_name = 'arc-prize-2025'
+data_path = '/kaggle/input/' + competition_name if is_kaggle else './data/arc'
+output_dir = '/kaggle/working' if is_kaggle else './results'
+input_dir = '/kaggle/input' if is_kaggle else './data'
+
+
+# Paramètres de configuration pour l'analyse
+class Config:
+    """Configuration globale pour l'analyse des puzzles ARC."""
+    # Paramètres d'analyse
+    MAX_PUZZLES = None  # Pas de limite = tous les puzzles disponibles
+    LOG_INTERVAL = 50   # Intervalle de log pour les puzzles traités
+    DETAILED_LOG_THRESHOLD = 7.0  # Seuil de difficulté pour les logs détaillés
+
+    # Paramètres de performance
+    MEMORY_TRACKING_INTERVAL = 100  # Intervalle pour le suivi de la mémoire
+    PERFORMANCE_THRESHOLD = 0.8  # Seuil de performance pour les transformations (80%)
+    PROFILE_TRANSFORMS = False  # Mesure par transformation (appels, temps, p95, erreurs, octets) ; aucun coût si False
+    SAMPLER_INTERVAL = 0.1  # Période d'échantillonnage RSS/CPU du processus en arrière-plan (s)
+    SAMPLER_CAPACITY = 4096  # Échantillons conservés (tampon circulaire)
+    SAMPLER_TRACEMALLOC = False  # Relever aussi le pic tracemalloc (coûteux : diagnostic uniquement)
+    MEMORY_ALERT_FRACTION = 0.8  # Part de la RAM totale occupée par le processus déclenchant un gc.collect()
+    MEMO_MAX_BYTES = 256 * 1024**2  # Taille max du mémo d'analyses/transformations (256 Mo)
+    DATASET_CACHE_SIZE = 64  # Puzzles décodés gardés en cache par fichier de défis (chargement paresseux)
+    USE_PUZZLE_STORE = True  # Convertir une fois les JSON en magasin binaire projeté en mémoire
+    PUZZLE_STORE_PATH = os.path.join(output_dir, 'arc_puzzles.bin')  # Magasin binaire des puzzles
+
+    # Paramètres de parallélisme (apprentissage map/reduce)
+    N_WORKERS = default_workers()  # Nombre de processus (1 = mode séquentiel)
+    CHUNK_SIZE = 50  # Nombre de puzzles par lot envoyé à un worker
+
+    # Paramètres de la génération de soumission (échéance et budgets par puzzle)
+    SUBMISSION_TIME_LIMIT = 10 * 3600  # Échéance globale de la soumission (s)
+    SUBMISSION_SAFETY_MARGIN = 60  # Marge réservée à l'écriture finale (s)
+    MIN_PUZZLE_BUDGET = 0.5  # Budget minimal par puzzle (s)
+    MAX_PUZZLE_BUDGET = 120  # Budget maximal par puzzle (s)
+    N_ATTEMPTS = 2  # Essais par entrée de test (format ARC Prize: attempt_1, attempt_2)
+    BUDGET_ROUNDS = 3  # Tours de répartition du temps (le temps restant va aux puzzles non résolus)
+    BUDGET_GRACE = 1.0  # Délai (s) laissé au solveur après son budget avant interruption
+
+    # Paramètres de la recherche de programmes (compositions de transformations)
+    PROGRAM_SEARCH_DEPTH = 3  # Nombre maximal de transformations composées
+    PROGRAM_SEARCH_BUDGET = 0.5  # Temps maximal de recherche par puzzle (s)
+    NEIGHBOR_K = 5  # Puzzles résolus les plus proches dont les programmes sont essayés en premier
+
+    # Instantané du modèle entraîné (rechargé si le code et les puzzles n'ont pas changé)
+    MODEL_SNAPSHOT_PATH = os.path.join(output_dir, 'model_snapshot.npz')  # Écriture (et relecture)
+    MODEL_SNAPSHOT_INPUTS = os.path.join(input_dir, '*', 'model_snapshot.npz')  # Sorties précédentes jointes en entrée
+
+    # Paramètres de visualisation
+    MAX_EXAMPLES_TO_DISPLAY = 2  # Nombre d'exemples à afficher par puzzle
+    VISUALIZATION_DPI = 100  # Résolution des graphiques
+
+    # Paramètres d'analyse des résultats
+    TOP_N_TYPES = 10  # Nombre de types de puzzles à afficher dans les statistiques
+    TOP_N_TRANSFORMATIONS = 10  # Nombre de transformations à afficher
+
+    # Flags de fonctionnalités
+    ENABLE_CROSS_VALIDATION = True  # Activer la validation croisée
+    ENABLE_ERROR_ANALYSIS = True  # Activer l'analyse des erreurs
+    ENABLE_COMPLEXITY_METRICS = True  # Activer les métriques de complexité cognitive
+    ENABLE_PROGRAM_SEARCH = True  # Chercher une composition cohérente si aucune transformation ne suffit
@@ -0,0 +1,155 @@
+"""
+Chargement des puzzles ARC (entraînement, évaluation, test) en jeux paresseux.
+"""
+import json
+import os
+import time
+
+import psutil
+
+from arc_dataset import ArcDataset, ChainedDataset, peak_rss
+from puzzle_store import open_puzzle_store
+
+from . import config
+from .config import Config
+
+
+def load_all_arc_data(data_path=None):
+    """Charge TOUS les puzzles disponibles (entraînement, évaluation et test)."""
+    if data_path is None:
+        data_path = config.data_path
+    t_start = time.time()
+    data = {}
+    total_puzzles = 0
+    memory_usage_before = psutil.virtual_memory()
+    rss_before = psutil.Process().memory_info().rss
+    peak_rss_before = peak_rss()
+
+    # Chemins des fichiers
+    training_file = os.path.join(data_path, 'arc-agi_training_challenges.json')
+    eval_file = os.path.join(data_path, 'arc-agi_evaluation_challenges.json')
+    test_file = os.path.join(data_path, 'arc-agi_test_challenges.json')
+    sample_file = os.path.join(data_path, 'sample_submission.json')
+
+    # Jeux de puzzles paresseux (index des octets, décodage à la lecture) réunis en une collection
+    datasets = []
+
+    # Magasin binaire projeté en mémoire (converti une fois, partagé par les workers)
+    store = None
+    if Config.USE_PUZZLE_STORE:
+        try:
+            store = open_puzzle_store(data_path, Config.PUZZLE_STORE_PATH)
+            print(f"Magasin de puzzles: {len(store)} puzzles ({os.path.getsize(Config.PUZZLE_STORE_PATH)/(1024**2):.1f} Mo, {Config.PUZZLE_STORE_PATH})")
+        except Exception as e:
+            print(f"❌ Magasin de puzzles indisponible, lecture des fichiers JSON: {str(e)}")
+
+    def open_source(path, source):
+        if store is not None:
+            return store.select(source)
+        return ArcDataset(path, cache_size=Config.DATASET_CACHE_SIZE)
+    puzzle_sources = {}
+    puzzle_counts = {'training': 0, 'evaluation': 0, 'test': 0}
+
+    # Chargement des puzzles d'entraînement
+    if os.path.exists(training_file):
+        try:
+            print(f"Chargement des puzzles d'entraînement...")
+            # Grilles converties en ArcGrid (uint8, propriétés en cache) à la lecture
+            train_puzzles = open_source(training_file, 'training')
+            data['train_puzzles'] = train_puzzles
+            puzzle_counts['training'] = len(train_puzzles)
+            total_puzzles += puzzle_counts['training']
+
+            # Ajouter à la collection complète
+            datasets.append(train_puzzles)
+            for puzzle_id in train_puzzles:
+                puzzle_sources[puzzle_id] = 'training'
+
+            print(f"✓ Chargé {puzzle_counts['training']} puzzles d'entraînement")
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement des puzzles d'entraînement: {str(e)}")
+            data['train_puzzles'] = {}
+    else:
+        print(f"❌ Fichier d'entraînement non trouvé: {training_file}")
+        data['train_puzzles'] = {}
+
+    # Chargement des puzzles d'évaluation
+    if os.path.exists(eval_file):
+        try:
+            print(f"Chargement des puzzles d'évaluation...")
+            eval_puzzles = open_source(eval_file, 'evaluation')
+            data['eval_puzzles'] = eval_puzzles
+            puzzle_counts['evaluation'] = len(eval_puzzles)
+            total_puzzles += puzzle_counts['evaluation']
+
+            # Ajouter à la collection complète
+            datasets.append(eval_puzzles)
+            for puzzle_id in eval_puzzles:
+                puzzle_sources[puzzle_id] = 'evaluation'
+
+            print(f"✓ Chargé {puzzle_counts['evaluation']} puzzles d'évaluation")
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement des puzzles d'évaluation: {str(e)}")
+            data['eval_puzzles'] = {}
+    else:
+        print(f"❌ Fichier d'évaluation non trouvé: {eval_file}")
+        data['eval_puzzles'] = {}
+
+    # Chargement des puzzles de test
+    if os.path.exists(test_file):
+        try:
+            print(f"Chargement des puzzles de test...")
+            test_puzzles = open_source(test_file, 'test')
+            data['test_puzzles'] = test_puzzles
+            puzzle_counts['test'] = len(test_puzzles)
+            total_puzzles += puzzle_counts['test']
+
+            # Ajouter à la collection complète
+            datasets.append(test_puzzles)
+            for puzzle_id in test_puzzles:
+                puzzle_sources[puzzle_id] = 'test'
+
+            print(f"✓ Chargé {puzzle_counts['test']} puzzles de test")
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement des puzzles de test: {str(e)}")
+            data['test_puzzles'] = {}
+    else:
+        print(f"❌ Fichier de test non trouvé: {test_file}")
+        data['test_puzzles'] = {}
+
+    # Stocker tous les puzzles en une seule collection
+    data['all_puzzles'] = ChainedDataset(datasets)
+    data['puzzle_sources'] = puzzle_sources
+
+    # Vérification du format de la soumission
+    if os.path.exists(sample_file):
+        try:
+            print(f"Chargement de l'exemple de soumission...")
+            with open(sample_file, 'r') as f:
+                data['sample_submission'] = json.load(f)
+            print(f"✓ Exemple de soumission chargé avec {len(data['sample_submission'])} entrées")
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement de l'exemple de soumission: {str(e)}")
+            data['sample_submission'] = {}
+    else:
+        print(f"❌ Fichier d'exemple de soumission non trouvé: {sample_file}")
+        data['sample_submission'] = {}
+
+    memory_usage_after = psutil.virtual_memory()
+    rss_after = psutil.Process().memory_info().rss
+    peak_rss_after = peak_rss()
+    memory_diff = (memory_usage_after.used - memory_usage_before.used) / (1024**2)
+    t_end = time.time()
+
+    print(f"\n=== RÉCAPITULATIF DU CHARGEMENT ===")
+    print(f"Temps de chargement: {t_end - t_start:.2f} secondes")
+    print(f"Total des puzzles: {total_puzzles} puzzles")
+    for source, count in puzzle_counts.items():
+        print(f"  - {source}: {count} puzzles ({count/total_puzzles*100:.1f}% du total)")
+    print(f"Mémoire utilisée: {memory_diff:.2f} Mo pour les données")
+    print(f"Taille moyenne: {memory_diff/total_puzzles:.2f} Mo par puzzle")
+    print(f"RSS du processus: {rss_before/(1024**2):.1f} Mo avant, {rss_after/(1024**2):.1f} Mo après le chargement")
+    if peak_rss_before is not None:
+        print(f"Pic de RSS: {peak_rss_before/(1024**2):.1f} Mo avant, {peak_rss_after/(1024**2):.1f} Mo après le chargement")
+
+    return data
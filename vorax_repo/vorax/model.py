@@ -0,0 +1,921 @@
+"""
+HybridVoraxModelV3 : modèle optimisé pour les puzzles ARC.
+
+Apprentissage (learn_from_dataset) des transformations efficaces par puzzle
+et par type de puzzle, puis prédiction (predict) de plusieurs essais par
+entrée de test : transformations apprises, programmes des puzzles voisins,
+recherche de compositions et replis.
+"""
+import gc
+import time
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+
+from analysis_memo import puzzle_content_hash
+from arc_grid import as_grid, test_inputs
+from batch_evaluator import evaluate_transformations
+from color_lut import infer_color_lut, apply_color_lut
+from incremental_learning import puzzle_contribution, plan_update, retract_puzzle
+from model_snapshot import save_snapshot, load_snapshot
+from neighbor_index import NeighborIndex, puzzle_vector
+from parallel_learning import shard_ids, map_shards, merge_partial_state
+from program_search import search_program, apply_program, apply_program_batch
+from resource_sampler import total_memory
+from shape_index import ShapeSignatureIndex, STANDARD_SHAPES, same_shape
+from submission_scheduler import attempts_entry, report_progress, reporting_progress
+from time_budget import BudgetToken
+from transform_compiler import TransformCompiler, GATHER, LUT
+from transform_profiler import TransformProfiler
+
+from .analysis import analysis_memo, analyze_puzzle, puzzle_difficulty, resource_sampler
+from .config import Config
+
+# Paramètres dont dépend l'état appris : un instantané produit avec d'autres valeurs n'est pas rechargé
+LEARNING_SETTINGS = ('PERFORMANCE_THRESHOLD', 'ENABLE_COMPLEXITY_METRICS', 'ENABLE_PROGRAM_SEARCH',
+                     'PROGRAM_SEARCH_DEPTH', 'PROGRAM_SEARCH_BUDGET')
+
+
+class HybridVoraxModelV3:
+    """Modèle hybride avancé pour la résolution des puzzles ARC."""
+
+    def __init__(self, memo=None, sampler=None):
+        """Initialisation du modèle avec métriques avancées."""
+        # Mémo partagé avec analyze_puzzle et generate_submission
+        self.memo = memo if memo is not None else analysis_memo
+        # Ressources du processus lues dans l'échantillonneur (aucune mesure par puzzle)
+        self.sampler = (sampler if sampler is not None else resource_sampler).start()
+
+        # Registres internes
+        self.puzzle_types = {}  # Types de puzzles identifiés
+        self.transformations = {}  # Transformations efficaces par puzzle
+        self.transformation_registry = {}  # Catalogue de transformations
+        self.stack_registry = {}  # Versions vectorisées (piles de grilles)
+        self.shape_registry = {}  # Fonctions de forme (h, w) -> (h', w') ou DATA_DEPENDENT
+        self.fusion_registry = {}  # Transformations fusionnables (GATHER ou LUT)
+        self.parametric_registry = {}  # Transformations paramétrées : (inférence, application)
+        self.difficulty_estimates = {}  # Difficultés estimées par puzzle
+        self.content_hashes = {}  # Manifeste : empreinte du contenu de chaque puzzle appris
+        self.contributions = {}  # Contribution de chaque puzzle aux agrégats (pour la retirer)
+        self.programs = {}  # Compositions trouvées par la recherche de programmes
+        self.neighbor_index = None  # Index des puzzles résolus (programmes gagnants)
+        self.transforms_evaluated = {}  # Transformations évaluées par puzzle à la résolution
+        self.interrupted = {}  # Résolutions arrêtées par le jeton de budget avant la fin du classement
+        self.profiler = None  # Instrumentation du registre (Config.PROFILE_TRANSFORMS)
+
+        # Métriques de performance
+        self.processing_times = {}  # Temps de traitement par puzzle
+        self.memory_usage = []  # Utilisation mémoire à différents moments
+        self.success_rates = {}  # Taux de réussite par type de transformation
+
+        # Métriques d'apprentissage
+        self.learning_curve = []  # Progression d'apprentissage
+        self.error_patterns = defaultdict(int)  # Patterns d'erreurs identifiés
+        self.confusion_matrix = {}  # Matrice de confusion des transformations
+
+        # Initialiser le registre des transformations
+        self._initialize_transformations()
+
+    def _initialize_transformations(self):
+        """Initialise le catalogue de transformations disponibles."""
+        # Transformations de base
+        self.transformation_registry.update({
+            "identity": lambda grid: np.array(grid),
+            "flip_horizontal": lambda grid: np.fliplr(np.asarray(grid)),
+            "flip_vertical": lambda grid: np.flipud(np.asarray(grid)),
+            "rotate_90": lambda grid: np.rot90(np.asarray(grid), k=3),
+            "rotate_180": lambda grid: np.rot90(np.asarray(grid), k=2),
+            "rotate_270": lambda grid: np.rot90(np.asarray(grid), k=1),
+        })
+
+        # Versions vectorisées sur des piles (k, h, w) pour l'évaluation groupée
+        self.stack_registry.update({
+            "identity": lambda stack: stack,
+            "flip_horizontal": lambda stack: stack[:, :, ::-1],
+            "flip_vertical": lambda stack: stack[:, ::-1, :],
+            "rotate_90": lambda stack: np.rot90(stack, k=3, axes=(1, 2)),
+            "rotate_180": lambda stack: np.rot90(stack, k=2, axes=(1, 2)),
+            "rotate_270": lambda stack: np.rot90(stack, k=1, axes=(1, 2)),
+            "flip_and_rotate": lambda stack: np.rot90(stack[:, :, ::-1], k=3, axes=(1, 2)),
+        })
+
+        # Formes de sortie déclarées, pour élaguer avant exécution
+        self.shape_registry.update(STANDARD_SHAPES)
+        self.shape_registry["color_lut"] = same_shape
+
+        # Transformations avancées
+        self.transformation_registry.update({
+            "invert_colors": self._invert_colors,
+            "expand_2x": lambda grid: self._expand(grid, factor=2),
+            "expand_3x": lambda grid: self._expand(grid, factor=3),
+            "remove_borders": self._remove_borders,
+            "add_borders": self._add_borders,
+            "extract_pattern": self._extract_pattern,
+            "apply_mask": self._apply_mask,
+            "crop_to_content": self._crop_to_content,
+            "color_remap": self._color_remap,
+        })
+
+        # Transformations composites (combinaisons)
+        self.transformation_registry.update({
+            "flip_and_rotate": lambda grid: self._flip_and_rotate(grid),
+            "extract_and_expand": lambda grid: self._extract_and_expand(grid),
+            "adaptive_transform": lambda grid: self._adaptive_transform(grid),
+        })
+
+        # Transformations paramétrées : paramètres inférés une fois par puzzle
+        self.parametric_registry.update({
+            "color_lut": (infer_color_lut, apply_color_lut),
+        })
+        for name in self.parametric_registry:
+            self.transformation_registry[name] = self._unbound_transform
+
+        # Transformations fusionnables : réarrangements de cellules et tables de couleurs
+        self.fusion_registry.update({
+            "identity": GATHER,
+            "flip_horizontal": GATHER,
+            "flip_vertical": GATHER,
+            "rotate_90": GATHER,
+            "rotate_180": GATHER,
+            "rotate_270": GATHER,
+            "expand_2x": GATHER,
+            "expand_3x": GATHER,
+            "remove_borders": GATHER,
+            "add_borders": GATHER,
+            "flip_and_rotate": GATHER,
+            "invert_colors": LUT,
+            "apply_mask": LUT,
+        })
+
+        # Index des transformations par signature de forme (entrée -> sortie)
+        self.shape_index = ShapeSignatureIndex(self.transformation_registry, self.shape_registry)
+
+        # Instrumentation optionnelle (appels, temps, erreurs, octets) ; registres inchangés sinon
+        if Config.PROFILE_TRANSFORMS:
+            self.profiler = TransformProfiler()
+
+        # Compilateur de fusion (exécutions mesurées par le profileur) ; les versions
+        # compilées complètent les versions vectorisées
+        self.compiler = TransformCompiler(self.transformation_registry, self.fusion_registry, self.profiler)
+        self.stack_registry = {**self.compiler.stack_transforms(), **self.stack_registry}
+
+        if self.profiler is not None:
+            unbound = {name: self.transformation_registry[name] for name in self.parametric_registry}
+            self.transformation_registry = {**self.profiler.instrument(self.transformation_registry), **unbound}
+            self.stack_registry = self.profiler.instrument(self.stack_registry, suffix=' (pile)')
+
+        # Initialiser les taux de succès
+        for name in self.transformation_registry:
+            self.success_rates[name] = {'successes': 0, 'attempts': 0, 'rate': 0.0}
+
+    def reset_learning_state(self):
+        """Oublie l'état appris (registres conservés), comme un modèle neuf ; un worker réutilise ainsi son modèle."""
+        self.puzzle_types = {}
+        self.transformations = {}
+        self.difficulty_estimates = {}
+        self.content_hashes = {}
+        self.contributions = {}
+        self.programs = {}
+        self.neighbor_index = None
+        self.transforms_evaluated = {}
+        self.interrupted = {}
+        self.processing_times = {}
+        self.memory_usage = []
+        self.learning_curve = []
+        self.error_patterns = defaultdict(int)
+        self.confusion_matrix = {}
+        self.success_rates = {name: {'successes': 0, 'attempts': 0, 'rate': 0.0}
+                              for name in self.transformation_registry}
+        self.shape_index.reset_stats()
+        if self.profiler is not None:
+            self.profiler.reset()
+
+    # Fonctions de transformation
+    def _unbound_transform(self, grid):
+        """Transformation paramétrée sans paramètres inférés pour ce puzzle."""
+        raise ValueError("Paramètres non inférés pour ce puzzle")
+
+    def _bound_registry(self, puzzle):
+        """Registre dont les transformations paramétrées sont liées aux paramètres du puzzle.
+
+        Les paramètres sont inférés une seule fois par contenu de puzzle (mémo) ;
+        une transformation dont l'inférence échoue reste non liée.
+        """
+        if not self.parametric_registry:
+            return self.transformation_registry
+
+        registry = dict(self.transformation_registry)
+        puzzle_hash = puzzle_content_hash(puzzle)
+        for name, (infer, apply) in self.parametric_registry.items():
+            params = self.memo.get_or_compute(
+                ('params', puzzle_hash, name),
+                lambda: infer(puzzle.get('train', []))
+            )
+            if params is not None:
+                registry[name] = partial(apply, params)
+                if self.profiler is not None:
+                    registry[name] = self.profiler.wrap(name, registry[name])
+        return registry
+
+    def _invert_colors(self, grid):
+        """Inverse les valeurs 0 et 1 dans une grille."""
+        grid = np.array(grid)
+        mask_0 = (grid == 0)
+        mask_1 = (grid == 1)
+        grid[mask_0] = 1
+        grid[mask_1] = 0
+        return grid
+
+    def _expand(self, grid, factor=2):
+        """Agrandit chaque cellule par un facteur donné."""
+        grid = np.asarray(grid)
+        h, w = grid.shape
+        expanded = np.zeros((h*factor, w*factor), dtype=grid.dtype)
+
+        for i in range(h):
+            for j in range(w):
+                expanded[i*factor:(i+1)*factor, j*factor:(j+1)*factor] = grid[i, j]
+
+        return expanded
+
+    def _remove_borders(self, grid, border_width=1):
+        """Supprime les bordures de la grille."""
+        grid = np.asarray(grid)
+        if grid.shape[0] <= 2*border_width or grid.shape[1] <= 2*border_width:
+            return grid
+        return grid[border_width:-border_width, border_width:-border_width]
+
+    def _add_borders(self, grid, border_width=1, border_value=0):
+        """Ajoute des bordures à la grille."""
+        grid = np.asarray(grid)
+        h, w = grid.shape
+        new_grid = np.full((h + 2*border_width, w + 2*border_width), border_value, dtype=grid.dtype)
+        new_grid[border_width:h+border_width, border_width:w+border_width] = grid
+        return new_grid
+
+    def _extract_pattern(self, grid):
+        """Extrait un motif de la grille en ne gardant que les éléments non-zéro."""
+        grid = np.asarray(grid)
+        mask = grid > 0
+        if not np.any(mask):
+            return grid
+
+        # Trouver les limites du motif
+        rows = np.any(mask, axis=1)
+        cols = np.any(mask, axis=0)
+        rmin, rmax = np.where(rows)[0][[0, -1]]
+        cmin, cmax = np.where(cols)[0][[0, -1]]
+
+        # Extraire et retourner le motif
+        return grid[rmin:rmax+1, cmin:cmax+1]
+
+    def _apply_mask(self, grid, mask_value=1):
+        """Applique un masque (ne garde que les valeurs égales à mask_value)."""
+        grid = np.asarray(grid)
+        result = np.zeros_like(grid)
+        result[grid == mask_value] = mask_value
+        return result
+
+    def _crop_to_content(self, grid):
+        """Recadre la grille pour éliminer les bordures vides."""
+        return self._extract_pattern(grid)
+
+    def _color_remap(self, grid):
+        """Remappe les couleurs en fonction de leur fréquence."""
+        grid = np.asarray(grid)
+        unique, counts = np.unique(grid, return_counts=True)
+        sorted_colors = [color for _, color in sorted(zip(counts, unique), reverse=True)]
+
+        result = np.zeros_like(grid)
+        for new_val, old_val in enumerate(sorted_colors):
+            result[grid == old_val] = new_val
+
+        return result
+
+    # Transformations composites
+    def _flip_and_rotate(self, grid):
+        """Combine un flip horizontal et une rotation de 90 degrés."""
+        return np.rot90(np.fliplr(np.asarray(grid)), k=3)
+
+    def _extract_and_expand(self, grid):
+        """Extrait un motif puis l'agrandit."""
+        pattern = self._extract_pattern(grid)
+        return self._expand(pattern, factor=2)
+
+    def _adaptive_transform(self, grid):
+        """Transformation adaptative en fonction des caractéristiques de la grille."""
+        grid = np.asarray(grid)
+        unique_vals = np.unique(grid)
+
+        # Si grille binaire, inverser les couleurs
+        if len(unique_vals) <= 2 and 0 in unique_vals and 1 in unique_vals:
+            return self._invert_colors(grid)
+        # Si grille carrée, rotation
+        elif grid.shape[0] == grid.shape[1]:
+            return np.rot90(grid, k=1)
+        # Si grille rectangulaire, flip
+        elif grid.shape[0] != grid.shape[1]:
+            return np.fliplr(grid)
+        # Par défaut
+        else:
+            return grid.copy()
+
+    def analyze_puzzle(self, puzzle_id, puzzle):
+        """Analyse détaillée d'un puzzle avec métriques avancées."""
+        t_start = time.time()
+
+        # Extraire les caractéristiques
+        features = analyze_puzzle(puzzle)
+
+        # Estimer la difficulté
+        difficulty = puzzle_difficulty(puzzle)
+        self.difficulty_estimates[puzzle_id] = difficulty
+
+        # Tester les transformations sur ce puzzle (matrice de correspondance)
+        transform_results = self._test_transformations(puzzle)
+
+        # Déterminer le type de puzzle
+        puzzle_type = self._determine_puzzle_type(features, transform_results)
+
+        # Mettre à jour les statistiques globales
+        transform_rates = transform_results.rates()
+        for transform_name, success_rate in transform_rates.items():
+            self.success_rates[transform_name]['attempts'] += 1
+            if success_rate > Config.PERFORMANCE_THRESHOLD:
+                self.success_rates[transform_name]['successes'] += 1
+            self.success_rates[transform_name]['rate'] = (
+                self.success_rates[transform_name]['successes'] /
+                self.success_rates[transform_name]['attempts']
+            )
+
+        # Trouver la meilleure transformation
+        best_transform, best_rate = transform_results.best()
+        solved = bool(best_transform) and best_rate > Config.PERFORMANCE_THRESHOLD
+
+        # Manifeste et contribution, pour l'apprentissage incrémental
+        self.content_hashes[puzzle_id] = puzzle_content_hash(puzzle)
+        self.contributions[puzzle_id] = puzzle_contribution(
+            transform_rates, Config.PERFORMANCE_THRESHOLD, puzzle_type if solved else None
+        )
+
+        if solved:
+            self.transformations[puzzle_id] = (best_transform, best_rate)
+
+            # Enregistrer dans le type de puzzle
+            if puzzle_type not in self.puzzle_types:
+                self.puzzle_types[puzzle_type] = {
+                    'examples': [],
+                    'transformations': {},
+                    'difficulty_sum': 0.0
+                }
+
+            self.puzzle_types[puzzle_type]['examples'].append(puzzle_id)
+            self.puzzle_types[puzzle_type]['transformations'][best_transform] = (
+                self.puzzle_types[puzzle_type]['transformations'].get(best_transform, 0) + 1
+            )
+            self.puzzle_types[puzzle_type]['difficulty_sum'] += difficulty
+
+            # Log pour les puzzles difficiles ou les multiples de LOG_INTERVAL
+            if difficulty > Config.DETAILED_LOG_THRESHOLD or len(self.transformations) % Config.LOG_INTERVAL == 0:
+                print(f"Puzzle {puzzle_id} - Type: {puzzle_type} - Difficulté: {difficulty:.1f}/10")
+                print(f"  Solution: {best_transform} (taux: {best_rate:.2%})")
+
+        # Enregistrer le temps de traitement
+        t_end = time.time()
+        self.processing_times[puzzle_id] = t_end - t_start
+
+        # Suivi périodique de la mémoire (dernier échantillon : RSS du processus)
+        if len(self.memory_usage) == 0 or len(self.transformations) % Config.MEMORY_TRACKING_INTERVAL == 0:
+            sample = self.sampler.latest()
+            previous = self.memory_usage[-1]['memory_used'] if self.memory_usage else sample['rss']
+            self.memory_usage.append({
+                'puzzles_processed': len(self.transformations),
+                'memory_used': sample['rss'],
+                'memory_diff': sample['rss'] - previous,
+                'cpu_time': sample['cpu_time'],
+                'timestamp': datetime.now().isoformat()
+            })
+
+        # Enregistrer la progression d'apprentissage
+        if len(self.learning_curve) == 0 or len(self.transformations) % Config.LOG_INTERVAL == 0:
+            success_count = len(self.transformations)
+            total_processed = len(self.processing_times)
+            success_rate = success_count / total_processed if total_processed > 0 else 0
+            sample = self.sampler.latest()
+
+            self.learning_curve.append({
+                'puzzles_processed': total_processed,
+                'puzzles_solved': success_count,
+                'success_rate': success_rate,
+                'elapsed_time': sum(self.processing_times.values()),
+                'rss': sample['rss'],
+                'cpu_time': sample['cpu_time'],
+                'timestamp': datetime.now().isoformat()
+            })
+
+        return {
+            'puzzle_id': puzzle_id,
+            'difficulty': difficulty,
+            'type': puzzle_type,
+            'best_transform': best_transform,
+            'transform_rate': best_rate,
+            'processing_time': self.processing_times[puzzle_id],
+            'features': features
+        }
+
+    def _test_transformations(self, puzzle, stats=None):
+        """Teste toutes les transformations disponibles sur un puzzle.
+
+        Retourne une MatchMatrix (transformations x exemples) calculée en une
+        seule passe groupée sur les paires d'entraînement, une seule fois par
+        contenu de puzzle grâce au mémo. Les transformations qui ne peuvent pas
+        produire la forme de sortie attendue ne sont pas exécutées ; le nombre
+        de transformations exécutées est écrit dans stats['executed'] (0 si la
+        matrice vient du mémo).
+        """
+        if stats is not None:
+            stats['executed'] = 0
+
+        def _evaluate():
+            registry = self._bound_registry(puzzle)
+            # Les transformations paramétrées liées s'appliquent aussi aux piles
+            stack_transforms = dict(self.stack_registry)
+            for name in self.parametric_registry:
+                if registry[name] != self._unbound_transform:
+                    stack_transforms[name] = registry[name]
+            return evaluate_transformations(
+                registry,
+                puzzle.get('train', []),
+                stack_transforms=stack_transforms,
+                memo=self.memo,
+                shape_index=self.shape_index,
+                parametric=tuple(self.parametric_registry),
+                stats=stats
+            )
+
+        return self.memo.get_or_compute(('matches', puzzle_content_hash(puzzle)), _evaluate)
+
+    def _search_program(self, puzzle, token=None):
+        """Cherche une composition de transformations cohérente avec toutes les paires.
+
+        Le résultat (programme ou None) est mémorisé par contenu de puzzle ; une
+        recherche interrompue par le budget (ou par le jeton) n'est pas mémorisée.
+
+        Retourne (programme ou None, vrai si la recherche a été arrêtée par le jeton).
+        """
+        key = ('program', puzzle_content_hash(puzzle), Config.PROGRAM_SEARCH_DEPTH)
+        if key in self.memo:
+            return self.memo.get(key), False
+
+        program, search_stats = search_program(
+            self._bound_registry(puzzle),
+            puzzle.get('train', []),
+            max_depth=Config.PROGRAM_SEARCH_DEPTH,
+            time_budget=Config.PROGRAM_SEARCH_BUDGET,
+            shape_functions=self.shape_registry,
+            compiler=self.compiler,
+            token=token
+        )
+        if not search_stats['timeout']:
+            self.memo.put(key, program)
+        return program, search_stats['timeout'] and token is not None and token.expired()
+
+    def _determine_puzzle_type(self, features, transforms):
+        """Détermine le type d'un puzzle en fonction de ses caractéristiques et transformations."""
+        # Chercher d'abord une transformation évidente
+        best_transform, best_rate = transforms.best()
+
+        if best_rate > 0.8:  # Seuil de 80% de réussite
+            return f"transformation_{best_transform}"
+
+        # Sinon, utiliser les caractéristiques
+        if any(features.get('size_change', [])):
+            if all(o[0] > i[0] and o[1] > i[1] for i, o in zip(features.get('input_dims', []), features.get('output_dims', []))):
+                return "size_increase"
+            elif all(o[0] < i[0] and o[1] < i[1] for i, o in zip(features.get('input_dims', []), features.get('output_dims', []))):
+                return "size_decrease"
+            else:
+                return "size_change"
+
+        if features.get('new_values', []):
+            return "value_creation"
+
+        if features.get('removed_values', []):
+            return "value_removal"
+
+        # Si des métriques de complexité sont disponibles
+        if Config.ENABLE_COMPLEXITY_METRICS and 'complexity_change' in features:
+            if features['complexity_change'] > 0:
+                return "complexity_increase"
+            elif features['complexity_change'] < 0:
+                return "complexity_decrease"
+
+        # Type par défaut
+        return "pattern_manipulation"
+
+    def _analyze_batches(self, puzzles, puzzle_ids, n_workers):
+        """Analyse les puzzles séquentiellement, ou par lots en parallèle (résultats identiques)."""
+        if n_workers <= 1 or len(puzzle_ids) <= Config.CHUNK_SIZE:
+            for puzzle_id in puzzle_ids:
+                yield [self.analyze_puzzle(puzzle_id, puzzles[puzzle_id])]
+            return
+
+        shards = shard_ids(puzzle_ids, Config.CHUNK_SIZE)
+        print(f"Mode parallèle: {n_workers} workers, {len(shards)} lots de {Config.CHUNK_SIZE} puzzles max")
+
+        # Les états partiels arrivent dans l'ordre des lots et sont fusionnés dans cet ordre
+        for partial in map_shards(type(self), puzzles, shards, n_workers):
+            merge_partial_state(self, partial)
+            print(partial['log'], end='')
+            yield partial['results']
+
+    def learn_from_dataset(self, puzzles, max_puzzles=None, n_workers=None):
+        """Apprentissage sur un ensemble complet de puzzles avec métriques détaillées."""
+        if n_workers is None:
+            n_workers = Config.N_WORKERS
+
+        # Temps et mémoire initiaux
+        start_time = time.time()
+        self.sampler.mark('learn')
+        memory_start = self.sampler.latest()
+        memory_limit = (total_memory() or 0) * Config.MEMORY_ALERT_FRACTION
+        self.shape_index.reset_stats()
+
+        # Initialiser le compteur et les métriques
+        puzzles_processed = 0
+        puzzle_results = []
+        success_count = 0
+
+        # Limiter le nombre de puzzles si spécifié
+        puzzle_ids = list(puzzles.keys())
+        if max_puzzles and max_puzzles < len(puzzle_ids):
+            puzzle_ids = puzzle_ids[:max_puzzles]
+
+        # Apprentissage incrémental : retirer les puzzles supprimés ou modifiés,
+        # n'analyser que les puzzles ajoutés ou modifiés
+        if self.content_hashes:
+            plan = plan_update(self.content_hashes, puzzles, puzzle_ids)
+            for puzzle_id in plan['removed'] + plan['changed']:
+                retract_puzzle(self, puzzle_id)
+            print(f"\nApprentissage incrémental: {len(plan['added'])} ajoutés, {len(plan['changed'])} modifiés, "
+                  f"{len(plan['removed'])} retirés, {len(plan['unchanged'])} inchangés")
+            pending = set(plan['added']) | set(plan['changed'])
+            puzzle_ids = [puzzle_id for puzzle_id in puzzle_ids if puzzle_id in pending]
+
+        total_puzzles = len(puzzle_ids)
+        print(f"\n=== APPRENTISSAGE SUR {total_puzzles} PUZZLES ===")
+        print(f"RSS initiale du processus: {memory_start['rss']/(1024**3):.2f} Go")
+        print(f"\nTraitement en cours, veuillez patienter...")
+
+        # Traiter chaque puzzle (un par un, ou lot par lot en mode parallèle)
+        for result in (r for batch in self._analyze_batches(puzzles, puzzle_ids, n_workers) for r in batch):
+            puzzle_id = result['puzzle_id']
+            puzzle_results.append(result)
+            puzzles_processed += 1
+
+            # Compter les succès
+            if puzzle_id in self.transformations:
+                success_count += 1
+
+            # Afficher la progression à intervalle régulier
+            if puzzles_processed % Config.LOG_INTERVAL == 0 or puzzles_processed == total_puzzles:
+                elapsed_time = time.time() - start_time
+                memory_current = self.sampler.latest()
+
+                # Calculer les métriques actuelles
+                speed = puzzles_processed / elapsed_time if elapsed_time > 0 else 0
+                eta = (total_puzzles - puzzles_processed) / speed if speed > 0 else 0
+                success_rate = success_count / puzzles_processed * 100
+
+                print(f"\nProgression: {puzzles_processed}/{total_puzzles} puzzles ({puzzles_processed/total_puzzles*100:.1f}%)")
+                print(f"Temps écoulé: {elapsed_time:.1f}s | Vitesse: {speed:.2f} puzzles/s | ETA: {eta:.1f}s")
+                print(f"Taux de résolution: {success_count}/{puzzles_processed} ({success_rate:.1f}%)")
+                print(f"RSS du processus: {memory_current['rss']/(1024**3):.2f} Go")
+                print(f"Augmentation RSS: {(memory_current['rss'] - memory_start['rss'])/(1024**3):.2f} Go")
+                print(f"Types de puzzles identifiés: {len(self.puzzle_types)}")
+
+                # Libérer de la mémoire si nécessaire
+                if memory_limit and memory_current['rss'] > memory_limit:
+                    print("⚠️ Utilisation mémoire élevée, exécution du garbage collector...")
+                    gc.collect()
+
+                # Afficher les types de puzzles les plus fréquents
+                if self.puzzle_types:
+                    type_counts = [
+                        (ptype, len(data['examples']))
+                        for ptype, data in self.puzzle_types.items()
+                    ]
+                    type_counts.sort(key=lambda x: x[1], reverse=True)
+
+                    print("\nTop 3 des types de puzzles:")
+                    for i, (ptype, count) in enumerate(type_counts[:3]):
+                        avg_difficulty = (
+                            self.puzzle_types[ptype]['difficulty_sum'] / count
+                            if count > 0 else 0
+                        )
+                        print(f"  {i+1}. {ptype}: {count} puzzles (difficulté moyenne: {avg_difficulty:.1f}/10)")
+
+        # Métriques finales
+        total_time = time.time() - start_time
+        resources = self.sampler.phase_stats('learn')
+
+        print(f"\n=== APPRENTISSAGE TERMINÉ ===")
+        print(f"Temps total: {total_time:.1f} secondes")
+        print(f"Vitesse moyenne: {puzzles_processed/total_time if total_time > 0 else 0:.2f} puzzles/seconde")
+        print(f"Taux de résolution: {success_count}/{puzzles_processed} "
+              f"({success_count/puzzles_processed*100 if puzzles_processed else 0:.1f}%)")
+        print(f"RSS finale du processus: {resources['rss_end']/(1024**3):.2f} Go "
+              f"(max {resources['rss_max']/(1024**3):.2f} Go, {resources['rss_delta']/(1024**3):+.2f} Go)")
+        print(f"CPU du processus principal: {resources['cpu_time']:.1f}s ({resources['cpu_percent']:.0f}% du temps écoulé)")
+        if resources['traced_peak']:
+            print(f"Pic tracemalloc: {resources['traced_peak']/(1024**2):.1f} Mo")
+        print(f"FLOPS estimés: {puzzles_processed * 1000 / total_time if total_time > 0 else 0:.0f} kFLOPS")
+        print(f"{len(self.puzzle_types)} types de puzzles identifiés")
+
+        memo_stats = self.memo.stats()
+        print(f"Mémo: {memo_stats['hits']} hits / {memo_stats['misses']} misses "
+              f"({memo_stats['hit_rate']*100:.1f}%), {memo_stats['entries']} entrées, "
+              f"{memo_stats['bytes']/(1024**2):.1f} Mo, {memo_stats['evictions']} évictions")
+
+        shape_stats = self.shape_index.stats()
+        print(f"Élagage par forme: {shape_stats['pruned']} exécutions évitées / "
+              f"{shape_stats['evaluated'] + shape_stats['pruned']} ({shape_stats['pruned_rate']*100:.1f}%), "
+              f"{shape_stats['data_dependent']} dépendantes des données")
+
+        self.build_neighbor_index(puzzles)
+        print(f"Index des voisins: {len(self.neighbor_index)} puzzles résolus")
+
+        if self.profiler is not None:
+            print(f"\nTransformations les plus coûteuses (temps cumulé):")
+            print(self.profiler.format_table(Config.TOP_N_TRANSFORMATIONS))
+
+        return puzzles_processed
+
+    def build_neighbor_index(self, puzzles):
+        """Construit l'index des puzzles résolus, étiquetés par leur programme gagnant."""
+        puzzle_ids = [puzzle_id for puzzle_id in self.transformations if puzzle_id in puzzles]
+        vectors = [puzzle_vector(analyze_puzzle(puzzles[puzzle_id])) for puzzle_id in puzzle_ids]
+        labels = [(self.transformations[puzzle_id][0],) for puzzle_id in puzzle_ids]
+        self.neighbor_index = NeighborIndex(puzzle_ids, vectors, labels)
+        return self.neighbor_index
+
+    def _verify_program(self, registry, program, train_examples):
+        """Vrai si le programme reproduit toutes les paires d'entraînement (arrêt au premier échec)."""
+        verified = 0
+        for example in train_examples:
+            if 'input' not in example or 'output' not in example:
+                continue
+            try:
+                result = apply_program(registry, program, example['input'], self.compiler)
+            except Exception:
+                return False
+            if not np.array_equal(result, example['output']):
+                return False
+            verified += 1
+        return verified > 0
+
+    def learning_settings(self):
+        """Paramètres de Config qui déterminent l'état appris (inclus dans la version de l'instantané)."""
+        return {name: getattr(Config, name) for name in LEARNING_SETTINGS}
+
+    def save(self, path, dataset_hash=None):
+        """Sauvegarde l'état appris (instantané .npz versionné)."""
+        return save_snapshot(self, path, dataset_hash)
+
+    @classmethod
+    def load(cls, path, puzzles=None, memo=None):
+        """Recharge un modèle sauvegardé par save() ; l'index des voisins est reconstruit depuis puzzles."""
+        model = cls(memo)
+        load_snapshot(model, path)
+        if puzzles is not None:
+            model.build_neighbor_index(puzzles)
+        return model
+
+    def get_statistics(self):
+        """Génère des statistiques détaillées sur l'apprentissage."""
+        stats = {}
+
+        # Nombres totaux
+        stats["total_puzzles_processed"] = len(self.processing_times)
+        stats["total_puzzles_solved"] = len(self.transformations)
+        stats["success_rate"] = (
+            stats["total_puzzles_solved"] / stats["total_puzzles_processed"]
+            if stats["total_puzzles_processed"] > 0 else 0
+        )
+
+        # Types de puzzles
+        type_counts = {}
+        type_difficulties = {}
+        for ptype, data in self.puzzle_types.items():
+            example_count = len(data['examples'])
+            type_counts[ptype] = example_count
+            type_difficulties[ptype] = data['difficulty_sum'] / example_count if example_count > 0 else 0
+
+        stats["type_counts"] = type_counts
+        stats["type_difficulties"] = type_difficulties
+
+        # Transformations les plus efficaces
+        transform_counts = defaultdict(int)
+        for puzzle_id, (transform, rate) in self.transformations.items():
+            transform_counts[transform] += 1
+
+        stats["transform_counts"] = dict(transform_counts)
+        stats["success_rates"] = self.success_rates
+        if self.transforms_evaluated:
+            stats["avg_transforms_evaluated"] = sum(self.transforms_evaluated.values()) / len(self.transforms_evaluated)
+        stats["shape_pruning"] = self.shape_index.stats()
+
+        # Performance
+        if self.processing_times:
+            stats["avg_processing_time"] = sum(self.processing_times.values()) / len(self.processing_times)
+            stats["max_processing_time"] = max(self.processing_times.values())
+            stats["min_processing_time"] = min(self.processing_times.values())
+            stats["total_processing_time"] = sum(self.processing_times.values())
+
+        # Difficulté
+        if self.difficulty_estimates:
+            difficulties = list(self.difficulty_estimates.values())
+            stats["avg_difficulty"] = sum(difficulties) / len(difficulties)
+            stats["max_difficulty"] = max(difficulties)
+            stats["min_difficulty"] = min(difficulties)
+
+            # Distribution de difficulté
+            difficulty_distribution = defaultdict(int)
+            for d in difficulties:
+                difficulty_distribution[int(d)] += 1
+            stats["difficulty_distribution"] = dict(difficulty_distribution)
+
+        # Courbe d'apprentissage
+        stats["learning_curve"] = self.learning_curve
+
+        # Utilisation de la mémoire
+        stats["memory_usage"] = self.memory_usage
+
+        return stats
+
+    def _apply_programs(self, registry, programs, test_grids, n_attempts):
+        """Les n_attempts premiers programmes applicables, appliqués à toutes les entrées de test.
+
+        Retourne (essais, programmes utilisés).
+        """
+        attempts, used = [], []
+        for program in programs:
+            try:
+                attempts.append(apply_program_batch(registry, program, test_grids, self.compiler))
+            except Exception:
+                continue
+            used.append(program)
+            if len(attempts) == n_attempts:
+                break
+        return attempts, used
+
+    def _report_programs(self, registry, programs, test_grids, n_attempts):
+        """Rapporte à l'ordonnanceur les essais des programmes déjà vérifiés (complétés par l'entrée).
+
+        Dans un worker de soumission, cette réponse remplace le repli identité
+        si le worker est interrompu pendant la suite du classement.
+        """
+        if not programs or not reporting_progress():
+            return
+        attempts, _ = self._apply_programs(registry, programs, test_grids, n_attempts)
+        if attempts:
+            attempts.extend([test_grids] * (n_attempts - len(attempts)))
+            report_progress(attempts_entry(attempts))
+
+    def _ranked_programs(self, puzzle_id, puzzle, features, registry, test_grids, n_attempts, token):
+        """Programmes cohérents classés, une seule fois par puzzle.
+
+        Ordre : programmes vérifiés des plus proches voisins, transformations
+        reproduisant toutes les paires, composition trouvée par la recherche,
+        puis meilleure transformation partielle (taux > 0.5). Le registre n'est
+        évalué que si les voisins ne fournissent pas n_attempts programmes ; le
+        classement s'arrête avec les programmes déjà trouvés dès que le jeton expire.
+        Les programmes vérifiés sont rapportés (_report_programs) avant chaque
+        étape coûteuse : évaluation du registre, recherche de programmes.
+
+        Retourne (programmes, nombre de transformations évaluées — programmes
+        des voisins vérifiés et transformations du registre réellement
+        exécutées —, MatchMatrix ou None, vrai si le jeton a interrompu le
+        classement).
+        """
+        programs = []
+        evaluated = 0
+        if self.neighbor_index is not None:
+            for program in self.neighbor_index.ranked_labels(puzzle_vector(features), Config.NEIGHBOR_K):
+                if token.expired():
+                    return programs, evaluated, None, True
+                evaluated += 1
+                if self._verify_program(registry, program, puzzle.get('train', [])):
+                    programs.append(program)
+                    if len(programs) >= n_attempts:
+                        return programs, evaluated, None, False
+
+        # Sinon, évaluer tout le registre
+        if token.expired():
+            return programs, evaluated, None, True
+        self._report_programs(registry, programs, test_grids, n_attempts)
+        evaluation = {}
+        transform_results = self._test_transformations(puzzle, evaluation)
+        evaluated += evaluation['executed']
+        best_transform, best_rate = transform_results.best()
+        programs.extend((name,) for name in transform_results.consistent())
+
+        # Aucune transformation ne reproduit tous les exemples : chercher une composition
+        interrupted = False
+        if Config.ENABLE_PROGRAM_SEARCH and best_rate < 1.0:
+            if token.expired():
+                interrupted = True
+            else:
+                self._report_programs(registry, programs, test_grids, n_attempts)
+                program, interrupted = self._search_program(puzzle, token)
+                if program:
+                    programs.append(program)
+                    self.programs[puzzle_id] = program
+
+        # Meilleure transformation partielle
+        if best_transform and 0.5 < best_rate < 1.0:
+            programs.append((best_transform,))
+
+        return list(dict.fromkeys(programs)), evaluated, transform_results, interrupted
+
+    def _fallback_solution(self, features, transform_results, test_input):
+        """Réponse sans programme cohérent : agrandissement selon le type de puzzle, sinon l'entrée."""
+        puzzle_type = self._determine_puzzle_type(features, transform_results)
+        if puzzle_type == "size_increase" and features.get('size_ratios'):
+            ratio = sum(features['size_ratios']) / len(features['size_ratios'])
+            if ratio > 1.5 and ratio < 4.5:  # Ratio raisonnable entre 1.5x et 4.5x
+                factor = int(round(ratio**0.5))  # Facteur d'expansion approximatif
+                return self._expand(test_input, factor=factor)
+        return np.asarray(test_input)
+
+    def predict(self, puzzle_id, puzzle, n_attempts=None, token=None):
+        """Prédit toutes les entrées de test d'un puzzle avec n_attempts essais chacune.
+
+        Les programmes sont classés une seule fois ; les n_attempts premiers sont
+        appliqués à toutes les entrées de test en une passe groupée, le second
+        essai ne coûte donc aucune recherche supplémentaire. Le jeton de budget
+        (BudgetToken) interrompt le classement et la recherche de programmes ;
+        self.interrupted[puzzle_id] indique si la réponse en a été tronquée.
+
+        Returns:
+            liste (une entrée par test) de {'attempt_1': grille, 'attempt_2': grille, ...}
+        """
+        if n_attempts is None:
+            n_attempts = Config.N_ATTEMPTS
+        if token is None:
+            token = BudgetToken()
+        t_start = time.time()
+
+        test_grids = [as_grid(grid) for grid in test_inputs(puzzle)]
+        if not test_grids:
+            return attempts_entry([[[[0]]]] * n_attempts)
+
+        self.interrupted[puzzle_id] = False
+        try:
+            # Analyser le puzzle
+            features = analyze_puzzle(puzzle)
+            difficulty = puzzle_difficulty(puzzle)
+            registry = self._bound_registry(puzzle)
+
+            programs, evaluated, transform_results, self.interrupted[puzzle_id] = self._ranked_programs(
+                puzzle_id, puzzle, features, registry, test_grids, n_attempts, token
+            )
+            self.transforms_evaluated[puzzle_id] = evaluated
+
+            # Les meilleurs programmes appliqués à toutes les entrées de test
+            attempts, used = self._apply_programs(registry, programs, test_grids, n_attempts)
+
+            if used:
+                self.processing_times[puzzle_id] = time.time() - t_start
+                if Config.ENABLE_COMPLEXITY_METRICS and difficulty > Config.DETAILED_LOG_THRESHOLD:
+                    print(f"Puzzle {puzzle_id} résolu: " + " | ".join(' ∘ '.join(reversed(p)) for p in used)
+                          + f" ({evaluated} évaluation(s)) en {(time.time()-t_start)*1000:.1f}ms")
+
+            # Essais restants : approche par défaut selon le type de puzzle (l'entrée si le budget est épuisé)
+            if len(attempts) < n_attempts:
+                if transform_results is None:
+                    if token.expired():
+                        self.interrupted[puzzle_id] = True
+                    else:
+                        transform_results = self._test_transformations(puzzle)
+                if transform_results is None:
+                    fallback = test_grids
+                else:
+                    fallback = [self._fallback_solution(features, transform_results, grid) for grid in test_grids]
+                attempts.extend([fallback] * (n_attempts - len(attempts)))
+
+            return attempts_entry(attempts)
+
+        except Exception as e:
+            # En cas d'erreur, retourner les entrées de test
+            if Config.ENABLE_ERROR_ANALYSIS:
+                print(f"❌ Erreur lors de la résolution du puzzle {puzzle_id}: {str(e)}")
+            return attempts_entry([test_grids] * n_attempts)
+
+    def solve(self, puzzle_id, puzzle, token=None):
+        """Résout un puzzle en utilisant les connaissances acquises (premier essai, premier test)."""
+        if not test_inputs(puzzle):
+            return [[0]]
+        return self.predict(puzzle_id, puzzle, n_attempts=1, token=token)[0]['attempt_1']
@@ -0,0 +1,194 @@
+"""
+Génération de la soumission Kaggle sous échéance globale.
+"""
+import os
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from submission_scheduler import report_progress, run_with_deadline, identity_attempts
+
+from . import config
+from .analysis import puzzle_difficulty, resource_sampler
+from .config import Config
+
+
+# Modèle utilisé par les workers (hérité par fork, fixé par generate_submission)
+_worker_model = None
+
+
+def _solve_and_classify(puzzle_id, puzzle_data, token):
+    """Tâche exécutée dans un worker : essais pour chaque entrée de test puis type du puzzle.
+
+    Les essais sont rapportés à l'ordonnanceur avant la classification, qui
+    n'est faite que s'il reste du budget : un worker interrompu pendant
+    celle-ci ne perd pas une réponse terminée.
+    """
+    t_start = time.time()
+    solution = _worker_model.predict(puzzle_id, puzzle_data, token=token)
+    t_solve = time.time() - t_start
+    # Classement tronqué par le budget : le puzzle sera retenté avec un budget plus large s'il reste du temps
+    cancelled = _worker_model.interrupted.get(puzzle_id, False)
+    report_progress(solution)
+    puzzle_type = 'unknown'
+    if solution and not cancelled and not token.expired():
+        puzzle_type = _worker_model.analyze_puzzle(puzzle_id, puzzle_data).get('type', 'unknown')
+    return {'solution': solution, 'type': puzzle_type, 'solve_time': t_solve, 'cancelled': cancelled,
+            'transforms_evaluated': _worker_model.transforms_evaluated.get(puzzle_id)}
+
+
+def generate_submission(eval_puzzles, model, time_limit=None, n_workers=None, output_dir=None):
+    """Génère un fichier de soumission pour Kaggle avec métriques détaillées.
+
+    Les puzzles sont résolus en parallèle sous l'échéance globale time_limit
+    (Config.SUBMISSION_TIME_LIMIT par défaut) ; chaque puzzle reçoit un budget
+    dérivé de sa difficulté et se replie sur l'identité s'il le dépasse. Le
+    temps laissé par les puzzles rapides est redistribué aux puzzles non
+    résolus en Config.BUDGET_ROUNDS tours au plus.
+    Chaque entrée de test reçoit Config.N_ATTEMPTS essais (attempt_1, attempt_2).
+
+    Returns:
+        (soumission, résultats par puzzle) ; la soumission est écrite dans
+        output_dir/submission.json (config.output_dir par défaut)
+    """
+    global _worker_model
+    # Mesurer les performances
+    start_time = time.time()
+    resource_sampler.mark('submission')
+    mem_before = resource_sampler.latest()
+
+    if time_limit is None:
+        time_limit = Config.SUBMISSION_TIME_LIMIT
+    if n_workers is None:
+        n_workers = Config.N_WORKERS
+    if output_dir is None:
+        output_dir = config.output_dir
+    deadline = start_time + time_limit
+
+    results = []
+    solution_times = []
+
+    if not eval_puzzles:
+        print("❌ Aucun puzzle d'évaluation disponible.")
+        return {}, []
+
+    total_puzzles = len(eval_puzzles)
+    print(f"\n=== GÉNÉRATION DE LA SOUMISSION POUR {total_puzzles} PUZZLES ===")
+    print(f"RSS initiale du processus: {mem_before['rss']/(1024**3):.2f} Go")
+    print(f"Échéance: {time_limit:.0f}s | Workers: {n_workers}")
+
+    # Difficulté de chaque puzzle (sert aussi au calcul des budgets)
+    puzzle_types = {}
+    puzzle_difficulties = {puzzle_id: puzzle_difficulty(puzzle_data) for puzzle_id, puzzle_data in eval_puzzles.items()}
+
+    # Résolution parallèle sous échéance ; submission.json est écrit dès le départ
+    submission_path = os.path.join(output_dir, 'submission.json')
+    _worker_model = model
+    submission, records = run_with_deadline(
+        _solve_and_classify, eval_puzzles, puzzle_difficulties, deadline, submission_path,
+        n_workers=n_workers,
+        safety_margin=Config.SUBMISSION_SAFETY_MARGIN,
+        min_budget=Config.MIN_PUZZLE_BUDGET,
+        max_budget=Config.MAX_PUZZLE_BUDGET,
+        max_rounds=Config.BUDGET_ROUNDS,
+        grace=Config.BUDGET_GRACE,
+        fallback_fn=lambda puzzle: identity_attempts(puzzle, Config.N_ATTEMPTS)
+    )
+
+    puzzles_processed = total_puzzles
+    successful_solves = 0
+    status_counts = Counter(record['status'] for record in records.values())
+
+    for puzzle_id, record in records.items():
+        result = record['result'] or {}
+        success = record['status'] == 'solved' and bool(result.get('solution'))
+        t_solve = result.get('solve_time', record['time'])
+        solution_times.append(t_solve)
+        puzzle_type = result.get('type', 'unknown') if success else 'unknown'
+
+        if success:
+            successful_solves += 1
+            puzzle_types[puzzle_type] = puzzle_types.get(puzzle_type, 0) + 1
+
+        # Enregistrer les détails pour l'analyse
+        results.append({
+            'puzzle_id': puzzle_id,
+            'difficulty': puzzle_difficulties[puzzle_id],
+            'type': puzzle_type,
+            'solution_time': t_solve * 1000,  # ms
+            'budget': record['budget'],
+            'status': record['status'],
+            'attempts': record['attempts'],
+            'success': success
+        })
+
+    print(f"Issues: {status_counts.get('solved', 0)} résolus, {status_counts.get('timeout', 0)} hors budget, "
+          f"{status_counts.get('error', 0)} erreurs, {status_counts.get('skipped', 0)} non traités (repli identité)")
+    retried = sum(1 for record in records.values() if record['attempts'] > 1)
+    print(f"Puzzles retentés avec le temps redistribué: {retried}")
+
+    # Mesurer l'utilisation finale des ressources
+    total_time = time.time() - start_time
+    resources = resource_sampler.phase_stats('submission')
+
+    # Statistiques de la soumission
+    print(f"\n\n=== STATISTIQUES DE LA SOUMISSION ===")
+    print(f"Puzzles traités: {puzzles_processed}")
+    print(f"Solutions trouvées: {successful_solves} ({successful_solves/puzzles_processed*100:.1f}%)")
+    print(f"Temps total: {total_time:.2f} secondes")
+    print(f"Vitesse moyenne: {puzzles_processed/total_time:.2f} puzzles/seconde")
+    print(f"Temps moyen par puzzle: {np.mean(solution_times)*1000:.2f} ms")
+    print(f"Temps max par puzzle: {np.max(solution_times)*1000:.2f} ms")
+    print(f"RSS du processus principal: {resources['rss_end']/(1024**3):.2f} Go "
+          f"(max {resources['rss_max']/(1024**3):.2f} Go) | {resources['rss_delta']/(1024**3):+.2f} Go")
+    print(f"CPU du processus principal: {resources['cpu_time']:.1f}s ({resources['cpu_percent']:.0f}% du temps écoulé)")
+
+    memo_stats = model.memo.stats()
+    print(f"Mémo partagé: {memo_stats['hits']} hits / {memo_stats['misses']} misses "
+          f"({memo_stats['hit_rate']*100:.1f}%), {memo_stats['bytes']/(1024**2):.1f} Mo")
+
+    # Transformations évaluées par puzzle (programmes des voisins essayés en premier)
+    evaluated_counts = [
+        record['result']['transforms_evaluated'] for record in records.values()
+        if record['result'] and record['result'].get('transforms_evaluated') is not None
+    ]
+    if evaluated_counts:
+        print(f"Transformations évaluées par puzzle: {sum(evaluated_counts)/len(evaluated_counts):.2f} en moyenne "
+              f"(registre complet: {len(model.transformation_registry)})")
+
+    # Statistiques par type de puzzle
+    if puzzle_types:
+        print("\n=== DISTRIBUTION PAR TYPE DE PUZZLE ===")
+        for ptype, count in sorted(puzzle_types.items(), key=lambda x: x[1], reverse=True):
+            print(f"  - {ptype}: {count} puzzles ({count/puzzles_processed*100:.1f}%)")
+
+    # Statistiques par niveau de difficulté
+    if puzzle_difficulties:
+        difficulty_distribution = defaultdict(int)
+        for difficulty in puzzle_difficulties.values():
+            difficulty_distribution[int(difficulty)] += 1
+
+        print("\n=== DISTRIBUTION PAR NIVEAU DE DIFFICULTÉ ===")
+        for level in range(1, 11):
+            count = difficulty_distribution.get(level, 0)
+            print(f"  - Niveau {level}/10: {count} puzzles ({count/puzzles_processed*100:.1f}%)")
+
+        # Taux de réussite par niveau de difficulté
+        success_by_difficulty = defaultdict(lambda: {'total': 0, 'success': 0})
+        for result in results:
+            level = int(result['difficulty'])
+            success_by_difficulty[level]['total'] += 1
+            if result['success']:
+                success_by_difficulty[level]['success'] += 1
+
+        print("\n=== TAUX DE RÉUSSITE PAR NIVEAU DE DIFFICULTÉ ===")
+        for level in range(1, 11):
+            if level in success_by_difficulty and success_by_difficulty[level]['total'] > 0:
+                success_rate = success_by_difficulty[level]['success'] / success_by_difficulty[level]['total'] * 100
+                print(f"  - Niveau {level}/10: {success_rate:.1f}% ({success_by_difficulty[level]['success']}/{success_by_difficulty[level]['total']})")
+
+    # La soumission complète a déjà été écrite par l'ordonnanceur (avant l'échéance)
+    print(f"\n✅ Soumission enregistrée dans {submission_path}")
+
+    return submission, results
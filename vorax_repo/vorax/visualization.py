@@ -0,0 +1,382 @@
+"""
+Affichages matplotlib du notebook : grilles, distributions et tableaux de bord.
+
+Module séparé du solveur : bundle_notebook.py l'écarte du notebook Kaggle
+(sauf --keep-visualization), qui démarre ainsi sans importer matplotlib.
+"""
+from collections import Counter, defaultdict
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from arc_grid import test_inputs
+
+from .analysis import analyze_puzzle, estimate_puzzle_difficulty, calculate_entropy, calculate_complexity_score
+from .config import Config
+
+
+def plot_grid(grid, title=None, cmap=None):
+    """Affiche une grille colorée avec des fonctionnalités améliorées."""
+    # Conversion en tableau numpy
+    if not isinstance(grid, np.ndarray):
+        grid = np.array(grid)
+
+    # Palette de couleurs pour les valeurs (palette étendue)
+    if cmap is None:
+        colors = ['#000000', '#FF0000', '#00FF00', '#0000FF',
+                '#FFFF00', '#FF00FF', '#00FFFF', '#FFA500',
+                '#800080', '#008000', '#800000', '#008080',
+                '#A52A2A', '#5F9EA0', '#D2691E', '#556B2F']
+
+        # Création d'une palette colorée
+        max_value = np.max(grid) if grid.size > 0 else 0
+        cmap = plt.cm.colors.ListedColormap(colors[:max(16, max_value+1)])
+
+    plt.figure(figsize=(6, 6), dpi=Config.VISUALIZATION_DPI)
+    plt.imshow(grid, cmap=cmap, vmin=0, vmax=max(15, np.max(grid)))
+    plt.colorbar(ticks=range(16))
+    plt.grid(True, color='gray', linestyle='-', linewidth=0.5)
+
+    # Ajout des coordonnées
+    plt.xticks(range(grid.shape[1]))
+    plt.yticks(range(grid.shape[0]))
+
+    if title:
+        plt.title(title)
+    plt.tight_layout()
+    plt.show()
+
+
+def display_puzzle(puzzle, max_examples=None):
+    """Affiche les exemples d'un puzzle ARC avec analyses détaillées."""
+    if max_examples is None:
+        max_examples = Config.MAX_EXAMPLES_TO_DISPLAY
+
+    # Analyse du puzzle
+    analysis = analyze_puzzle(puzzle)
+
+    # Estimation de la difficulté
+    difficulty = estimate_puzzle_difficulty(analysis)
+
+    print(f"Nombre d'exemples d'entraînement: {analysis['train_count']}")
+    print(f"Difficulté estimée: {difficulty:.1f}/10")
+
+    if 'train_count' in analysis and analysis['train_count'] > 0:
+        print(f"Dimensions des entrées: {analysis['input_dims']}")
+        print(f"Dimensions des sorties: {analysis['output_dims']}")
+        print(f"Dimensions constantes: {analysis['consistent_dims']}")
+        print(f"Valeurs dans les entrées: {analysis['input_values']}")
+        print(f"Valeurs dans les sorties: {analysis['output_values']}")
+
+        if analysis['new_values']:
+            print(f"Nouvelles valeurs créées: {analysis['new_values']}")
+        if analysis['removed_values']:
+            print(f"Valeurs supprimées: {analysis['removed_values']}")
+
+        # Métriques d'information si activées
+        if Config.ENABLE_COMPLEXITY_METRICS and 'input_entropy_avg' in analysis:
+            print(f"\nMétriques d'information:")
+            print(f"Entropie moyenne (entrée): {analysis['input_entropy_avg']:.2f} bits")
+            print(f"Entropie moyenne (sortie): {analysis['output_entropy_avg']:.2f} bits")
+            print(f"Complexité moyenne (entrée): {analysis['input_complexity_avg']:.2f}")
+            print(f"Complexité moyenne (sortie): {analysis['output_complexity_avg']:.2f}")
+            print(f"Changement d'entropie: {analysis['entropy_change']:.2f} bits")
+            print(f"Changement de complexité: {analysis['complexity_change']:.2f}")
+
+    # Affichage des exemples d'entraînement
+    train_examples = puzzle.get('train', [])
+    for i, example in enumerate(train_examples[:max_examples]):
+        if 'input' not in example or 'output' not in example:
+            continue
+
+        print(f"\nExemple d'entraînement {i+1}:")
+        plot_grid(example['input'], f"Entrée {i+1}")
+        plot_grid(example['output'], f"Sortie {i+1}")
+
+        # Afficher les métriques spécifiques à cet exemple
+        if Config.ENABLE_COMPLEXITY_METRICS:
+            input_entropy = calculate_entropy(example['input'])
+            output_entropy = calculate_entropy(example['output'])
+            input_complexity = calculate_complexity_score(example['input'])
+            output_complexity = calculate_complexity_score(example['output'])
+
+            print(f"Entropie (entrée): {input_entropy:.2f} bits, (sortie): {output_entropy:.2f} bits")
+            print(f"Complexité (entrée): {input_complexity:.2f}, (sortie): {output_complexity:.2f}")
+
+    # Affichage de l'entrée de test si disponible
+    if 'test' in puzzle and 'input' in puzzle['test']:
+        print("\nEntrée de test:")
+        test_input = puzzle['test']['input']
+        plot_grid(test_input, "Entrée de test")
+
+        if 'test_dim' in analysis:
+            print(f"Dimension de l'entrée de test: {analysis['test_dim']}")
+            print(f"Valeurs dans l'entrée de test: {analysis['test_values']}")
+
+            if Config.ENABLE_COMPLEXITY_METRICS and 'test_entropy' in analysis:
+                print(f"Entropie de l'entrée de test: {analysis['test_entropy']:.2f} bits")
+                print(f"Complexité de l'entrée de test: {analysis['test_complexity']:.2f}")
+    else:
+        print("\nAucune entrée de test disponible.")
+
+
+def show_example_puzzles(arc_data):
+    """Affiche un exemple de puzzle de chaque source avec statistiques détaillées."""
+    sources = ['training', 'evaluation', 'test']
+
+    for source in sources:
+        # Trouver un puzzle de cette source
+        example_found = False
+        for puzzle_id, src in arc_data.get('puzzle_sources', {}).items():
+            if src == source and puzzle_id in arc_data.get('all_puzzles', {}):
+                puzzle = arc_data['all_puzzles'][puzzle_id]
+                print(f"\n{'='*50}")
+                print(f"EXEMPLE DE PUZZLE DE {source.upper()} (ID: {puzzle_id})")
+                print(f"{'='*50}")
+                display_puzzle(puzzle)
+                example_found = True
+                break
+
+        if not example_found:
+            print(f"\nAucun puzzle de source '{source}' trouvé.")
+
+
+def plot_difficulty_distribution(difficulties, sources):
+    """Histogrammes des difficultés estimées, globalement et par source."""
+    try:
+        plt.figure(figsize=(10, 6), dpi=Config.VISUALIZATION_DPI)
+        plt.hist(difficulties, bins=20, alpha=0.7, color='blue')
+        plt.axvline(x=sum(difficulties)/len(difficulties), color='red', linestyle='--', label=f'Moyenne: {sum(difficulties)/len(difficulties):.2f}')
+        plt.title('Distribution des niveaux de difficulté')
+        plt.xlabel('Niveau de difficulté')
+        plt.ylabel('Nombre de puzzles')
+        plt.grid(True, linestyle='--', alpha=0.7)
+        plt.legend()
+        plt.show()
+
+        # Distribution par source et difficulté
+        source_difficulties = {source: [] for source in Counter(sources)}
+        for i, source in enumerate(sources):
+            source_difficulties[source].append(difficulties[i])
+
+        plt.figure(figsize=(12, 6), dpi=Config.VISUALIZATION_DPI)
+        for source, diffs in source_difficulties.items():
+            if diffs:  # Éviter les listes vides
+                plt.hist(diffs, bins=10, alpha=0.5, label=f'{source} (n={len(diffs)})')
+        plt.title('Distribution des difficultés par source')
+        plt.xlabel('Niveau de difficulté')
+        plt.ylabel('Nombre de puzzles')
+        plt.grid(True, linestyle='--', alpha=0.7)
+        plt.legend()
+        plt.show()
+    except Exception as e:
+        print(f"❌ Erreur lors de la visualisation: {str(e)}")
+
+
+def plot_difficulty_levels(stats):
+    """Nombre de puzzles appris par niveau de difficulté."""
+    try:
+        plt.figure(figsize=(10, 6), dpi=Config.VISUALIZATION_DPI)
+
+        difficulty_dist = stats.get('difficulty_distribution', {})
+        levels = sorted(difficulty_dist.keys())
+        counts = [difficulty_dist.get(level, 0) for level in levels]
+
+        plt.bar(levels, counts, color='blue', alpha=0.7)
+        plt.xlabel('Niveau de difficulté')
+        plt.ylabel('Nombre de puzzles')
+        plt.title('Distribution des niveaux de difficulté')
+        plt.xticks(range(1, 11))
+        plt.grid(axis='y', linestyle='--', alpha=0.7)
+        plt.show()
+    except Exception as e:
+        print(f"Erreur lors de la visualisation: {str(e)}")
+
+
+def plot_solution(test_puzzle, solution):
+    """Entrée de test et solution prédite côte à côte."""
+    if solution:
+        try:
+            plt.figure(figsize=(12, 6), dpi=Config.VISUALIZATION_DPI)
+
+            # Entrée de test
+            plt.subplot(1, 2, 1)
+            plt.imshow(np.array(test_inputs(test_puzzle)[0]))
+            plt.title('Entrée de test')
+            plt.colorbar()
+
+            # Solution prédite
+            plt.subplot(1, 2, 2)
+            plt.imshow(np.array(solution))
+            plt.title('Solution prédite')
+            plt.colorbar()
+
+            plt.tight_layout()
+            plt.show()
+        except Exception as e:
+            print(f"Erreur lors de l'affichage de la solution: {str(e)}")
+
+
+def plot_submission(results):
+    """Temps de résolution, réussite par difficulté et types de la soumission (résultats de generate_submission)."""
+    solution_times = [r['solution_time'] / 1000 for r in results]
+    puzzle_types = Counter(r['type'] for r in results if r['success'])
+    success_by_difficulty = defaultdict(lambda: {'total': 0, 'success': 0})
+    for result in results:
+        level = int(result['difficulty'])
+        success_by_difficulty[level]['total'] += 1
+        if result['success']:
+            success_by_difficulty[level]['success'] += 1
+
+    try:
+        plt.figure(figsize=(12, 8), dpi=Config.VISUALIZATION_DPI)
+
+        # Distribution des temps de résolution
+        plt.subplot(2, 2, 1)
+        plt.hist([t*1000 for t in solution_times], bins=20, color='blue', alpha=0.7)
+        plt.axvline(x=np.mean([t*1000 for t in solution_times]), color='red', linestyle='--',
+                   label=f'Moyenne: {np.mean([t*1000 for t in solution_times]):.2f} ms')
+        plt.title('Temps de résolution (ms)')
+        plt.xlabel('Temps (ms)')
+        plt.ylabel('Nombre de puzzles')
+        plt.legend()
+        plt.grid(True, linestyle='--', alpha=0.7)
+
+        # Temps vs Difficulté
+        plt.subplot(2, 2, 2)
+        difficulties = [r['difficulty'] for r in results]
+        times = [r['solution_time'] for r in results]
+        plt.scatter(difficulties, times, alpha=0.7)
+        plt.title('Temps de résolution vs Difficulté')
+        plt.xlabel('Niveau de difficulté')
+        plt.ylabel('Temps (ms)')
+        plt.grid(True, linestyle='--', alpha=0.7)
+
+        # Taux de réussite par difficulté
+        plt.subplot(2, 2, 3)
+        levels = sorted(success_by_difficulty.keys())
+        success_rates = [success_by_difficulty[level]['success']/success_by_difficulty[level]['total']*100
+                        if level in success_by_difficulty and success_by_difficulty[level]['total'] > 0
+                        else 0 for level in levels]
+
+        plt.bar(levels, success_rates, color='green', alpha=0.7)
+        plt.title('Taux de réussite par niveau de difficulté')
+        plt.xlabel('Niveau de difficulté')
+        plt.ylabel('Taux de réussite (%)')
+        plt.ylim(0, 100)
+        plt.grid(True, linestyle='--', alpha=0.7)
+
+        # Distribution par type de puzzle
+        plt.subplot(2, 2, 4)
+        types = list(puzzle_types.keys())[:5]  # Top 5 types
+        counts = [puzzle_types[t] for t in types]
+        plt.pie(counts, labels=types, autopct='%1.1f%%', startangle=90, explode=[0.05]*len(types))
+        plt.title('Top 5 des types de puzzles')
+
+        plt.tight_layout()
+        plt.show()
+    except Exception as e:
+        print(f"Erreur lors de la visualisation: {str(e)}")
+
+
+def plot_learning_curve(stats):
+    """Courbe d'apprentissage (taux de réussite en fonction des puzzles traités)."""
+    if stats['learning_curve']:
+        try:
+            plt.figure(figsize=(12, 6), dpi=Config.VISUALIZATION_DPI)
+
+            puzzles_processed = [entry['puzzles_processed'] for entry in stats['learning_curve']]
+            success_rates = [entry['success_rate'] * 100 for entry in stats['learning_curve']]
+
+            plt.plot(puzzles_processed, success_rates, 'b-', marker='o', markersize=4)
+            plt.xlabel('Puzzles traités')
+            plt.ylabel('Taux de réussite (%)')
+            plt.title('Courbe d\'apprentissage du modèle HybridVoraxModelV3')
+            plt.grid(True, linestyle='--', alpha=0.7)
+            plt.ylim(0, 100)
+
+            # Ajouter une ligne de tendance
+            if len(puzzles_processed) > 1:
+                z = np.polyfit(puzzles_processed, success_rates, 1)
+                p = np.poly1d(z)
+                plt.plot(puzzles_processed, p(puzzles_processed), 'r--',
+                        label=f'Tendance: {z[0]:.4f}x + {z[1]:.2f}')
+                plt.legend()
+
+            plt.tight_layout()
+            plt.show()
+        except Exception as e:
+            print(f"Erreur lors de l'affichage de la courbe d'apprentissage: {str(e)}")
+
+
+def plot_memory_usage(stats):
+    """RSS du processus pendant l'apprentissage."""
+    if stats['memory_usage']:
+        try:
+            plt.figure(figsize=(12, 6), dpi=Config.VISUALIZATION_DPI)
+
+            puzzles = [entry['puzzles_processed'] for entry in stats['memory_usage']]
+            memory = [entry['memory_used'] / (1024**3) for entry in stats['memory_usage']]  # Go
+
+            plt.plot(puzzles, memory, 'g-', marker='s', markersize=4)
+            plt.xlabel('Puzzles traités')
+            plt.ylabel('RSS du processus (Go)')
+            plt.title('Utilisation de la mémoire pendant l\'apprentissage')
+            plt.grid(True, linestyle='--', alpha=0.7)
+
+            plt.tight_layout()
+            plt.show()
+        except Exception as e:
+            print(f"Erreur lors de l'affichage de l'utilisation mémoire: {str(e)}")
+
+
+def plot_type_transform_matrix(model, stats):
+    """Matrice types de puzzles x transformations (pandas)."""
+    try:
+        # Construire une matrice de confusion simplifiée
+        type_transform_matrix = defaultdict(lambda: defaultdict(int))
+
+        for ptype, data in model.puzzle_types.items():
+            for transform, count in data['transformations'].items():
+                type_transform_matrix[ptype][transform] = count
+
+        # Sélectionner les N types et transformations les plus fréquents
+        top_n = 5
+        top_types = sorted(stats['type_counts'].items(), key=lambda x: x[1], reverse=True)[:top_n]
+        top_transforms = sorted(stats['transform_counts'].items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+        # Créer un DataFrame pandas pour la matrice
+        import pandas as pd
+        matrix_data = []
+
+        for ptype, _ in top_types:
+            row = []
+            for transform, _ in top_transforms:
+                row.append(type_transform_matrix[ptype][transform])
+            matrix_data.append(row)
+
+        df = pd.DataFrame(matrix_data,
+                         index=[t[0] for t in top_types],
+                         columns=[t[0] for t in top_transforms])
+
+        # Afficher la matrice
+        plt.figure(figsize=(10, 8), dpi=Config.VISUALIZATION_DPI)
+        plt.imshow(df, cmap='YlGnBu')
+
+        # Ajouter les valeurs dans les cellules
+        for i in range(len(df.index)):
+            for j in range(len(df.columns)):
+                plt.text(j, i, df.iloc[i, j], ha='center', va='center', color='black')
+
+        plt.xticks(range(len(df.columns)), df.columns, rotation=45, ha='right')
+        plt.yticks(range(len(df.index)), df.index)
+        plt.title('Matrice Types de Puzzles × Transformations')
+        plt.colorbar(label='Nombre de puzzles')
+        plt.tight_layout()
+        plt.show()
+
+        print("\n=== MATRICE TYPES × TRANSFORMATIONS ===")
+        print(df)
+    except Exception as e:
+        print(f"Erreur lors de la création de la matrice de confusion: {str(e)}")
+        print("pandas peut ne pas être disponible dans cet environnement")